@@ -0,0 +1,35 @@
+import sys
+import os
+
+from sa_pathfinding.algorithms.dijkstra.grid_optimized_dijkstra import GridOptimizedDijkstra
+from sa_pathfinding.algorithms.astar.grid_optimized_astar import GridOptimizedAstar
+from sa_pathfinding.heuristics.grid_heuristic import OctileGridHeuristic
+from sa_pathfinding.benchmarks.runner import run_benchmark
+from sa_pathfinding.benchmarks.runner import Algorithm
+from sa_pathfinding.benchmarks.runner import find_maps
+
+
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+
+def benchmark_corpus(map_set: str = 'small', queries: int = 20):
+    maps = find_maps(os.path.join(DATA, 'maps', map_set))
+    algorithms = [Algorithm('grid-astar', GridOptimizedAstar, {'heuristic': OctileGridHeuristic()}),
+                  Algorithm('grid-dijkstra', GridOptimizedDijkstra)]
+    print('\n-----Beginning Corpus Benchmark-----\n')
+    print(f'maps: {len(maps)} ({map_set}), queries per map: {queries}\n')
+    report = run_benchmark(maps, algorithms, count=queries,
+                           scenario_dir=os.path.join(DATA, 'scenarios', map_set),
+                           progress=lambda map_name, name: print(f'  {map_name:24s} {name}'))
+    print()
+    for row in report.summary(by_map=False):
+        print(f"{row['algorithm']:14s} time p50/p90/p99: {row['time_p50'] * 1000:8.2f} "
+              f"{row['time_p90'] * 1000:8.2f} {row['time_p99'] * 1000:8.2f} ms  "
+              f"expansions p50: {row['expansions_p50']:8.0f}  "
+              f"suboptimality max: {row['suboptimality_max']:.4f}")
+    report.to_json(f'benchmark_{map_set}.json')
+    report.to_csv(f'benchmark_{map_set}.csv')
+
+
+if __name__ == '__main__':
+    benchmark_corpus(*sys.argv[1:2])
@@ -0,0 +1,53 @@
+import random
+import time
+import os
+
+from sa_pathfinding.algorithms.dijkstra.grid_optimized_dijkstra import GridOptimizedDijkstra
+from sa_pathfinding.algorithms.astar.grid_optimized_astar import GridOptimizedAstar
+from sa_pathfinding.algorithms.generics.open_list import RadixHeapOpenList
+from sa_pathfinding.heuristics.grid_heuristic import ManhattanGridHeuristic
+from sa_pathfinding.heuristics.grid_heuristic import OctileGridHeuristic
+from sa_pathfinding.algorithms.generics.open_list import BucketOpenList
+from sa_pathfinding.environments.grids.cardinal_grid import CardinalGrid
+from sa_pathfinding.algorithms.generics.open_list import HeapOpenList
+from sa_pathfinding.environments.grids.octile_grid import OctileGrid
+
+
+MAPS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'maps')
+
+
+def benchmark_open_lists(queries: int = 20, map_names=('small/den403d.map', 'large/arena2.map')):
+    print('\n-----Beginning Open List Benchmark-----\n')
+    for map_name in map_names:
+        filepath = os.path.join(MAPS, map_name)
+        environments = [
+            ('cardinal', CardinalGrid(filepath), ManhattanGridHeuristic(costs=(1, 1))),
+            ('octile 70/99', OctileGrid(filepath, costs=(70, 99)),
+             OctileGridHeuristic(costs=(70, 99))),
+        ]
+        for label, environment, heuristic in environments:
+            random.seed(0)
+            pairs = []
+            while len(pairs) < queries:
+                start, goal = environment.get_random(), environment.get_random()
+                if environment.is_reachable(start, goal):
+                    pairs.append((start, goal))
+            print(f'{map_name} ({label}, {str(environment)}), {queries} queries')
+            for search_cls, kwargs in ((GridOptimizedAstar, {'heuristic': heuristic}),
+                                       (GridOptimizedDijkstra, {})):
+                for open_list in (HeapOpenList, BucketOpenList, RadixHeapOpenList):
+                    expanded = 0
+                    t1 = time.perf_counter()
+                    for start, goal in pairs:
+                        search = search_cls(environment, start=start, goal=goal,
+                                            open_list=open_list, **kwargs)
+                        search.get_path()
+                        expanded += search.nodes_expanded
+                    elapsed = time.perf_counter() - t1
+                    print(f'  {search_cls.__name__:22s} {open_list.__name__:18s} '
+                          f'{elapsed:8.3f}s  {expanded / elapsed:10.0f} expansions/s')
+            print()
+
+
+if __name__ == '__main__':
+    benchmark_open_lists()
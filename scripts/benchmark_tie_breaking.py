@@ -0,0 +1,53 @@
+from functools import partial
+import random
+import time
+import sys
+import os
+
+from sa_pathfinding.algorithms.astar.grid_optimized_astar import GridOptimizedAstar
+from sa_pathfinding.heuristics.grid_heuristic import OctileGridHeuristic
+from sa_pathfinding.algorithms.generics.open_list import HeapOpenList
+from sa_pathfinding.environments.grids.octile_grid import OctileGrid
+from sa_pathfinding.algorithms.generics.open_list import TieBreak
+
+
+MAPS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'maps')
+
+
+def benchmark_tie_breaking(folder: str = 'small', queries: int = 10, max_maps: int = None):
+    """Mean expansions and time per query of every tie-breaking policy,
+    over the same random queries on each map of data/maps/<folder>."""
+    map_names = sorted(os.listdir(os.path.join(MAPS, folder)))[:max_maps]
+    print('\n-----Beginning Tie-Breaking Benchmark-----\n')
+    print(f'{"map":16s}' + ''.join(f'{tie_break.value:>16s}' for tie_break in TieBreak))
+    totals = {tie_break: [0, 0.0] for tie_break in TieBreak}
+    for map_name in map_names:
+        environment = OctileGrid(os.path.join(MAPS, folder, map_name))
+        heuristic = OctileGridHeuristic()
+        random.seed(0)
+        pairs = []
+        while len(pairs) < queries:
+            start, goal = environment.get_random(), environment.get_random()
+            if environment.is_reachable(start, goal):
+                pairs.append((start, goal))
+        line = f'{map_name:16s}'
+        for tie_break in TieBreak:
+            expanded = 0
+            t1 = time.perf_counter()
+            for start, goal in pairs:
+                search = GridOptimizedAstar(environment, heuristic, start=start, goal=goal,
+                                            open_list=partial(HeapOpenList, tie_break=tie_break,
+                                                              seed=0))
+                search.get_path()
+                expanded += search.nodes_expanded
+            totals[tie_break][0] += expanded
+            totals[tie_break][1] += time.perf_counter() - t1
+            line += f'{expanded / queries:16.1f}'
+        print(line)
+    print()
+    for tie_break, (expanded, elapsed) in totals.items():
+        print(f'{tie_break.value:8s} total expansions: {expanded:10d}  time: {elapsed:8.2f}s')
+
+
+if __name__ == '__main__':
+    benchmark_tie_breaking(*sys.argv[1:2])
@@ -0,0 +1,36 @@
+import random
+import time
+import os
+
+from sa_pathfinding.algorithms.astar.grid_optimized_astar import GridOptimizedAstar
+from sa_pathfinding.heuristics.grid_heuristic import OctileGridHeuristic
+from sa_pathfinding.environments.grids.octile_grid import OctileGrid
+from sa_pathfinding.parallel.batch import BatchSearch
+
+
+def batch_throughput(queries: int = 64):
+    filepath = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + '/data/maps/small/den403d.map')
+    environment = OctileGrid(filepath)
+    random.seed(0)
+    pairs = [(environment.get_random(valid=True), environment.get_random(valid=True))
+             for _ in range(queries)]
+    print('\n-----Beginning Batch Throughput Test-----\n')
+    print(f'environment: {str(environment)}')
+    print(f'queries: {queries}')
+    baseline = None
+    workers = 0
+    while workers <= (os.cpu_count() or 1):
+        with BatchSearch(environment, GridOptimizedAstar, workers=workers,
+                         heuristic=OctileGridHeuristic()) as batch:
+            t1 = time.time()
+            for _ in batch.run(pairs, ordered=False):
+                pass
+            elapsed = time.time() - t1
+        baseline = baseline or elapsed
+        print(f'workers: {workers:3d}  {queries / elapsed:8.1f} queries/s  '
+              f'speedup: {baseline / elapsed:.2f}x')
+        workers = 1 if workers == 0 else workers * 2
+
+
+if __name__ == '__main__':
+    batch_throughput()
@@ -1,6 +1,10 @@
 from typing import List
-import heapq
 
+from sa_pathfinding.algorithms.generics.search_result import SearchLimits
+from sa_pathfinding.algorithms.generics.metrics import SearchMetrics
+from sa_pathfinding.algorithms.generics.trace import TraceSink
+from sa_pathfinding.algorithms.generics.open_list import HeapOpenList
+from sa_pathfinding.algorithms.generics.search_result import Termination
 from sa_pathfinding.algorithms.generics.search_node import SearchNode
 from sa_pathfinding.environments.generics.env import Environment
 from sa_pathfinding.algorithms.generics.search import Search
@@ -40,6 +44,12 @@ class GenericAstar(Search):
     high g-cost. This means that cost of removing the best node from the open
     list on each step is O(lg(n)). Both lists are checked for membership in 
     O(n) time using the env state __eq__() in a loop.
+
+    With integer costs (e.g. CardinalGrid, or OctileGrid with integer costs)
+    the open list can be swapped for a BucketOpenList or RadixHeapOpenList
+    through the 'open_list' argument. These find nodes on open in O(1) but
+    need hashable states. Any open list factory works, e.g.
+    partial(HeapOpenList, tie_break=TieBreak.LIFO) to change tie-breaking.
     
     The open and closed lists are checked for membership
     via the _is_on_open() and _is_on_closed() methods. If you define a 
@@ -66,7 +76,7 @@ class GenericAstar(Search):
         history (:obj:'dict'): A dictionary of documentary info on the
             execution of the search.
         nodes_expanded (:obj:'int'): Number of nodes expanded in the search.
-        open (:obj:'list' of :obj:'State'): The open list for the A* search algorithm.
+        open (:obj:'OpenList'): The open list for the A* search algorithm.
         path (:obj:'list' of :obj:'State'): The path returned by the execution of the search. It
             is empty by default and is empty if the search fails.
         start (:obj:'Node'): A class that represent the node to start
@@ -78,14 +88,21 @@ class GenericAstar(Search):
             the printing of information about the search as it runs. 
     """
 
-    __slots__ = '_open _closed _heuristic'.split()
+    __slots__ = '_open _closed _heuristic _get_costs'.split()
+
+    # assuming an admissible heuristic
+    optimal = True
 
     def __init__(self,
                  env: Environment,
                  heuristic: Heuristic,
                  start: State = None,
                  goal: State = None,
-                 verbose: bool = False):
+                 verbose: bool = False,
+                 limits: SearchLimits = None,
+                 open_list: type = None,
+                 trace: TraceSink = None,
+                 metrics: SearchMetrics = None):
         """GenericAstar __init__ method.
 
         Attributes env, start, goal, nodes_expanded, path, success, verbose
@@ -98,12 +115,19 @@ class GenericAstar(Search):
             start (:obj:`State`, optional): State to start search from.
             goal (:obj:`State`): State to search to.
             verbose (:obj:'bool'): Flag for verbose printing.
+            limits (:obj:'SearchLimits', optional): Search budgets.
+            open_list (:obj:'type', optional): OpenList class to keep the
+                open list in, HeapOpenList by default.
+            trace (:obj:'TraceSink', optional): Sink to record expansions to.
+            metrics (:obj:'SearchMetrics', optional): Counters to record to.
         """
-        super().__init__(env, start=start, goal=goal, verbose=verbose)
+        super().__init__(env, start=start, goal=goal, verbose=verbose,
+                         limits=limits, trace=trace, metrics=metrics)
         self._heuristic = heuristic
+        self._get_costs = self._hook('heuristic_time', heuristic.get_costs)
         self._history['heuristic'] = str(self._heuristic.name)
 
-        self._open = []
+        self._open = HeapOpenList() if open_list is None else open_list()
         self._closed = []
 
         # setup beginning of search by assigning costs to start
@@ -124,7 +148,7 @@ class GenericAstar(Search):
 
     @property
     def open(self):
-        """list of SearchNode: open list"""
+        """OpenList: open list"""
         return self._open
     
     @property
@@ -138,16 +162,25 @@ class GenericAstar(Search):
          return self._heuristic.name
 
     def _add_to_open(self, node: SearchNode) -> None:
-        heapq.heappush(self._open, node)
+        self._open.push(node)
+
+    def _open_size(self) -> int:
+        return len(self._open)
+
+    def _peek_open(self) -> SearchNode:
+        return self._open.peek()
 
     def _add_to_closed(self, node: SearchNode) -> None:
         self._closed.append(node)
 
     def _remove_best(self) -> SearchNode:
-        return heapq.heappop(self._open)
+        return self._open.pop()
 
     def _is_on_open(self, node: SearchNode) -> bool:
-        return self._is_on_list(node, self._open)
+        return self._open.find(node) is not None
+
+    def _find_on_open(self, node: SearchNode) -> SearchNode:
+        return self._open.find(node)
 
     def _is_on_closed(self, node: SearchNode) -> bool:
         return self._is_on_list(node, self._closed)
@@ -171,9 +204,6 @@ class GenericAstar(Search):
         else:
             return True, in_list
 
-    def _is_on_open_w_index(self, some_node: SearchNode) -> (bool, int):
-        return self._is_on_list_w_index(some_node, self._open)
-
     def step(self):
         """step generator
 
@@ -194,92 +224,118 @@ class GenericAstar(Search):
             # path to the requested goal does not exist
             # this forces a return -> StopIteration for this generator function 
 
-            # remove the lowest f-cost (ties to high g-cost) node from
-            # the open list, add to closed
-            node = self._remove_best()
-            self._add_to_closed(node)
-            self._nodes_expanded += 1
-            self.history['nodes_expanded'] = self._nodes_expanded
-
-            # Goal Check
-            # This needs to happen after the node has been selected as the lowest
-            # f-cost node on the open list in order to prove its an optimal path.
-            # Common mistake is to goal check when the node is generated by the
-            # expansion of its parent.
-            if node.state == self.goal:
-                self._success = True
-                # re-create path by following parents from goal to start
-                self._path.append(node.state)
-                # start has None as parent, so walk back until that None parent is hit
-                while node.parent is not None:
-                    node = node.parent
-                    self._path.append(node.state)
-                self._path = list(reversed(self._path))
-                self._history['path'] = self._path
-                if self._verbose:
-                    print("---------------------------------------------")
-                    print("Search terminated successfully")
-                    print(f"Path of length {len(self._path)} from {self._start} "
-                        f"to {self._goal} found.")
-                    print(f"Nodes Expanded: {self._nodes_expanded}")
-                    print(f"Path: {self._path}")
-                    print("---------------------------------------------\n\n")
+            # stop cleanly if one of the search limits has been hit
+            if self._should_stop():
+                return
+
+            to_open = list()
+            node = self._expand(to_open)
+            self._history['nodes_expanded'] = self._nodes_expanded
+            if self._termination is not None:
                 # once path and successful path info are recorded - we are done
                 # can return to force a StopIteration for this generator function
                 return
+            yield node, to_open
+        self._terminate(Termination.EXHAUSTED)
+        return
+
+    def _expand(self, to_open: List[SearchNode] = None) -> SearchNode:
+        """Removes the best node from open and expands it.
+
+        This is the one definition of an A* expansion, shared by step() and
+        run(). The search is over once 'termination' is set.
+
+        Args:
+            to_open (:obj:'list', optional): Nodes added to open are
+                appended to it, when given.
 
-            # get possible actions for selected node
-            # querying the environment for the actions available to the given state
-            # parent.state check because start has None parent and wont have state
-            parent = node.parent.state if node.parent is not None else None
-            action_cost_tuples = self._env.get_actions(node.state, parent)
+        Returns:
+            SearchNode: The node expanded.
+        """
+        # remove the lowest f-cost (ties to high g-cost) node from
+        # the open list, add to closed
+        node = self._remove_best()
+        self._add_to_closed(node)
+        self._nodes_expanded += 1
+
+        # remember the node closest to the goal by heuristic estimate,
+        # it ends the best partial path if a limit stops the search
+        if self._best_node is None or node.hcost < self._best_node.hcost:
+            self._best_node = node
+
+        # Goal Check
+        # This needs to happen after the node has been selected as the lowest
+        # f-cost node on the open list in order to prove its an optimal path.
+        # Common mistake is to goal check when the node is generated by the
+        # expansion of its parent.
+        metrics = self._metrics
+        if self._is_goal(node) and self._on_goal(node):
+            if metrics is not None:
+                metrics.on_expand(0, 0, 0, len(self._open))
+            return node
+
+        trace = self._trace
+        if to_open is None and trace is not None:
             to_open = list()
 
-            # generate children nodes based on available actions of our 'state'
-            for action, cost in action_cost_tuples:
-
-                # apply the action to generate new state
-                new_state = self._env.apply_action(node.state, action)
-                new_node = SearchNode(new_state,
-                                    gcost=node.gcost,
-                                    hcost=node.hcost,
-                                    fcost=node.fcost,
-                                    parent=node)
-
-                # set costs according to A* algorithm
-                new_node.gcost += cost
-                new_node.hcost = self._heuristic.get_cost(new_node.state, self.goal)
-                new_node.fcost = new_node.gcost + new_node.hcost
-
-                is_on_open, index = self._is_on_open_w_index(new_node)
-                if not is_on_open:
-                    # if node is not on open, its either
-                    # undiscovered or expanded already and on closed
-                    # safe to skip if on closed because it was chosen
-                    # for expansion and added to closed with the lowest f-cost
-                    # so a shorter path to that state does not exist
-                    if not self._is_on_closed(new_node):
-                        self._add_to_open(new_node)
+        # get possible actions for selected node
+        # querying the environment for the actions available to the given state
+        # parent.state check because start has None parent and wont have state
+        state = node.state
+        parent = node.parent.state if node.parent is not None else None
+
+        # apply the actions to generate the children states, then
+        # evaluate the heuristic for all of them in one call
+        apply_action = self._apply_action
+        children = [(apply_action(state, action), cost)
+                    for action, cost in self._get_actions(state, parent)]
+        hcosts = self._get_costs([child for child, _ in children], self._goal)
+
+        # hot lookups hoisted out of the loop
+        find_on_open = self._find_on_open
+        is_on_closed = self._is_on_closed
+        add_to_open = self._add_to_open
+        gcost = node.gcost
+        duplicates = decrease_keys = 0
+
+        # generate children nodes based on available actions of our 'state'
+        for (new_state, cost), hcost in zip(children, hcosts):
+            # set costs according to A* algorithm
+            new_gcost = gcost + cost
+            new_node = SearchNode(new_state,
+                                  gcost=new_gcost,
+                                  hcost=hcost,
+                                  fcost=new_gcost + hcost,
+                                  parent=node)
+
+            on_open = find_on_open(new_node)
+            if on_open is None:
+                # if node is not on open, its either
+                # undiscovered or expanded already and on closed
+                # safe to skip if on closed because it was chosen
+                # for expansion and added to closed with the lowest f-cost
+                # so a shorter path to that state does not exist
+                if not is_on_closed(new_node):
+                    add_to_open(new_node)
+                    if to_open is not None:
                         to_open.append(new_node)
-                else:
-                    # if found on open, means different path to same state was found
-                    # check cost to see if found a shorter path to that state
-                    if new_node.fcost < self._open[index].fcost:
-                        # if we need to update cost
-                        # then it needs to be removed from heap
-                        # the heap property needs to be restored (heapify)
-                        # then it needs to be added again
-                        # due to the heap being sorted on f-cost
-                        # and this forces a change to f-cost
-                        self._open[index] = self._open[-1]
-                        self._open.pop()
-                        heapq.heapify(self._open)
-                        self._add_to_open(new_node)
-            self._history['steps'][f"step-{self._nodes_expanded}"] = {}
-            self._history['steps'][f"step-{self._nodes_expanded}"]['expanded'] = repr(node)
-            self._history['steps'][f"step-{self._nodes_expanded}"]['to_open'] = repr(to_open)
-            yield node, to_open
-        return
+                    continue
+            elif new_node.fcost < on_open.fcost:
+                # if found on open, means different path to same state was found
+                # and this one is shorter. The old node is removed from open
+                # and the new one added in its place, since open is sorted on
+                # f-cost and this changes it
+                self._open.remove(on_open)
+                add_to_open(new_node)
+                decrease_keys += 1
+            duplicates += 1
+
+        if metrics is not None:
+            metrics.on_expand(len(children), duplicates, decrease_keys, len(self._open))
+        if trace is not None:
+            trace.record(self._nodes_expanded, state,
+                         [new_node.state for new_node in to_open])
+        return node
 
     def get_path(self) -> List[State]:
         """get_path() executes the search from beginning to end. No other
@@ -291,11 +347,11 @@ class GenericAstar(Search):
                 a path and full of connected nodes if a path was found.
 
         """ 
-        if self._verbose:
-            print("Starting search...")
+        if not self._verbose:
+            return self.run()
+        print("Starting search...")
         for node, to_open in self.step():
-            if self._verbose:
-                print(f"Step: {self._nodes_expanded}, "
-                      f"Chosen for expansion: {node}, "
-                      f"Nodes generated: {to_open}")
+            print(f"Step: {self._nodes_expanded}, "
+                  f"Chosen for expansion: {node}, "
+                  f"Nodes generated: {to_open}")
         return self._path
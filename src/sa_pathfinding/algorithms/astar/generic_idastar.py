@@ -0,0 +1,221 @@
+from typing import List
+import math
+
+from sa_pathfinding.algorithms.generics.search_result import SearchLimits
+from sa_pathfinding.algorithms.generics.metrics import SearchMetrics
+from sa_pathfinding.algorithms.generics.trace import TraceSink
+from sa_pathfinding.algorithms.generics.search_result import Termination
+from sa_pathfinding.algorithms.generics.search_node import SearchNode
+from sa_pathfinding.environments.generics.env import Environment
+from sa_pathfinding.algorithms.generics.search import Search
+from sa_pathfinding.environments.generics.state import State
+from sa_pathfinding.heuristics.heuristic import Heuristic
+
+"""generic_idastar Module
+
+This module contains the implementation for the Iterative Deepening A*
+(IDA*) algorithm.
+
+Example:
+    Solve a Towers of Hanoi instance with a pattern database::
+
+        toh = CompactTowersOfHanoi(4, 8, start_peg=0, goal_peg=3)
+        heuristic = TOHPatternDatabaseHeuristic(toh, pattern_size=8)
+        path = GenericIDAstar(toh, heuristic, start=toh.start, goal=toh.goal).get_path()
+"""
+
+
+class GenericIDAstar(Search):
+    """ This class implements the IDA* search algorithm.
+
+    IDA* runs depth-first searches that prune nodes whose f-cost is over
+    a bound. The first bound is the heuristic cost of the start; every
+    following iteration raises it to the smallest f-cost pruned by the
+    one before, so the first goal expanded is reached by a least-cost
+    path, as in A*.
+
+    Only the nodes of the current branch and their siblings are kept, so
+    memory grows with the depth of the solution instead of the number of
+    states, at the price of expanding states again: within an iteration
+    when they are reached by several paths, and in every iteration. The
+    only duplicates detected are children equal to their grandparent.
+    On a graph with cycles and an unreachable goal the iterations never
+    end, set limits or check reachability first.
+
+    The depth-first stack is the open list; it is empty only when the
+    last iteration pruned nothing and the goal is unreachable.
+
+    All attributes are read-only properties.
+
+    Attributes:
+        bound (:obj:'float'): f-cost bound of the current iteration.
+        heuristic (:obj:'Heuristic'): The heuristic the search is run with.
+        iterations (:obj:'int'): Number of iterations started.
+    """
+
+    __slots__ = '_heuristic _get_costs _stack _bound _next_bound _iterations'.split()
+
+    # assuming an admissible heuristic
+    optimal = True
+
+    def __init__(self,
+                 env: Environment,
+                 heuristic: Heuristic,
+                 start: State = None,
+                 goal: State = None,
+                 verbose: bool = False,
+                 limits: SearchLimits = None,
+                 trace: TraceSink = None,
+                 metrics: SearchMetrics = None):
+        """GenericIDAstar __init__ method.
+
+        Args:
+            env (:obj:'Environment'): Environment being being searched.
+            heuristic (:obj:'Heuristic'): Heuristic to search with.
+            start (:obj:`State`, optional): State to start search from.
+            goal (:obj:`State`): State to search to.
+            verbose (:obj:'bool'): Flag for verbose printing.
+            limits (:obj:'SearchLimits', optional): Search budgets.
+            trace (:obj:'TraceSink', optional): Sink to record expansions to.
+            metrics (:obj:'SearchMetrics', optional): Counters to record to.
+        """
+        super().__init__(env, start=start, goal=goal, verbose=verbose,
+                         limits=limits, trace=trace, metrics=metrics)
+        self._heuristic = heuristic
+        self._get_costs = self._hook('heuristic_time', heuristic.get_costs)
+        self._history['heuristic'] = str(self._heuristic.name)
+        self._stack: List[SearchNode] = []
+        self._bound = heuristic.get_cost(self._start, self._goal)
+        self._next_bound = math.inf
+        self._iterations = 0
+        self._start_iteration()
+
+    @property
+    def heuristic(self) -> Heuristic:
+        return self._heuristic
+
+    @property
+    def bound(self) -> float:
+        return self._bound
+
+    @property
+    def iterations(self) -> int:
+        return self._iterations
+
+    def _open_size(self) -> int:
+        return len(self._stack)
+
+    def _peek_open(self) -> SearchNode:
+        return self._stack[-1] if len(self._stack) > 0 else None
+
+    def _start_iteration(self) -> None:
+        self._iterations += 1
+        self._history['iterations'] = self._iterations
+        self._stack.append(SearchNode(self._start,
+                                      gcost=0,
+                                      hcost=self._bound,
+                                      fcost=self._bound,
+                                      parent=None))
+        if self._verbose:
+            print(f"Iteration {self._iterations}, bound = {self._bound}")
+
+    def step(self):
+        """step generator
+
+        Yields:
+            Tuple[SearchNode, List[SearchNode]]: A tuple of the node expanded and its
+                children that were pushed on the stack.
+        """
+        while len(self._stack) > 0:
+            if self._should_stop():
+                return
+
+            to_open = list()
+            node = self._expand(to_open)
+            self._history['nodes_expanded'] = self._nodes_expanded
+            if self._termination is not None:
+                return
+            yield node, to_open
+        self._terminate(Termination.EXHAUSTED)
+        return
+
+    def _expand(self, to_open: List[SearchNode] = None) -> SearchNode:
+        """Pops the deepest node and expands it, see GenericAstar._expand().
+
+        Children over the bound are pruned, the others are pushed so that
+        the first action is expanded first. The next iteration starts once
+        the stack runs empty.
+        """
+        node = self._stack.pop()
+        self._nodes_expanded += 1
+
+        if self._best_node is None or node.hcost < self._best_node.hcost:
+            self._best_node = node
+
+        metrics = self._metrics
+        if self._is_goal(node) and self._on_goal(node):
+            if metrics is not None:
+                metrics.on_expand(0, 0, 0, len(self._stack))
+            return node
+
+        trace = self._trace
+        if to_open is None and trace is not None:
+            to_open = list()
+
+        state = node.state
+        parent = node.parent.state if node.parent is not None else None
+        apply_action = self._apply_action
+        children = [(apply_action(state, action), cost)
+                    for action, cost in self._get_actions(state, parent)]
+        # going straight back to the parent never helps
+        if parent is not None:
+            children = [(child, cost) for child, cost in children if child != parent]
+        hcosts = self._get_costs([child for child, _ in children], self._goal)
+
+        bound = self._bound
+        gcost = node.gcost
+        pushed = []
+        for (new_state, cost), hcost in zip(children, hcosts):
+            new_gcost = gcost + cost
+            fcost = new_gcost + hcost
+            if fcost > bound:
+                if fcost < self._next_bound:
+                    self._next_bound = fcost
+                continue
+            pushed.append(SearchNode(new_state,
+                                     gcost=new_gcost,
+                                     hcost=hcost,
+                                     fcost=fcost,
+                                     parent=node))
+        pushed.reverse()
+        self._stack.extend(pushed)
+        if to_open is not None:
+            to_open.extend(pushed)
+
+        if len(self._stack) == 0 and self._next_bound != math.inf:
+            self._bound = self._next_bound
+            self._next_bound = math.inf
+            self._start_iteration()
+
+        if metrics is not None:
+            metrics.on_expand(len(children), 0, 0, len(self._stack))
+        if trace is not None:
+            trace.record(self._nodes_expanded, state,
+                         [new_node.state for new_node in to_open])
+        return node
+
+    def get_path(self) -> List[State]:
+        """get_path() executes the search from beginning to end.
+
+        Returns:
+            List[State] where list is empty if search does not return
+                a path and full of connected nodes if a path was found.
+        """
+        if not self._verbose:
+            return self.run()
+        print("Starting search...")
+        for node, to_open in self.step():
+            print(f"Step: {self._nodes_expanded}, "
+                  f"Chosen for expansion: {node}, "
+                  f"Nodes generated: {to_open}")
+        return self._path
@@ -1,5 +1,6 @@
-import heapq
-
+from sa_pathfinding.algorithms.generics.search_result import SearchLimits
+from sa_pathfinding.algorithms.generics.metrics import SearchMetrics
+from sa_pathfinding.algorithms.generics.trace import TraceSink
 from sa_pathfinding.algorithms.astar.generic_astar import GenericAstar
 from sa_pathfinding.algorithms.generics.search_node import SearchNode
 from sa_pathfinding.algorithms.generics.search_node import Status
@@ -87,7 +88,11 @@ class GridOptimizedAstar(GenericAstar):
                  heuristic: Heuristic,
                  start: State = None,
                  goal: State = None,
-                 verbose: bool = False):
+                 verbose: bool = False,
+                 limits: SearchLimits = None,
+                 open_list: type = None,
+                 trace: TraceSink = None,
+                 metrics: SearchMetrics = None):
         """GridOptimizedAstar __init__ method.
 
         Attributes env, start, goal, nodes_expanded, path, success, verbose
@@ -114,6 +119,10 @@ class GridOptimizedAstar(GenericAstar):
             start (:obj:`State`, optional): State to start search from.
             goal (:obj:`State`): State to search to.
             verbose (:obj:'bool'): Flag for verbose printing.
+            limits (:obj:'SearchLimits', optional): Search budgets.
+            open_list (:obj:'type', optional): OpenList class for open.
+            trace (:obj:'TraceSink', optional): Sink to record expansions to.
+            metrics (:obj:'SearchMetrics', optional): Counters to record to.
         """
         self._status = []
         for _ in range(env.height):
@@ -122,7 +131,11 @@ class GridOptimizedAstar(GenericAstar):
                          heuristic,
                          start=start,
                          goal=goal,
-                         verbose=verbose)
+                         verbose=verbose,
+                         limits=limits,
+                         open_list=open_list,
+                         trace=trace,
+                         metrics=metrics)
     
     def __repr__(self) -> str:
         return repr(super())
@@ -142,3 +155,9 @@ class GridOptimizedAstar(GenericAstar):
 
     def _is_on_closed(self, node: SearchNode):
         return self._is_status(node, Status.ON_CLOSED)
+
+    def _find_on_open(self, node: SearchNode) -> SearchNode:
+        # the status overlay rules out most states without touching open
+        if not self._is_on_open(node):
+            return None
+        return self._open.find(node)
@@ -0,0 +1,387 @@
+from typing import Dict
+from typing import List
+import multiprocessing
+import itertools
+import heapq
+import queue
+import math
+import time
+
+from sa_pathfinding.algorithms.generics.search_result import SearchLimits
+from sa_pathfinding.algorithms.generics.search_result import Termination
+from sa_pathfinding.environments.generics.env import Environment
+from sa_pathfinding.algorithms.generics.search import Search
+from sa_pathfinding.environments.generics.state import State
+from sa_pathfinding.heuristics.heuristic import Heuristic
+
+"""hash_distributed_astar Module
+
+This module contains an implementation of Hash Distributed A* (HDA*), which
+spreads a single A* search over several worker processes.
+
+Example:
+    Solve a Towers of Hanoi instance on four cores::
+
+        toh = TowersOfHanoi(4, 10, start_peg=0, goal_peg=3)
+        search = HashDistributedAstar(toh, ZeroHeuristic(), start=toh.start,
+                                      goal=toh.goal, workers=4)
+        path = search.get_path()
+        print(search.worker_expansions, search.load_imbalance)
+"""
+
+# message tags exchanged between the coordinator and the workers
+_NODES = 'nodes'
+_INCUMBENT = 'incumbent'
+_PROBE = 'probe'
+_ACK = 'ack'
+_GOAL = 'goal'
+_TRACE = 'trace'
+_PARENT = 'parent'
+_STOP = 'stop'
+_DONE = 'done'
+
+
+def _owner(state: State, workers: int) -> int:
+    return hash(state) % workers
+
+
+class _HDAWorker:
+    """ One HDA* worker, owning the states whose hash maps to its id.
+
+    Generated children owned by other workers are buffered per owner and
+    sent in batches. Only 'nodes' messages are counted in sent/received,
+    which the coordinator uses to detect that no work is in transit.
+    """
+
+    def __init__(self,
+                 wid: int,
+                 env: Environment,
+                 heuristic: Heuristic,
+                 goal: State,
+                 inboxes: List[multiprocessing.Queue],
+                 outbox: multiprocessing.Queue,
+                 batch_size: int) -> None:
+        self.wid = wid
+        self.env = env
+        self.heuristic = heuristic
+        self.goal = goal
+        self.inboxes = inboxes
+        self.inbox = inboxes[wid]
+        self.outbox = outbox
+        self.batch_size = batch_size
+        self.open = []
+        self.best_g: Dict[State, float] = {}
+        self.parents: Dict[State, State] = {}
+        self.closed: Dict[State, float] = {}
+        self.incumbent = math.inf
+        self.counter = itertools.count()
+        self.buffers = [[] for _ in inboxes]
+        self.sent = 0
+        self.received = 0
+        self.expanded = 0
+
+    def run(self) -> None:
+        while True:
+            # handle everything that has arrived before expanding more,
+            # and only block on the inbox when there is nothing to expand
+            try:
+                message = self.inbox.get_nowait()
+            except queue.Empty:
+                if self.has_work():
+                    self.expand_batch()
+                    continue
+                message = self.inbox.get()
+            if not self.handle(message):
+                self.outbox.put((_DONE, self.wid, self.expanded))
+                return
+
+    def has_work(self) -> bool:
+        # drop stale heap entries so the top reflects a live node
+        while len(self.open) > 0:
+            f, neg_g, _, state = self.open[0]
+            if -neg_g > self.best_g[state] or self.closed.get(state, math.inf) <= -neg_g:
+                heapq.heappop(self.open)
+                continue
+            return f < self.incumbent
+        return False
+
+    def handle(self, message) -> bool:
+        tag = message[0]
+        if tag == _NODES:
+            self.received += 1
+            for state, g, parent in message[1]:
+                self.accept(state, g, parent)
+        elif tag == _INCUMBENT:
+            self.incumbent = min(self.incumbent, message[1])
+        elif tag == _PROBE:
+            self.incumbent = min(self.incumbent, message[2])
+            self.outbox.put((_ACK, self.wid, message[1], self.sent,
+                             self.received, not self.has_work(),
+                             self.expanded, len(self.open)))
+        elif tag == _TRACE:
+            self.outbox.put((_PARENT, message[1], self.parents.get(message[1])))
+        elif tag == _STOP:
+            return False
+        return True
+
+    def accept(self, state: State, g: float, parent: State) -> None:
+        if g >= self.best_g.get(state, math.inf):
+            return
+        self.best_g[state] = g
+        self.parents[state] = parent
+        if state == self.goal:
+            if g < self.incumbent:
+                self.incumbent = g
+                self.outbox.put((_GOAL, self.wid, g))
+            return
+        f = g + self.heuristic.get_cost(state, self.goal)
+        heapq.heappush(self.open, (f, -g, next(self.counter), state))
+
+    def expand_batch(self) -> None:
+        workers = len(self.inboxes)
+        for _ in range(self.batch_size):
+            if not self.has_work():
+                break
+            _, neg_g, _, state = heapq.heappop(self.open)
+            g = -neg_g
+            self.closed[state] = g
+            self.expanded += 1
+            for action, cost in self.env.get_actions(state, self.parents[state]):
+                child = self.env.apply_action(state, action)
+                owner = _owner(child, workers)
+                if owner == self.wid:
+                    self.accept(child, g + cost, state)
+                else:
+                    buffer = self.buffers[owner]
+                    buffer.append((child, g + cost, state))
+                    if len(buffer) >= self.batch_size:
+                        self.send(owner)
+        for owner in range(workers):
+            if len(self.buffers[owner]) > 0:
+                self.send(owner)
+
+    def send(self, owner: int) -> None:
+        self.inboxes[owner].put((_NODES, self.buffers[owner]))
+        self.buffers[owner] = []
+        self.sent += 1
+
+
+def _run_worker(*args) -> None:
+    _HDAWorker(*args).run()
+
+
+class HashDistributedAstar(Search):
+    """ This class implements Hash Distributed A* (HDA*).
+
+    Every state is owned by the worker process given by hash(state) modulo
+    the number of workers. Each worker keeps its own open and closed lists,
+    expands its best nodes in batches, and sends generated children owned
+    by other workers over their queues, also in batches.
+
+    A worker reports every goal it reaches. The coordinator broadcasts the
+    cheapest goal cost (the incumbent) and workers stop expanding nodes
+    whose f-cost is not below it. The search terminates when every worker
+    is idle and no nodes are in transit, which is detected by two
+    consecutive probe waves reporting the same, balanced sent and received
+    message counts. At that point every node with f below the incumbent has
+    been expanded, so with an admissible heuristic the incumbent is optimal.
+
+    States must be hashable, picklable, and hash to the same value in every
+    process (true for GridState, TOHState and other int-based states).
+
+    Limits are checked by the coordinator once per probe wave, so a search
+    may overshoot max_expansions slightly. max_open_bytes is not supported.
+
+    Attributes:
+        heuristic (:obj:'str'): heuristic name.
+        worker_expansions (:obj:'list' of :obj:'int'): Nodes expanded by
+            each worker, available after the search.
+        load_imbalance (:obj:'float'): Most expansions by one worker over
+            the mean, 1.0 being perfectly balanced.
+        cost (:obj:'float'): Cost of the path found, None if none was found.
+    """
+
+    __slots__ = '_heuristic _workers _batch_size _worker_expansions _cost'.split()
+
+    optimal = True
+
+    def __init__(self,
+                 env: Environment,
+                 heuristic: Heuristic,
+                 start: State = None,
+                 goal: State = None,
+                 workers: int = 2,
+                 batch_size: int = 64,
+                 verbose: bool = False,
+                 limits: SearchLimits = None) -> None:
+        """HashDistributedAstar __init__ method.
+
+        Args:
+            env (:obj:'Environment'): Environment being being searched.
+            heuristic (:obj:'Heuristic'): Admissible heuristic.
+            start (:obj:`State`, optional): State to start search from.
+            goal (:obj:`State`): State to search to.
+            workers (:obj:'int'): Number of worker processes.
+            batch_size (:obj:'int'): Nodes expanded between inbox checks,
+                and the size at which outgoing node buffers are flushed.
+            verbose (:obj:'bool'): Flag for verbose printing.
+            limits (:obj:'SearchLimits', optional): Search budgets.
+        """
+        super().__init__(env, start=start, goal=goal, verbose=verbose,
+                         limits=limits)
+        if workers < 1:
+            raise ValueError('HashDistributedAstar needs at least one worker.')
+        self._heuristic = heuristic
+        self._workers = workers
+        self._batch_size = batch_size
+        self._worker_expansions = []
+        self._cost = None
+        self._history['heuristic'] = str(self._heuristic.name)
+
+    @property
+    def heuristic(self):
+        return self._heuristic.name
+
+    @property
+    def worker_expansions(self) -> List[int]:
+        return self._worker_expansions
+
+    @property
+    def load_imbalance(self) -> float:
+        if sum(self._worker_expansions) == 0:
+            return 1.0
+        mean = sum(self._worker_expansions) / len(self._worker_expansions)
+        return max(self._worker_expansions) / mean
+
+    @property
+    def cost(self) -> float:
+        return self._cost
+
+    def run(self) -> List[State]:
+        return self.get_path()
+
+    def get_path(self) -> List[State]:
+        """get_path() executes the search from beginning to end.
+
+        Returns:
+            List[State] where list is empty if search does not return
+                a path and full of connected nodes if a path was found.
+        """
+        if self._termination is not None:
+            return self._path
+        ctx = multiprocessing.get_context()
+        inboxes = [ctx.Queue() for _ in range(self._workers)]
+        outbox = ctx.Queue()
+        processes = [ctx.Process(target=_run_worker,
+                                 args=(wid, self._env, self._heuristic, self._goal,
+                                       inboxes, outbox, self._batch_size),
+                                 daemon=True)
+                     for wid in range(self._workers)]
+        self._started = time.perf_counter()
+        for process in processes:
+            process.start()
+        try:
+            inboxes[_owner(self._start, self._workers)].put(
+                (_NODES, [(self._start, 0, None)]))
+            incumbent = self._wait_for_termination(inboxes, outbox)
+            if self._termination is not None:
+                # a limit was hit, the incumbent (if any) is not proven optimal
+                self._success = False
+            elif incumbent < math.inf:
+                self._cost = incumbent
+                self._path = self._env.concrete_path(self._collect_path(inboxes, outbox))
+                self._success = True
+                self._history['path'] = self._path
+                self._terminate(Termination.SUCCESS)
+            else:
+                self._success = False
+                self._terminate(Termination.EXHAUSTED)
+            for inbox in inboxes:
+                inbox.put((_STOP,))
+            expansions = [0] * self._workers
+            finished = 0
+            while finished < self._workers:
+                message = outbox.get()
+                if message[0] == _DONE:
+                    expansions[message[1]] = message[2]
+                    finished += 1
+            self._worker_expansions = expansions
+            self._nodes_expanded = sum(expansions)
+            self._history['nodes_expanded'] = self._nodes_expanded
+        finally:
+            for process in processes:
+                process.join(timeout=1)
+                if process.is_alive():
+                    process.terminate()
+        if self._verbose:
+            print(f"Nodes Expanded: {self._nodes_expanded}, "
+                  f"per worker: {self._worker_expansions}")
+            print(f"Path: {self._path}")
+        return self._path
+
+    def _wait_for_termination(self,
+                              inboxes: List[multiprocessing.Queue],
+                              outbox: multiprocessing.Queue) -> float:
+        incumbent = math.inf
+        # the coordinator sent the start node, count it as a sent message
+        initial_sent = 1
+        wave = 0
+        acks = {}
+        previous = None
+        limits = self._limits if self._limits is not None else SearchLimits()
+        for inbox in inboxes:
+            inbox.put((_PROBE, wave, incumbent))
+        while True:
+            timeout = None
+            if limits.max_time is not None:
+                timeout = max(0.0, limits.max_time - (time.perf_counter() - self._started))
+            try:
+                message = outbox.get(timeout=timeout)
+            except queue.Empty:
+                self._terminate(Termination.TIME_LIMIT)
+                return incumbent
+            if message[0] == _GOAL:
+                if message[2] < incumbent:
+                    incumbent = message[2]
+                    for inbox in inboxes:
+                        inbox.put((_INCUMBENT, incumbent))
+            elif message[0] == _ACK and message[2] == wave:
+                acks[message[1]] = message[3:]
+                if len(acks) < self._workers:
+                    continue
+                sent = initial_sent + sum(ack[0] for ack in acks.values())
+                received = sum(ack[1] for ack in acks.values())
+                quiet = all(ack[2] for ack in acks.values()) and sent == received
+                expanded = sum(ack[3] for ack in acks.values())
+                open_size = sum(ack[4] for ack in acks.values())
+                if limits.max_expansions is not None and expanded >= limits.max_expansions:
+                    self._terminate(Termination.EXPANSION_LIMIT)
+                    return incumbent
+                if limits.max_open is not None and open_size > limits.max_open:
+                    self._terminate(Termination.OPEN_LIMIT)
+                    return incumbent
+                if quiet and previous == (sent, received):
+                    return incumbent
+                previous = (sent, received) if quiet else None
+                wave += 1
+                acks = {}
+                for inbox in inboxes:
+                    inbox.put((_PROBE, wave, incumbent))
+
+    def _collect_path(self,
+                      inboxes: List[multiprocessing.Queue],
+                      outbox: multiprocessing.Queue) -> List[State]:
+        # follow parent pointers from the goal, asking each state's owner
+        path = [self._goal]
+        state = self._goal
+        while True:
+            inboxes[_owner(state, self._workers)].put((_TRACE, state))
+            message = outbox.get()
+            while message[0] != _PARENT:
+                message = outbox.get()
+            if message[2] is None:
+                break
+            state = message[2]
+            path.append(state)
+        path.reverse()
+        return path
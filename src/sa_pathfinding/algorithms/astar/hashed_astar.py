@@ -0,0 +1,87 @@
+from typing import Set
+
+from sa_pathfinding.algorithms.generics.search_result import SearchLimits
+from sa_pathfinding.algorithms.generics.metrics import SearchMetrics
+from sa_pathfinding.algorithms.generics.open_list import BucketOpenList
+from sa_pathfinding.algorithms.generics.trace import TraceSink
+from sa_pathfinding.algorithms.astar.generic_astar import GenericAstar
+from sa_pathfinding.algorithms.generics.search_node import SearchNode
+from sa_pathfinding.environments.generics.env import Environment
+from sa_pathfinding.environments.generics.state import State
+from sa_pathfinding.heuristics.heuristic import Heuristic
+
+"""hashed_astar Module
+
+This module contains an implementation of the A* algorithm for
+environments with hashable states.
+
+Example:
+    Solve a Towers of Hanoi instance with a pattern database::
+
+        toh = CompactTowersOfHanoi(4, 12, start_peg=0, goal_peg=3)
+        astar = HashedAstar(toh, TOHPatternDatabaseHeuristic(toh),
+                            start=toh.start, goal=toh.goal)
+        path = astar.get_path()
+"""
+
+
+class HashedAstar(GenericAstar):
+    """ This class implements the A* search algorithm for hashable states.
+
+    GenericAstar checks the open and closed lists by comparing every node
+    on them, so it works with any state but is quadratic in the number of
+    expansions. HashedAstar keeps the states on closed in a set, and
+    defaults to BucketOpenList, which indexes open by state, so both
+    checks take constant time, as GridOptimizedAstar does for grids.
+
+    BucketOpenList needs integer costs; pass another indexed open list,
+    or HeapOpenList, for other costs.
+
+    Note: As in GridOptimizedAstar, the closed list is not kept, only the
+            set of its states.
+
+    All attributes are read-only properties, see GenericAstar.
+    """
+
+    __slots__ = '_closed_states'
+
+    def __init__(self,
+                 env: Environment,
+                 heuristic: Heuristic,
+                 start: State = None,
+                 goal: State = None,
+                 verbose: bool = False,
+                 limits: SearchLimits = None,
+                 open_list: type = None,
+                 trace: TraceSink = None,
+                 metrics: SearchMetrics = None):
+        """HashedAstar __init__ method.
+
+        Args:
+            env (:obj:'Environment'): Environment being being searched.
+            heuristic (:obj:'Heuristic'): Heuristic to search with.
+            start (:obj:`State`, optional): State to start search from.
+            goal (:obj:`State`): State to search to.
+            verbose (:obj:'bool'): Flag for verbose printing.
+            limits (:obj:'SearchLimits', optional): Search budgets.
+            open_list (:obj:'type', optional): OpenList class for open,
+                BucketOpenList by default.
+            trace (:obj:'TraceSink', optional): Sink to record expansions to.
+            metrics (:obj:'SearchMetrics', optional): Counters to record to.
+        """
+        self._closed_states: Set[State] = set()
+        super().__init__(env,
+                         heuristic,
+                         start=start,
+                         goal=goal,
+                         verbose=verbose,
+                         limits=limits,
+                         open_list=BucketOpenList if open_list is None else open_list,
+                         trace=trace,
+                         metrics=metrics)
+
+    def _add_to_closed(self, node: SearchNode) -> None:
+        self._closed_states.add(node.state)
+
+    def _is_on_closed(self, node: SearchNode) -> bool:
+        return node.state in self._closed_states
@@ -0,0 +1,152 @@
+from typing import List
+
+from sa_pathfinding.algorithms.generics.search_result import SearchLimits
+from sa_pathfinding.algorithms.generics.metrics import SearchMetrics
+from sa_pathfinding.algorithms.generics.trace import TraceSink
+from sa_pathfinding.algorithms.astar.grid_optimized_astar import GridOptimizedAstar
+from sa_pathfinding.heuristics.multi_goal_heuristic import MultiGoalGridHeuristic
+from sa_pathfinding.environments.grids.octile_grid import StateNotValidError
+from sa_pathfinding.heuristics.multi_goal_heuristic import MultiGoalHeuristic
+from sa_pathfinding.algorithms.astar.generic_astar import GenericAstar
+from sa_pathfinding.algorithms.generics.search_node import SearchNode
+from sa_pathfinding.environments.generics.env import Environment
+from sa_pathfinding.environments.grids.generics.grid import Grid
+from sa_pathfinding.environments.generics.state import State
+from sa_pathfinding.heuristics.heuristic import Heuristic
+
+"""multi_goal_astar Module
+
+This module contains an implementation of A* that searches towards the
+closest of a set of goal states.
+
+Example:
+    Find the path to the nearest of several resource cells::
+
+        goals = [GridState(12, 40), GridState(80, 3), GridState(55, 61)]
+        search = GridOptimizedMultiGoalAstar(env, OctileGridHeuristic(),
+                                             goals=goals, start=start)
+        path = search.get_path()
+        print(search.reached_goal)
+"""
+
+
+class MultiGoalAstar(GenericAstar):
+    """ This class implements A* towards the nearest of several goals.
+
+    MultiGoalAstar inherits from GenericAstar. The search terminates on the
+    first goal selected for expansion from the open list, which is the
+    closest goal as long as the heuristic is admissible for every goal.
+    The provided heuristic is wrapped in a MultiGoalHeuristic that returns
+    the minimum estimate over all goals.
+
+    The 'goal' attribute is the first of the provided goals. Use 'goals'
+    for the full set and 'reached_goal' for the goal the path leads to.
+
+    Note: goal states must be hashable.
+
+    Attributes:
+        goals (:obj:'list' of :obj:'State'): The goal states searched for.
+        reached_goal (:obj:'State'): The goal found by the search, None
+            until the search succeeds.
+    """
+
+    def __init__(self,
+                 env: Environment,
+                 heuristic: Heuristic,
+                 goals: List[State],
+                 start: State = None,
+                 verbose: bool = False,
+                 limits: SearchLimits = None,
+                 open_list: type = None,
+                 trace: TraceSink = None,
+                 metrics: SearchMetrics = None):
+        """MultiGoalAstar __init__ method.
+
+        Args:
+            env (:obj:'Environment'): Environment being being searched.
+            heuristic (:obj:'Heuristic'): Single-goal heuristic to take
+                the minimum of across goals.
+            goals (:obj:'list' of :obj:`State`): States to search to.
+            start (:obj:`State`, optional): State to start search from.
+            verbose (:obj:'bool'): Flag for verbose printing.
+            limits (:obj:'SearchLimits', optional): Search budgets.
+            open_list (:obj:'type', optional): OpenList class for open.
+            trace (:obj:'TraceSink', optional): Sink to record expansions to.
+            metrics (:obj:'SearchMetrics', optional): Counters to record to.
+        """
+        if len(goals) == 0:
+            raise ValueError('MultiGoalAstar needs at least one goal.')
+        for goal in goals:
+            if not env.is_valid(goal):
+                raise StateNotValidError(goal)
+        self._goals = list(goals)
+        self._goal_set = set(self._goals)
+        self._reached_goal = None
+        super().__init__(env,
+                         heuristic=self._wrap_heuristic(heuristic),
+                         start=start,
+                         goal=self._goals[0],
+                         verbose=verbose,
+                         limits=limits,
+                         open_list=open_list,
+                         trace=trace,
+                         metrics=metrics)
+
+    @property
+    def goals(self) -> List[State]:
+        return self._goals
+
+    @property
+    def reached_goal(self) -> State:
+        return self._reached_goal
+
+    def _wrap_heuristic(self, heuristic: Heuristic) -> Heuristic:
+        if isinstance(heuristic, MultiGoalHeuristic):
+            return heuristic
+        return MultiGoalHeuristic(heuristic, self._goals)
+
+    def _check_reachable(self) -> bool:
+        return any(self._env.is_reachable(self._start, goal) for goal in self._goals)
+
+    def _is_goal(self, node: SearchNode) -> bool:
+        return node.state in self._goal_set
+
+    def _on_goal(self, node: SearchNode) -> bool:
+        self._reached_goal = node.state
+        return super()._on_goal(node)
+
+
+class GridOptimizedMultiGoalAstar(MultiGoalAstar, GridOptimizedAstar):
+    """ This class implements A* towards the nearest of several goals,
+    optimized for grids.
+
+    Combines the goal handling of MultiGoalAstar with the status overlay of
+    GridOptimizedAstar. The min-over-goals heuristic uses a spatial index of
+    the goals (see MultiGoalGridHeuristic) so that it stays cheap with
+    hundreds of goals.
+    """
+
+    def __init__(self,
+                 env: Grid,
+                 heuristic: Heuristic,
+                 goals: List[State],
+                 start: State = None,
+                 verbose: bool = False,
+                 limits: SearchLimits = None,
+                 open_list: type = None,
+                 trace: TraceSink = None,
+                 metrics: SearchMetrics = None):
+        super().__init__(env,
+                         heuristic,
+                         goals=goals,
+                         start=start,
+                         verbose=verbose,
+                         limits=limits,
+                         open_list=open_list,
+                         trace=trace,
+                         metrics=metrics)
+
+    def _wrap_heuristic(self, heuristic: Heuristic) -> Heuristic:
+        if isinstance(heuristic, MultiGoalHeuristic):
+            return heuristic
+        return MultiGoalGridHeuristic(heuristic, self._goals)
@@ -1,6 +1,10 @@
 from typing import List
 import queue
 
+from sa_pathfinding.algorithms.generics.search_result import SearchLimits
+from sa_pathfinding.algorithms.generics.metrics import SearchMetrics
+from sa_pathfinding.algorithms.generics.trace import TraceSink
+from sa_pathfinding.algorithms.generics.search_result import Termination
 from sa_pathfinding.algorithms.generics.search_node import SearchNode
 from sa_pathfinding.environments.generics.env import Environment
 from sa_pathfinding.algorithms.generics.search import Search
@@ -61,7 +65,10 @@ class GenericBFS(Search):
                 env: Environment,
                 start: State,
                 goal: State,
-                verbose: bool=False):
+                verbose: bool=False,
+                limits: SearchLimits = None,
+                trace: TraceSink = None,
+                metrics: SearchMetrics = None):
         """GenericBFS __init__ method.
 
         Attributes env, start, goal, nodes_expanded, path, success, verbose
@@ -78,11 +85,17 @@ class GenericBFS(Search):
             start (:obj:`State`, optional): State to start search from.
             goal (:obj:`State`): State to search to.
             verbose (:obj:'bool'): Flag for verbose printing.
+            limits (:obj:'SearchLimits', optional): Search budgets.
+            trace (:obj:'TraceSink', optional): Sink to record expansions to.
+            metrics (:obj:'SearchMetrics', optional): Counters to record to.
         """
         super().__init__(env, 
                         start=start, 
                         goal=goal, 
-                        verbose=verbose)
+                        verbose=verbose,
+                        limits=limits,
+                        trace=trace,
+                        metrics=metrics)
         self._open = []
         self._add_to_open(SearchNode(self._start))
     
@@ -91,6 +104,12 @@ class GenericBFS(Search):
 
     def _remove_from_open(self) -> SearchNode:
         return self._open.pop(0)
+
+    def _open_size(self) -> int:
+        return len(self._open)
+
+    def _peek_open(self) -> SearchNode:
+        return self._open[0] if len(self._open) > 0 else None
     
     def step(self):
         """step generator
@@ -105,51 +124,59 @@ class GenericBFS(Search):
             [SearchNode<...> [SearchNode<...>, SearchNode<...>, ...], ...]
         """
         while len(self._open) > 0:
-            
-            node = self._remove_from_open()
-
-            self._nodes_expanded += 1
-            self.history['nodes_expanded'] = self._nodes_expanded
-
-            if node.state == self.goal:
-                self._success = True
-                # re-create path by following parents from goal to start
-                self._path.append(node.state)
-                # start has None as parent, so walk back until that None parent is hit
-                while node.parent is not None:
-                    node = node.parent
-                    self._path.append(node.state)
-                self._path = list(reversed(self._path))
-                self._history['path'] = self._path
-                if self._verbose:
-                    print("---------------------------------------------")
-                    print("Search terminated successfully")
-                    print(f"Path of length {len(self._path)} from {self._start} "
-                        f"to {self._goal} found.")
-                    print(f"Nodes Expanded: {self._nodes_expanded}")
-                    print(f"Path: {self._path}")
-                    print("---------------------------------------------\n\n")
+
+            if self._should_stop():
+                return
+
+            to_open = list()
+            node = self._expand(to_open)
+            self._history['nodes_expanded'] = self._nodes_expanded
+            if self._termination is not None:
                 return
-            
-            parent = node.parent.state if node.parent is not None else None
-            action_cost_tuples = self._env.get_actions(node.state, parent)
+            yield node, to_open
+        self._terminate(Termination.EXHAUSTED)
+        return
+
+    def _expand(self, to_open: List[SearchNode] = None) -> SearchNode:
+        """Removes the next node from open and expands it, see
+        GenericAstar._expand()."""
+        node = self._remove_from_open()
+        self._nodes_expanded += 1
+
+        metrics = self._metrics
+        if self._is_goal(node) and self._on_goal(node):
+            if metrics is not None:
+                metrics.on_expand(0, 0, 0, len(self._open))
+            return node
+
+        trace = self._trace
+        if to_open is None and trace is not None:
             to_open = list()
 
-            # generate children nodes based on available actions of our 'state'
-            # ignoring cost becuase BFS doesn't have a concept of cost, just order
-            for action, _ in action_cost_tuples:
+        state = node.state
+        parent = node.parent.state if node.parent is not None else None
+        add_to_open = self._add_to_open
+        apply_action = self._apply_action
+        actions = self._get_actions(state, parent)
+
+        # generate children nodes based on available actions of our 'state'
+        # ignoring cost becuase BFS doesn't have a concept of cost, just order
+        for action, _ in actions:
 
-                # apply the action to generate new state
-                new_state = self._env.apply_action(node.state, action)
-                new_node = SearchNode(new_state, parent=node)
-                self._add_to_open(new_node)
+            # apply the action to generate new state
+            new_node = SearchNode(apply_action(state, action), parent=node)
+            add_to_open(new_node)
+            if to_open is not None:
                 to_open.append(new_node)
-            
-            self._history['steps'][f"step-{self._nodes_expanded}"] = {}
-            self._history['steps'][f"step-{self._nodes_expanded}"]['expanded'] = repr(node)
-            self._history['steps'][f"step-{self._nodes_expanded}"]['to_open'] = repr(to_open)
-            yield node, to_open
-        return
+
+        if metrics is not None:
+            # BFS does no duplicate detection, every child goes on open
+            metrics.on_expand(len(actions), 0, 0, len(self._open))
+
+        if trace is not None:
+            trace.record(self._nodes_expanded, state,
+                         [new_node.state for new_node in to_open])
+        return node
 
     def get_path(self) -> List[State]:
         """get_path() executes the search from beginning to end. No other
@@ -160,13 +187,13 @@ class GenericBFS(Search):
             List[State] where list is empty if search does not return
                 a path and full of connected nodes if a path was found.
         """ 
-        if self._verbose:
-            print("Starting search...")
+        if not self._verbose:
+            return self.run()
+        print("Starting search...")
         for node, to_open in self.step():
-            if self._verbose:
-                print(f"Step: {self._nodes_expanded}, "
-                      f"Chosen for expansion: {node}, "
-                      f"Nodes generated: {to_open}")
+            print(f"Step: {self._nodes_expanded}, "
+                  f"Chosen for expansion: {node}, "
+                  f"Nodes generated: {to_open}")
         return self._path
     
     @property
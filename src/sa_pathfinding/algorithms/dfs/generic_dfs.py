@@ -1,5 +1,8 @@
 import queue
 
+from sa_pathfinding.algorithms.generics.search_result import SearchLimits
+from sa_pathfinding.algorithms.generics.metrics import SearchMetrics
+from sa_pathfinding.algorithms.generics.trace import TraceSink
 from sa_pathfinding.algorithms.bfs.generic_bfs import GenericBFS
 from sa_pathfinding.environments.generics.env import Environment
 from sa_pathfinding.environments.generics.state import State
@@ -62,7 +65,10 @@ class GenericDFS(GenericBFS):
                 env: Environment, 
                 start: State=None, 
                 goal: State=None, 
-                verbose: bool=False):
+                verbose: bool=False,
+                limits: SearchLimits = None,
+                trace: TraceSink = None,
+                metrics: SearchMetrics = None):
         """GenericDFS __init__ method.
 
         Attributes env, start, goal, nodes_expanded, path, success, verbose
@@ -80,8 +86,12 @@ class GenericDFS(GenericBFS):
             start (:obj:`State`, optional): State to start search from.
             goal (:obj:`State`): State to search to.
             verbose (:obj:'bool'): Flag for verbose printing.
+            limits (:obj:'SearchLimits', optional): Search budgets.
+            trace (:obj:'TraceSink', optional): Sink to record expansions to.
+            metrics (:obj:'SearchMetrics', optional): Counters to record to.
         """
-        super().__init__(env=env, start=start, goal=goal)
+        super().__init__(env=env, start=start, goal=goal, verbose=verbose,
+                         limits=limits, trace=trace, metrics=metrics)
     
     def _remove_from_open(self):
         return self._open.pop(len(self._open) - 1)
\ No newline at end of file
@@ -1,3 +1,6 @@
+from sa_pathfinding.algorithms.generics.search_result import SearchLimits
+from sa_pathfinding.algorithms.generics.metrics import SearchMetrics
+from sa_pathfinding.algorithms.generics.trace import TraceSink
 from sa_pathfinding.algorithms.astar.grid_optimized_astar import GridOptimizedAstar
 from sa_pathfinding.environments.grids.generics.grid import Grid
 from sa_pathfinding.heuristics.heuristic import ZeroHeuristic
@@ -67,7 +70,11 @@ class GridOptimizedDijkstra(GridOptimizedAstar):
                  env: Grid,
                  start: State = None,
                  goal: State = None,
-                 verbose: bool = False):
+                 verbose: bool = False,
+                 limits: SearchLimits = None,
+                 open_list: type = None,
+                 trace: TraceSink = None,
+                 metrics: SearchMetrics = None):
         """GridOptimizedDijkstra __init__ method.
 
         Attributes env, start, goal, nodes_expanded, path, success, verbose
@@ -78,9 +85,17 @@ class GridOptimizedDijkstra(GridOptimizedAstar):
             start (:obj:`State`, optional): State to start search from.
             goal (:obj:`State`): State to search to.
             verbose (:obj:'bool'): Flag for verbose printing.
+            limits (:obj:'SearchLimits', optional): Search budgets.
+            open_list (:obj:'type', optional): OpenList class for open.
+            trace (:obj:'TraceSink', optional): Sink to record expansions to.
+            metrics (:obj:'SearchMetrics', optional): Counters to record to.
         """
         super().__init__(env,
                          heuristic=ZeroHeuristic(),
                          start=start,
                          goal=goal,
-                         verbose=verbose)
+                         verbose=verbose,
+                         limits=limits,
+                         open_list=open_list,
+                         trace=trace,
+                         metrics=metrics)
@@ -0,0 +1,143 @@
+from typing import Dict
+from typing import List
+
+from sa_pathfinding.algorithms.generics.search_result import SearchLimits
+from sa_pathfinding.algorithms.generics.metrics import SearchMetrics
+from sa_pathfinding.algorithms.generics.trace import TraceSink
+from sa_pathfinding.algorithms.generics.search_result import Termination
+from sa_pathfinding.algorithms.astar.multi_goal_astar import GridOptimizedMultiGoalAstar
+from sa_pathfinding.algorithms.astar.multi_goal_astar import MultiGoalAstar
+from sa_pathfinding.algorithms.generics.search_node import SearchNode
+from sa_pathfinding.environments.generics.env import Environment
+from sa_pathfinding.environments.grids.generics.grid import Grid
+from sa_pathfinding.heuristics.heuristic import ZeroHeuristic
+from sa_pathfinding.environments.generics.state import State
+from sa_pathfinding.heuristics.heuristic import Heuristic
+
+"""one_to_many_dijkstra Module
+
+This module contains a Dijkstra search that finds the shortest paths from
+one start to every state in a set of goals with a single expansion.
+
+Example:
+    Paths to every resource cell from a spawn point::
+
+        search = GridOptimizedOneToManyDijkstra(env, goals=goals, start=spawn)
+        for goal, path in search.get_paths().items():
+            print(goal, len(path))
+"""
+
+
+class OneToManyDijkstra(MultiGoalAstar):
+    """ This class implements a one-to-many Dijkstra search.
+
+    OneToManyDijkstra inherits from MultiGoalAstar, using a heuristic that
+    always returns 0. Instead of stopping at the first goal, every goal is
+    recorded as it is selected for expansion and the search stops once all
+    goals have been reached or the open list is exhausted.
+
+    The 'path' and 'reached_goal' attributes refer to the nearest goal.
+
+    Attributes:
+        paths (:obj:'dict'): Goal state to path, for every goal reached so far.
+    """
+
+    def __init__(self,
+                 env: Environment,
+                 goals: List[State],
+                 start: State = None,
+                 verbose: bool = False,
+                 limits: SearchLimits = None,
+                 open_list: type = None,
+                 trace: TraceSink = None,
+                 metrics: SearchMetrics = None):
+        """OneToManyDijkstra __init__ method.
+
+        Args:
+            env (:obj:'Environment'): Environment being being searched.
+            goals (:obj:'list' of :obj:`State`): States to find paths to.
+            start (:obj:`State`, optional): State to start search from.
+            verbose (:obj:'bool'): Flag for verbose printing.
+            limits (:obj:'SearchLimits', optional): Search budgets.
+            open_list (:obj:'type', optional): OpenList class for open.
+            trace (:obj:'TraceSink', optional): Sink to record expansions to.
+            metrics (:obj:'SearchMetrics', optional): Counters to record to.
+        """
+        self._paths: Dict[State, List[State]] = {}
+        super().__init__(env,
+                         heuristic=ZeroHeuristic(),
+                         goals=goals,
+                         start=start,
+                         verbose=verbose,
+                         limits=limits,
+                         open_list=open_list,
+                         trace=trace,
+                         metrics=metrics)
+
+    @property
+    def paths(self) -> Dict[State, List[State]]:
+        return self._paths
+
+    def _wrap_heuristic(self, heuristic: Heuristic) -> Heuristic:
+        # the minimum of zero over any number of goals is still zero
+        return heuristic
+
+    def _check_reachable(self) -> bool:
+        # goals in another component would otherwise keep the search going
+        # until every reachable state has been expanded
+        self._goal_set = {goal for goal in self._goal_set
+                          if self._env.is_reachable(self._start, goal)}
+        return len(self._goal_set) > 0
+
+    def _on_goal(self, node: SearchNode) -> bool:
+        path = self._trace_path(node)
+        self._paths[node.state] = path
+        self._goal_set.discard(node.state)
+        if self._reached_goal is None:
+            self._reached_goal = node.state
+            self._success = True
+            self._path = path
+            self._history['path'] = path
+        if self._verbose:
+            print(f"Reached goal {node.state} with a path of length {len(path)}, "
+                  f"{len(self._goal_set)} goals remaining.")
+        if len(self._goal_set) > 0:
+            return False
+        self._terminate(Termination.SUCCESS)
+        return True
+
+    def get_paths(self) -> Dict[State, List[State]]:
+        """get_paths() executes the search from beginning to end.
+
+        Returns:
+            Dict[State, List[State]] mapping every goal, in the order
+                provided, to its shortest path. Unreachable goals map to
+                an empty list.
+        """
+        self.get_path()
+        return {goal: self._paths.get(goal, []) for goal in self._goals}
+
+
+class GridOptimizedOneToManyDijkstra(OneToManyDijkstra, GridOptimizedMultiGoalAstar):
+    """ This class implements a one-to-many Dijkstra search, optimized for grids.
+
+    See OneToManyDijkstra and GridOptimizedAstar for details.
+    """
+
+    def __init__(self,
+                 env: Grid,
+                 goals: List[State],
+                 start: State = None,
+                 verbose: bool = False,
+                 limits: SearchLimits = None,
+                 open_list: type = None,
+                 trace: TraceSink = None,
+                 metrics: SearchMetrics = None):
+        super().__init__(env,
+                         goals=goals,
+                         start=start,
+                         verbose=verbose,
+                         limits=limits,
+                         open_list=open_list,
+                         trace=trace,
+                         metrics=metrics)
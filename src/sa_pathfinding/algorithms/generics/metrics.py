@@ -0,0 +1,139 @@
+from typing import Callable
+from typing import Iterable
+from typing import Dict
+import time
+
+"""metrics Module
+
+This module contains the counters a search can record about its own cost.
+Searches record nothing unless given a SearchMetrics.
+
+Counting is done with plain integer additions once per expansion. The
+time spent in the environment's get_actions() and apply_action() and in
+the heuristic is measured by wrapping those callables once, when the
+search is constructed, so searches without metrics run the unwrapped
+methods.
+
+Example:
+    Collect the metrics of a batch of searches per algorithm::
+
+        metrics = SearchMetrics()
+        GridOptimizedAstar(env, OctileGridHeuristic(), metrics=metrics).get_path()
+        print(metrics.as_dict())
+"""
+
+
+class SearchMetrics:
+    """ Structured counters of one search, or of several merged together.
+
+    Attributes:
+        expansions (:obj:'int'): Nodes selected for expansion.
+        generated (:obj:'int'): Children generated by expansions.
+        duplicates (:obj:'int'): Generated children whose state was already
+            on open or closed.
+        reopenings (:obj:'int'): Closed nodes put back on open. The searches
+            in this package never reopen, so it stays 0 for them.
+        decrease_keys (:obj:'int'): Nodes on open replaced by a cheaper
+            path to the same state.
+        max_open (:obj:'int'): Largest open list size seen.
+        actions_time (:obj:'float'): Seconds spent in env.get_actions().
+        apply_time (:obj:'float'): Seconds spent in env.apply_action().
+        heuristic_time (:obj:'float'): Seconds spent evaluating the heuristic.
+        elapsed (:obj:'float'): Seconds from the first expansion to the end
+            of the search.
+        expansions_per_second (:obj:'float'): Expansions over elapsed.
+    """
+
+    __slots__ = 'expansions generated duplicates reopenings decrease_keys max_open ' \
+                'actions_time apply_time heuristic_time elapsed'.split()
+
+    _COUNTERS = 'expansions generated duplicates reopenings decrease_keys'.split()
+    _TIMES = 'actions_time apply_time heuristic_time elapsed'.split()
+
+    def __init__(self) -> None:
+        self.expansions = 0
+        self.generated = 0
+        self.duplicates = 0
+        self.reopenings = 0
+        self.decrease_keys = 0
+        self.max_open = 0
+        self.actions_time = 0.0
+        self.apply_time = 0.0
+        self.heuristic_time = 0.0
+        self.elapsed = 0.0
+
+    def __repr__(self) -> str:
+        return f"SearchMetrics({self.as_dict()})"
+
+    @property
+    def expansions_per_second(self) -> float:
+        return self.expansions / self.elapsed if self.elapsed > 0 else 0.0
+
+    def timed(self, attribute: str, func: Callable) -> Callable:
+        """Wraps func so the time spent in it is added to 'attribute',
+        e.g. 'heuristic_time'."""
+        return _Timed(self, attribute, func)
+
+    def on_expand(self,
+                  generated: int,
+                  duplicates: int,
+                  decrease_keys: int,
+                  open_size: int) -> None:
+        """Called by a search after every expansion."""
+        self.expansions += 1
+        self.generated += generated
+        self.duplicates += duplicates
+        self.decrease_keys += decrease_keys
+        if open_size > self.max_open:
+            self.max_open = open_size
+
+    def merge(self, other: 'SearchMetrics') -> 'SearchMetrics':
+        """Adds the counters and times of other to these, keeping the
+        largest max_open, and returns self."""
+        for attribute in self._COUNTERS + self._TIMES:
+            setattr(self, attribute, getattr(self, attribute) + getattr(other, attribute))
+        self.max_open = max(self.max_open, other.max_open)
+        return self
+
+    def as_dict(self) -> Dict[str, float]:
+        """All counters, times and expansions_per_second as a flat dict."""
+        values = {attribute: getattr(self, attribute) for attribute in self.__slots__}
+        values['expansions_per_second'] = self.expansions_per_second
+        return values
+
+    @classmethod
+    def from_dict(cls, values: Dict[str, float]) -> 'SearchMetrics':
+        """Rebuilds metrics from as_dict(), e.g. to merge exported results."""
+        metrics = cls()
+        for attribute in cls.__slots__:
+            if attribute in values:
+                setattr(metrics, attribute, values[attribute])
+        return metrics
+
+    @classmethod
+    def total(cls, metrics: Iterable['SearchMetrics']) -> 'SearchMetrics':
+        """Merges any number of metrics into a new SearchMetrics."""
+        result = cls()
+        for some_metrics in metrics:
+            result.merge(some_metrics)
+        return result
+
+
+class _Timed:
+    # a class rather than a closure so that searches with metrics still pickle
+
+    __slots__ = '_metrics _attribute _func'.split()
+
+    def __init__(self, metrics: SearchMetrics, attribute: str, func: Callable) -> None:
+        self._metrics = metrics
+        self._attribute = attribute
+        self._func = func
+
+    def __call__(self, *args, **kwargs):
+        t1 = time.perf_counter()
+        try:
+            return self._func(*args, **kwargs)
+        finally:
+            metrics = self._metrics
+            setattr(metrics, self._attribute,
+                    getattr(metrics, self._attribute) + time.perf_counter() - t1)
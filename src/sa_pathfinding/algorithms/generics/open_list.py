@@ -0,0 +1,339 @@
+from abc import abstractmethod
+from typing import Iterator
+from typing import Optional
+from typing import Dict
+from typing import List
+from enum import Enum
+from abc import ABC
+import itertools
+import random
+import heapq
+
+from sa_pathfinding.algorithms.generics.search_node import SearchNode
+from sa_pathfinding.environments.generics.state import State
+
+"""open_list Module
+
+This module contains the priority queues the A* family of searches can
+keep its open list in. All of them order nodes on f-cost, and break ties
+with a selectable TieBreak policy, high g-cost by default.
+
+Nodes are stored as precomputed (f, tie, counter, node) tuples, so the
+queues compare plain numbers in C instead of calling SearchNode.__lt__.
+The insertion counter is unique, so nodes themselves are never compared.
+
+Example:
+    Dial's bucket queue on a unit-cost cardinal grid, ties to low g-cost::
+
+        astar = GridOptimizedAstar(CardinalGrid('path/to/file'),
+                                   ManhattanGridHeuristic(costs=(1, 1)),
+                                   open_list=partial(BucketOpenList,
+                                                     tie_break=TieBreak.LOW_G))
+"""
+
+
+class TieBreak(Enum):
+    """How nodes with equal f-cost are ordered."""
+    HIGH_G = 'high-g'
+    LOW_G = 'low-g'
+    LIFO = 'lifo'
+    FIFO = 'fifo'
+    RANDOM = 'random'
+
+
+class OpenList(ABC):
+    """ An abstract class for A* open lists.
+
+    Besides push and pop, an open list finds the node it holds for a state
+    and removes it, which A* needs when it finds a cheaper path to a state
+    that is already on open.
+
+    Attributes:
+        tie_break (:obj:'TieBreak'): Order of nodes with equal f-cost.
+    """
+
+    def __init__(self,
+                 tie_break: TieBreak = TieBreak.HIGH_G,
+                 seed: int = None) -> None:
+        """OpenList __init__ method.
+
+        Args:
+            tie_break (:obj:'TieBreak' or :obj:'str'): Tie-breaking policy,
+                e.g. TieBreak.LIFO or 'lifo'.
+            seed (:obj:'int', optional): Seed of the RANDOM policy.
+        """
+        self._tie_break = TieBreak(tie_break)
+        self._counter = itertools.count()
+        self._random = random.Random(seed)
+
+    @property
+    def tie_break(self) -> TieBreak:
+        return self._tie_break
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[SearchNode]:
+        pass
+
+    @abstractmethod
+    def push(self, node: SearchNode) -> None:
+        pass
+
+    @abstractmethod
+    def pop(self) -> SearchNode:
+        """Removes and returns the best node."""
+        pass
+
+    @abstractmethod
+    def peek(self) -> Optional[SearchNode]:
+        pass
+
+    @abstractmethod
+    def find(self, node: SearchNode) -> Optional[SearchNode]:
+        """Returns the node on open with the same state as node, or None."""
+        pass
+
+    @abstractmethod
+    def remove(self, node: SearchNode) -> None:
+        pass
+
+    def _entry(self, node: SearchNode) -> tuple:
+        """(tie, counter, node) sort key of a node within its f-cost."""
+        count = next(self._counter)
+        tie_break = self._tie_break
+        if tie_break is TieBreak.HIGH_G:
+            return -node.gcost, count, node
+        if tie_break is TieBreak.LOW_G:
+            return node.gcost, count, node
+        if tie_break is TieBreak.FIFO:
+            return count, count, node
+        if tie_break is TieBreak.LIFO:
+            return -count, count, node
+        return self._random.random(), count, node
+
+
+class HeapOpenList(OpenList):
+    """ A binary heap of (f, tie, counter, node) tuples kept with heapq.
+
+    Float f-costs are rounded to 9 decimal places in the key, so costs
+    that only differ by floating point error still count as ties.
+
+    Membership is checked with a linear scan using the state's __eq__(),
+    so any environment works, hashable states or not. Removal swaps the
+    entry with the last one and re-heapifies.
+    """
+
+    __slots__ = '_heap'
+
+    def __init__(self,
+                 tie_break: TieBreak = TieBreak.HIGH_G,
+                 seed: int = None) -> None:
+        super().__init__(tie_break, seed)
+        self._heap: List[tuple] = []
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __iter__(self) -> Iterator[SearchNode]:
+        return (entry[-1] for entry in self._heap)
+
+    def push(self, node: SearchNode) -> None:
+        f = node.fcost if isinstance(node.fcost, int) else round(node.fcost, 9)
+        heapq.heappush(self._heap, (f,) + self._entry(node))
+
+    def pop(self) -> SearchNode:
+        return heapq.heappop(self._heap)[-1]
+
+    def peek(self) -> Optional[SearchNode]:
+        return self._heap[0][-1] if len(self._heap) > 0 else None
+
+    def find(self, node: SearchNode) -> Optional[SearchNode]:
+        for entry in self._heap:
+            if entry[-1] == node:
+                return entry[-1]
+        return None
+
+    def remove(self, node: SearchNode) -> None:
+        for index, entry in enumerate(self._heap):
+            if entry[-1] is node:
+                break
+        else:
+            raise ValueError(f"{node} is not on open.")
+        self._heap[index] = self._heap[-1]
+        self._heap.pop()
+        heapq.heapify(self._heap)
+
+
+class _IndexedOpenList(OpenList):
+    # Shared base of the integer-keyed queues: the live node of every state
+    # is kept in a dict, and removed nodes are left in the queue and skipped
+    # when they come up (lazy deletion). States must be hashable.
+
+    __slots__ = '_index'
+
+    def __init__(self,
+                 tie_break: TieBreak = TieBreak.HIGH_G,
+                 seed: int = None) -> None:
+        super().__init__(tie_break, seed)
+        self._index: Dict[State, SearchNode] = {}
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __iter__(self) -> Iterator[SearchNode]:
+        return iter(self._index.values())
+
+    def find(self, node: SearchNode) -> Optional[SearchNode]:
+        return self._index.get(node.state)
+
+    def remove(self, node: SearchNode) -> None:
+        del self._index[node.state]
+
+    def push(self, node: SearchNode) -> None:
+        if not isinstance(node.fcost, int) or not isinstance(node.gcost, int):
+            raise ValueError(f"{type(self).__name__} needs integer costs, "
+                             f"got f={node.fcost!r}, g={node.gcost!r}.")
+        self._index[node.state] = node
+        self._push(node.fcost, self._entry(node))
+
+    def pop(self) -> SearchNode:
+        while True:
+            node = self._pop()[-1]
+            if self._index.get(node.state) is node:
+                del self._index[node.state]
+                return node
+
+    def peek(self) -> Optional[SearchNode]:
+        if len(self._index) == 0:
+            return None
+        while True:
+            node = self._peek()[-1]
+            if self._index.get(node.state) is node:
+                return node
+            self._pop()
+
+    @abstractmethod
+    def _push(self, key: int, entry: tuple) -> None:
+        pass
+
+    @abstractmethod
+    def _pop(self) -> tuple:
+        pass
+
+    @abstractmethod
+    def _peek(self) -> tuple:
+        pass
+
+
+class BucketOpenList(_IndexedOpenList):
+    """ Dial's bucket queue for integer f-costs.
+
+    Nodes go into one bucket per f-cost, and a cursor walks up the f-costs
+    to the lowest non-empty bucket. Each bucket is a small heap on the
+    tie-breaking key. A push below the cursor (an
+    inconsistent heuristic) moves the cursor back, so the order stays
+    correct, just slower.
+
+    Best when the f-costs are dense, e.g. unit cardinal costs or octile
+    costs scaled to (70, 99); the cursor steps through every integer
+    between successive f-costs.
+    """
+
+    __slots__ = '_buckets _cursor'.split()
+
+    def __init__(self,
+                 tie_break: TieBreak = TieBreak.HIGH_G,
+                 seed: int = None) -> None:
+        super().__init__(tie_break, seed)
+        self._buckets: Dict[int, List[tuple]] = {}
+        self._cursor = None
+
+    def _push(self, key: int, entry: tuple) -> None:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = []
+        heapq.heappush(bucket, entry)
+        if self._cursor is None or key < self._cursor:
+            self._cursor = key
+
+    def _advance(self) -> List[tuple]:
+        bucket = self._buckets.get(self._cursor)
+        while not bucket:
+            if bucket is not None:
+                del self._buckets[self._cursor]
+            self._cursor += 1
+            bucket = self._buckets.get(self._cursor)
+        return bucket
+
+    def _pop(self) -> tuple:
+        return heapq.heappop(self._advance())
+
+    def _peek(self) -> tuple:
+        return self._advance()[0]
+
+
+class RadixHeapOpenList(_IndexedOpenList):
+    """ A radix heap for monotone integer f-costs.
+
+    Bucket i holds keys that first differ from the last popped key in bit
+    i - 1; bucket 0 holds keys equal to it, as a heap on the tie-breaking
+    key. Popping from an empty bucket 0
+    redistributes the lowest non-empty bucket, so each entry moves at most
+    once per bit of the key range.
+
+    Keys must never fall below the last popped key, which holds for A*
+    with a consistent heuristic and for Dijkstra. A lower key raises
+    ValueError.
+    """
+
+    __slots__ = '_buckets _last'.split()
+
+    def __init__(self,
+                 tie_break: TieBreak = TieBreak.HIGH_G,
+                 seed: int = None) -> None:
+        super().__init__(tie_break, seed)
+        self._buckets: List[list] = [[]]
+        self._last = 0
+
+    def _bucket_of(self, key: int) -> int:
+        return (key ^ self._last).bit_length()
+
+    def _push(self, key: int, entry: tuple) -> None:
+        if key < self._last:
+            raise ValueError(f"Key {key} is below the last popped key {self._last}, "
+                             f"the heuristic is not consistent.")
+        i = self._bucket_of(key)
+        if i == 0:
+            heapq.heappush(self._buckets[0], entry)
+            return
+        while len(self._buckets) <= i:
+            self._buckets.append([])
+        self._buckets[i].append((key, entry))
+
+    def _refill(self) -> None:
+        if self._buckets[0]:
+            return
+        i = 1
+        while not self._buckets[i]:
+            i += 1
+        moved = self._buckets[i]
+        self._buckets[i] = []
+        self._last = min(key for key, _ in moved)
+        for key, entry in moved:
+            j = self._bucket_of(key)
+            if j == 0:
+                self._buckets[0].append(entry)
+            else:
+                self._buckets[j].append((key, entry))
+        heapq.heapify(self._buckets[0])
+
+    def _pop(self) -> tuple:
+        self._refill()
+        return heapq.heappop(self._buckets[0])
+
+    def _peek(self) -> tuple:
+        self._refill()
+        return self._buckets[0][0]
@@ -1,12 +1,23 @@
+from typing import TYPE_CHECKING
 from abc import abstractmethod
 from typing import List
 from abc import ABC
+import time
+import sys
 
+from sa_pathfinding.algorithms.generics.search_result import SearchResult
+from sa_pathfinding.algorithms.generics.search_result import SearchLimits
+from sa_pathfinding.algorithms.generics.search_result import Termination
+from sa_pathfinding.algorithms.generics.metrics import SearchMetrics
+from sa_pathfinding.algorithms.generics.trace import TraceSink
 from sa_pathfinding.environments.grids.octile_grid import StateNotValidError
 from sa_pathfinding.algorithms.generics.search_node import SearchNode
 from sa_pathfinding.environments.generics.env import Environment
 from sa_pathfinding.environments.generics.state import State
 
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
 # TODO(Nathan): Change start and goal in all searches to State, create the search node within the search
 
 
@@ -29,16 +40,31 @@ class Search(ABC):
             to. The default is a random passable node from the provided 'env'.
         verbose(:obj:'bool', optional): A boolean flag that, when true, enables
             the printing of information about the search as it runs.
+        limits(:obj:'SearchLimits', optional): Expansion, open list and time
+            budgets. When one is hit the search stops and 'result' says why.
+        trace(:obj:'TraceSink', optional): Sink every expansion is recorded
+            to. Nothing is recorded by default.
+        metrics(:obj:'SearchMetrics', optional): Counters the search records
+            its cost to. Nothing is counted by default.
+        optimal(:obj:'bool'): Class-level flag, true when the algorithm is
+            guaranteed to return a least-cost path on any environment.
     """
 
     __slots__ = '_env _start _goal _verbose ' \
-                '_nodes_expanded _path _success _history'.split()
+                '_nodes_expanded _path _success _history ' \
+                '_limits _termination _best_node _started _elapsed _node_bytes _trace ' \
+                '_metrics _get_actions _apply_action'.split()
+
+    optimal = False
 
     def __init__(self,
                  env: Environment,
                  start: State = None,
                  goal: State = None,
-                 verbose: bool = False) -> None:
+                 verbose: bool = False,
+                 limits: SearchLimits = None,
+                 trace: TraceSink = None,
+                 metrics: SearchMetrics = None) -> None:
         self._env = env
         self._verbose = verbose
         self._nodes_expanded = 0
@@ -46,6 +72,17 @@ class Search(ABC):
         self._success = None
         self._start = None
         self._goal = None
+        self._limits = limits
+        self._termination = None
+        self._best_node = None
+        self._started = None
+        self._elapsed = 0.0
+        self._node_bytes = None
+        self._trace = trace
+        self._metrics = metrics
+        # environment calls made while expanding, timed when metrics are on
+        self._get_actions = self._hook('actions_time', env.get_actions)
+        self._apply_action = self._hook('apply_time', env.apply_action)
 
         if start is None:
             self._start = self._get_random_start()
@@ -63,14 +100,20 @@ class Search(ABC):
 
         self._history = {'start': repr(self._start),
                         'goal': repr(self._goal),
-                        'nodes_expanded': self._nodes_expanded,
-                        'steps': {}}
+                        'nodes_expanded': self._nodes_expanded}
 
         if self._verbose:
             print(f"Search initialized...")
             print(f"Start = {self._start}")
             print(f"Goal = {self._goal}")
 
+        # reject pairs in different connected components without expanding
+        if not self._check_reachable():
+            self._success = False
+            self._terminate(Termination.UNREACHABLE)
+            if self._verbose:
+                print("Goal is not reachable from start.")
+
     def __repr__(self) -> str:
         pass
 
@@ -93,6 +136,32 @@ class Search(ABC):
     @property
     def verbose(self) -> bool:
         return self._verbose
+
+    @property
+    def success(self) -> bool:
+        return self._success
+
+    @property
+    def limits(self) -> SearchLimits:
+        return self._limits
+
+    @property
+    def trace(self) -> TraceSink:
+        return self._trace
+
+    @property
+    def metrics(self) -> SearchMetrics:
+        return self._metrics
+
+    @property
+    def result(self) -> SearchResult:
+        """SearchResult: why the search stopped, with the best partial path."""
+        partial = [] if self._best_node is None else self._trace_path(self._best_node)
+        elapsed = self._elapsed
+        if self._termination is None and self._started is not None:
+            elapsed = time.perf_counter() - self._started
+        return SearchResult(self._termination, self._path, partial,
+                            self._nodes_expanded, elapsed)
     
     @property
     def history(self):
@@ -102,6 +171,175 @@ class Search(ABC):
     def get_path(self) -> List[State]:
         pass
 
+    def run(self) -> List[State]:
+        """run() executes the search from where it is to the end in a single
+        tight loop, without the per-expansion overhead of step().
+
+        Searches plug in by implementing _expand(), the one definition of
+        an expansion that step() also uses.
+
+        Returns:
+            List[State] where list is empty if search does not return
+                a path and full of connected nodes if a path was found.
+        """
+        expand = self._expand
+        should_stop = self._should_stop
+        open_size = self._open_size
+        while open_size() > 0 and not should_stop():
+            expand()
+        if self._termination is None:
+            self._terminate(Termination.EXHAUSTED)
+        return self._path
+
+    async def run_async(self,
+                        batch_size: int = 256,
+                        time_slice: float = None,
+                        executor: 'Executor' = None) -> List[State]:
+        """run_async() executes the search without blocking the event loop.
+
+        Expansions are performed in batches, and control is handed back to
+        the event loop between batches, so many searches can run side by
+        side and interleave fairly. Cancelling the awaiting task stops the
+        search between two batches, leaving it in a consistent state that a
+        later run_async() or get_path() call resumes from.
+
+        Args:
+            batch_size (:obj:'int'): Expansions performed before yielding.
+            time_slice (:obj:'float', optional): Seconds of expanding after
+                which to yield, even if the batch is not complete.
+            executor (:obj:'Executor', optional): Run get_path() in this
+                executor instead, e.g. a ProcessPoolExecutor for CPU-bound
+                work. Cancellation then only abandons the result. A process
+                pool runs a copy of the search; its path, success,
+                termination, expansions, elapsed time and history are
+                copied back, but not its trace, metrics or best partial
+                path.
+
+        Returns:
+            List[State] where list is empty if search does not return
+                a path and full of connected nodes if a path was found.
+        """
+        # imported here, asyncio costs every user of a search tens of
+        # milliseconds of start-up otherwise
+        import asyncio
+        if executor is not None or not hasattr(self, 'step'):
+            loop = asyncio.get_running_loop()
+            # a process pool runs a copy of the search, so keep its outcome here
+            (self._path, self._success, self._termination, self._nodes_expanded,
+             self._elapsed, self._history) = await loop.run_in_executor(executor, _run_search,
+                                                                        self)
+            return self._path
+        steps = self.step()
+        done = False
+        while not done:
+            t1 = time.perf_counter()
+            for expanded, _ in enumerate(steps, 1):
+                if expanded >= batch_size or (time_slice is not None and
+                                              time.perf_counter() - t1 >= time_slice):
+                    break
+            else:
+                done = True
+            await asyncio.sleep(0)
+        return self._path
+
+    def _check_reachable(self) -> bool:
+        """Called once at construction, False if the goal cannot be reached."""
+        return self._env.is_reachable(self._start, self._goal)
+
+    def _hook(self, attribute: str, func):
+        """Returns func, timed into 'attribute' of the metrics if there are any."""
+        if self._metrics is None:
+            return func
+        return self._metrics.timed(attribute, func)
+
+    def _expand(self, to_open: List[SearchNode] = None) -> SearchNode:
+        raise NotImplementedError(f"{type(self).__name__} does not support run().")
+
+    def _open_size(self) -> int:
+        return 0
+
+    def _peek_open(self) -> SearchNode:
+        return None
+
+    def _terminate(self, termination: Termination) -> None:
+        self._termination = termination
+        self._history['nodes_expanded'] = self._nodes_expanded
+        if self._started is not None:
+            self._elapsed = time.perf_counter() - self._started
+        if self._metrics is not None:
+            self._metrics.elapsed += self._elapsed
+
+    def _should_stop(self) -> bool:
+        """Checked before every expansion; True once the search has
+        terminated or one of its limits has been hit."""
+        if self._termination is not None:
+            return True
+        if self._started is None:
+            self._started = time.perf_counter()
+        limits = self._limits
+        if limits is None:
+            return False
+        if limits.max_expansions is not None and \
+                self._nodes_expanded >= limits.max_expansions:
+            self._terminate(Termination.EXPANSION_LIMIT)
+        elif limits.max_open is not None and \
+                self._open_size() > limits.max_open:
+            self._terminate(Termination.OPEN_LIMIT)
+        elif limits.max_open_bytes is not None and \
+                self._open_size() * self._estimate_node_bytes() > limits.max_open_bytes:
+            self._terminate(Termination.OPEN_LIMIT)
+        elif limits.max_time is not None and \
+                time.perf_counter() - self._started >= limits.max_time:
+            self._terminate(Termination.TIME_LIMIT)
+        if self._termination is not None and self._verbose:
+            print(f"Search stopped: {self._termination.name} "
+                  f"after {self._nodes_expanded} expansions.")
+        return self._termination is not None
+
+    def _estimate_node_bytes(self) -> int:
+        if self._node_bytes is None:
+            node = self._peek_open()
+            if node is None:
+                return 0
+            self._node_bytes = sys.getsizeof(node) + sys.getsizeof(node.state)
+        return self._node_bytes
+
+    def _is_goal(self, node: SearchNode) -> bool:
+        return node.state == self._goal
+
+    def _on_goal(self, node: SearchNode) -> bool:
+        """Called when a node passing _is_goal() is selected for expansion.
+
+        Records the path to the node and reports whether the search is done.
+        Searches over several goals override this to keep going.
+
+        Returns:
+            bool: True if the search should terminate.
+        """
+        self._success = True
+        self._path = self._trace_path(node)
+        self._history['path'] = self._path
+        self._terminate(Termination.SUCCESS)
+        if self._verbose:
+            print("---------------------------------------------")
+            print("Search terminated successfully")
+            print(f"Path of length {len(self._path)} from {self._start} "
+                  f"to {self._path[-1]} found.")
+            print(f"Nodes Expanded: {self._nodes_expanded}")
+            print(f"Path: {self._path}")
+            print("---------------------------------------------\n\n")
+        return True
+
+    def _trace_path(self, node: SearchNode) -> List[State]:
+        # re-create path by following parents from goal to start
+        # start has None as parent, so walk back until that None parent is hit
+        path = [node.state]
+        while node.parent is not None:
+            node = node.parent
+            path.append(node.state)
+        path.reverse()
+        return self._env.concrete_path(path)
+
     def _get_random(self) -> State:
         return self._env.get_random(valid=True)
 
@@ -119,3 +357,10 @@ class Search(ABC):
     def _get_random_goal(self) -> State:
         return self._get_random_diff(self._start) \
             if self._start is not None else self._get_random()
+
+
+def _run_search(search: Search) -> tuple:
+    # runs in run_async()'s executor, returns what the caller's copy lacks
+    path = search.get_path()
+    return (path, search._success, search._termination, search._nodes_expanded,
+            search._elapsed, search._history)
@@ -40,10 +40,11 @@ class SearchNode:
     def __lt__(self, other):
         if self.fcost < other.fcost:
             return True
-        elif math.isclose(self.fcost, other.fcost):
-            if self.gcost > other.gcost:
-                return True
-        return False
+        if self.fcost == other.fcost:
+            return self.gcost > other.gcost
+        # float costs only: treat f-costs within rounding error as ties
+        return isinstance(self.fcost, float) and \
+            math.isclose(self.fcost, other.fcost) and self.gcost > other.gcost
 
     def __repr__(self):
         if self is None:
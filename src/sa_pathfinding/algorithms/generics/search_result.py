@@ -0,0 +1,48 @@
+from typing import NamedTuple
+from typing import Optional
+from typing import List
+from enum import Enum
+
+from sa_pathfinding.environments.generics.state import State
+
+
+class Termination(Enum):
+    """Why a search stopped."""
+    SUCCESS = 0
+    EXHAUSTED = 1
+    EXPANSION_LIMIT = 2
+    OPEN_LIMIT = 3
+    TIME_LIMIT = 4
+    UNREACHABLE = 5
+
+
+class SearchLimits(NamedTuple):
+    """Budgets a search stops at, None meaning unlimited.
+
+    max_open_bytes is estimated from the size of the first node on open
+    and its state, so it is a rough guide rather than an exact measure.
+    max_time is in seconds of wall-clock time since the first expansion.
+    """
+    max_expansions: Optional[int] = None
+    max_open: Optional[int] = None
+    max_open_bytes: Optional[int] = None
+    max_time: Optional[float] = None
+
+
+class SearchResult(NamedTuple):
+    """Structured outcome of a search.
+
+    partial_path leads from the start to the expanded state with the lowest
+    heuristic value, which is the best guess at progress towards the goal
+    when the search stopped early. It is empty for searches without a
+    heuristic.
+    """
+    termination: Optional[Termination]
+    path: List[State]
+    partial_path: List[State]
+    nodes_expanded: int
+    elapsed: float
+
+    @property
+    def success(self) -> bool:
+        return self.termination == Termination.SUCCESS
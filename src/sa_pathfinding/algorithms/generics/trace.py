@@ -0,0 +1,239 @@
+from collections import deque
+from abc import abstractmethod
+from typing import NamedTuple
+from typing import Tuple
+from typing import Dict
+from typing import List
+from abc import ABC
+import struct
+import json
+
+from sa_pathfinding.environments.generics.state import State
+
+"""trace Module
+
+This module contains the sinks a search can record its expansions to.
+Searches record nothing unless given a sink.
+
+Every state is given a compact integer id the first time a sink sees it,
+and expansions are recorded as ids. File sinks write the repr of each
+state once, when its id is assigned, so traces can be decoded later.
+
+Example:
+    Stream the expansions of a search to a binary trace file::
+
+        with BinaryTrace('search.trace') as trace:
+            GridOptimizedAstar(env, OctileGridHeuristic(), trace=trace).get_path()
+        reprs, events = read_binary_trace('search.trace')
+"""
+
+
+class TraceEvent(NamedTuple):
+    """One expansion: the step number, the expanded state's id and the ids
+    of the states it added to open."""
+    step: int
+    expanded: int
+    generated: Tuple[int, ...]
+
+
+class TraceSink(ABC):
+    """ An abstract class for trace sinks.
+
+    Subclasses implement _write() and, to keep a record of what the ids
+    stand for, _define(). States must be hashable.
+
+    Attributes:
+        states (:obj:'list' of :obj:'State'): States indexed by id.
+    """
+
+    def __init__(self) -> None:
+        self._ids: Dict[State, int] = {}
+        self._states: List[State] = []
+
+    def __enter__(self) -> 'TraceSink':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def states(self) -> List[State]:
+        return self._states
+
+    def state_id(self, state: State) -> int:
+        state_id = self._ids.get(state)
+        if state_id is None:
+            state_id = len(self._states)
+            self._ids[state] = state_id
+            self._states.append(state)
+            self._define(state_id, state)
+        return state_id
+
+    def record(self, step: int, expanded: State, generated: List[State]) -> None:
+        """Called by a search after every expansion."""
+        self._write(TraceEvent(step, self.state_id(expanded),
+                               tuple(self.state_id(state) for state in generated)))
+
+    def close(self) -> None:
+        pass
+
+    def _define(self, state_id: int, state: State) -> None:
+        pass
+
+    @abstractmethod
+    def _write(self, event: TraceEvent) -> None:
+        pass
+
+
+class RingBufferTrace(TraceSink):
+    """ Keeps the last 'capacity' expansions in memory.
+
+    Only the states of the kept expansions are remembered, so memory is
+    bounded by the capacity however long the search runs. A state seen
+    again after all of its expansions were dropped gets a new id.
+
+    Attributes:
+        events (:obj:'list' of :obj:'TraceEvent'): Recorded expansions,
+            oldest first.
+        states (:obj:'dict'): Id to state, of the states in events.
+    """
+
+    def __init__(self, capacity: int = 4096) -> None:
+        super().__init__()
+        self._events = deque(maxlen=capacity)
+        self._states: Dict[int, State] = {}
+        # id -> number of kept events that name it
+        self._refs: Dict[int, int] = {}
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    @property
+    def events(self) -> List[TraceEvent]:
+        return list(self._events)
+
+    @property
+    def states(self) -> Dict[int, State]:
+        return self._states
+
+    def state_id(self, state: State) -> int:
+        state_id = self._ids.get(state)
+        if state_id is None:
+            state_id = self._next_id
+            self._next_id += 1
+            self._ids[state] = state_id
+            self._states[state_id] = state
+            self._refs[state_id] = 0
+        return state_id
+
+    def _write(self, event: TraceEvent) -> None:
+        events = self._events
+        dropped = None
+        if len(events) == events.maxlen:
+            dropped = events[0] if events else event
+        # count the new event first, it may name states only the dropped
+        # one still holds
+        refs = self._refs
+        for state_id in (event.expanded,) + event.generated:
+            refs[state_id] += 1
+        events.append(event)
+        if dropped is not None:
+            for state_id in (dropped.expanded,) + dropped.generated:
+                refs[state_id] -= 1
+                if refs[state_id] == 0:
+                    del refs[state_id]
+                    del self._ids[self._states.pop(state_id)]
+
+
+class JsonlTrace(TraceSink):
+    """ Streams a trace to a JSON lines file.
+
+    Each line is either a state definition, {"state": id, "repr": "..."},
+    or an expansion, {"step": n, "expanded": id, "generated": [ids]}.
+    """
+
+    def __init__(self, filename: str) -> None:
+        super().__init__()
+        self._file = open(filename, 'w')
+
+    def close(self) -> None:
+        self._file.close()
+
+    def _define(self, state_id: int, state: State) -> None:
+        self._file.write(json.dumps({'state': state_id, 'repr': repr(state)}) + '\n')
+
+    def _write(self, event: TraceEvent) -> None:
+        self._file.write(json.dumps({'step': event.step,
+                                     'expanded': event.expanded,
+                                     'generated': event.generated}) + '\n')
+
+
+# binary trace layout: a header, then tagged little-endian records
+_MAGIC = b'SATR\x01'
+_DEFINE = b'S'    # id (uint32), repr length (uint16), utf-8 repr
+_EXPAND = b'E'    # step (uint32), id (uint32), count (uint16), count x id (uint32)
+_DEFINE_HEAD = struct.Struct('<IH')
+_EXPAND_HEAD = struct.Struct('<IIH')
+
+
+class BinaryTrace(TraceSink):
+    """ Streams a trace to a compact binary file, see read_binary_trace()."""
+
+    def __init__(self, filename: str) -> None:
+        super().__init__()
+        self._file = open(filename, 'wb')
+        self._file.write(_MAGIC)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def _define(self, state_id: int, state: State) -> None:
+        text = repr(state).encode('utf-8')[:0xffff]
+        self._file.write(_DEFINE + _DEFINE_HEAD.pack(state_id, len(text)) + text)
+
+    def _write(self, event: TraceEvent) -> None:
+        self._file.write(_EXPAND + _EXPAND_HEAD.pack(event.step, event.expanded,
+                                                     len(event.generated)) +
+                         struct.pack(f'<{len(event.generated)}I', *event.generated))
+
+
+def read_jsonl_trace(filename: str) -> Tuple[Dict[int, str], List[TraceEvent]]:
+    """Reads a JsonlTrace file into (id to repr, expansions)."""
+    reprs, events = {}, []
+    with open(filename, 'r') as file:
+        for line in file:
+            record = json.loads(line)
+            if 'state' in record:
+                reprs[record['state']] = record['repr']
+            else:
+                events.append(TraceEvent(record['step'], record['expanded'],
+                                         tuple(record['generated'])))
+    return reprs, events
+
+
+def read_binary_trace(filename: str) -> Tuple[Dict[int, str], List[TraceEvent]]:
+    """Reads a BinaryTrace file into (id to repr, expansions)."""
+    with open(filename, 'rb') as file:
+        data = file.read()
+    if not data.startswith(_MAGIC):
+        raise ValueError(f'{filename} is not a binary trace.')
+    reprs, events = {}, []
+    offset = len(_MAGIC)
+    while offset < len(data):
+        tag = data[offset:offset + 1]
+        offset += 1
+        if tag == _DEFINE:
+            state_id, length = _DEFINE_HEAD.unpack_from(data, offset)
+            offset += _DEFINE_HEAD.size
+            reprs[state_id] = data[offset:offset + length].decode('utf-8')
+            offset += length
+        elif tag == _EXPAND:
+            step, expanded, count = _EXPAND_HEAD.unpack_from(data, offset)
+            offset += _EXPAND_HEAD.size
+            generated = struct.unpack_from(f'<{count}I', data, offset)
+            offset += 4 * count
+            events.append(TraceEvent(step, expanded, generated))
+        else:
+            raise ValueError(f'Unknown record {tag!r} at byte {offset - 1} of {filename}.')
+    return reprs, events
@@ -0,0 +1,192 @@
+from typing import NamedTuple
+from typing import Tuple
+from typing import Dict
+from typing import List
+import statistics
+import math
+
+from sa_pathfinding.benchmarks.runner import BenchmarkReport
+from sa_pathfinding.benchmarks.runner import QueryRecord
+
+"""compare Module
+
+This module compares the query times of a benchmark report against a
+baseline report and flags statistically significant regressions.
+
+When both reports ran the same scenarios, which the seeded scenario
+files make the normal case, every query is paired with itself and a
+paired t-test is done on the log of the time ratios. That removes the
+spread between easy and hard queries, which otherwise swamps any change.
+Otherwise Welch's t-test is done on the times of the two reports.
+
+Example:
+    Fail a build that got slower than the stored baseline::
+
+        comparisons = compare_reports(BenchmarkReport.from_json('baseline.json'),
+                                      report)
+        if any(comparison.regression for comparison in comparisons):
+            sys.exit(1)
+"""
+
+
+class Comparison(NamedTuple):
+    """Timing change of one algorithm on one map, '*' for all maps.
+
+    ratio is the current over the baseline time: the geometric mean of
+    the per query ratios when paired, the ratio of mean times otherwise.
+    """
+    map: str
+    algorithm: str
+    baseline_time: float
+    current_time: float
+    ratio: float
+    p_value: float
+    paired: bool
+    expansions_changed: bool
+    regression: bool
+    improvement: bool
+
+
+def _betacf(a: float, b: float, x: float) -> float:
+    # continued fraction of the incomplete beta function (modified Lentz)
+    tiny = 1e-300
+    c, d = 1.0, 1.0 - (a + b) * x / (a + 1)
+    d = 1 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, 300):
+        for numerator in (m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+                          -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))):
+            d = 1 + numerator * d
+            d = 1 / (d if abs(d) > tiny else tiny)
+            c = 1 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            h *= d * c
+        if abs(d * c - 1) < 3e-15:
+            break
+    return h
+
+
+def _betai(a: float, b: float, x: float) -> float:
+    # regularized incomplete beta function I_x(a, b)
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) +
+                     a * math.log(x) + b * math.log(1 - x))
+    if x < (a + 1) / (a + b + 2):
+        return front * _betacf(a, b, x) / a
+    return 1 - front * _betacf(b, a, 1 - x) / b
+
+
+def t_test_p_value(t: float, df: float) -> float:
+    """Two-sided p-value of Student's t statistic with df degrees of freedom."""
+    if math.isnan(t) or df <= 0:
+        return math.nan
+    if math.isinf(t):
+        return 0.0
+    return _betai(df / 2, 0.5, df / (df + t * t))
+
+
+def welch_t_test(a: List[float], b: List[float]) -> Tuple[float, float]:
+    """Welch's t-test of two independent samples, (t, two-sided p-value)."""
+    if len(a) < 2 or len(b) < 2:
+        return math.nan, math.nan
+    va, vb = statistics.variance(a) / len(a), statistics.variance(b) / len(b)
+    difference = statistics.mean(b) - statistics.mean(a)
+    if va + vb == 0:
+        return (0.0, 1.0) if difference == 0 else (math.copysign(math.inf, difference), 0.0)
+    t = difference / math.sqrt(va + vb)
+    df = (va + vb) ** 2 / (va ** 2 / (len(a) - 1) + vb ** 2 / (len(b) - 1))
+    return t, t_test_p_value(t, df)
+
+
+def paired_t_test(differences: List[float]) -> Tuple[float, float]:
+    """t-test of paired differences against a zero mean, (t, two-sided p-value)."""
+    if len(differences) < 2:
+        return math.nan, math.nan
+    mean = statistics.mean(differences)
+    error = statistics.stdev(differences) / math.sqrt(len(differences))
+    if error == 0:
+        return (0.0, 1.0) if mean == 0 else (math.copysign(math.inf, mean), 0.0)
+    t = mean / error
+    return t, t_test_p_value(t, len(differences) - 1)
+
+
+def _median_times(records: List[QueryRecord]) -> Dict[int, float]:
+    # repetitions of a query are reduced to their median time
+    times: Dict[int, List[float]] = {}
+    for record in records:
+        times.setdefault(record.index, []).append(record.time)
+    return {index: statistics.median(values) for index, values in times.items()}
+
+
+def _queries(records: List[QueryRecord]) -> Dict[int, Tuple[int, float]]:
+    return {record.index: (record.bucket, record.optimal) for record in records}
+
+
+def _expansions(records: List[QueryRecord]) -> Dict[int, int]:
+    return {record.index: record.expansions for record in records}
+
+
+def _compare(map_name: str,
+             algorithm: str,
+             baseline: List[QueryRecord],
+             current: List[QueryRecord],
+             alpha: float,
+             threshold: float) -> Comparison:
+    before, after = _median_times(baseline), _median_times(current)
+    # queries pair up when both reports ran the same scenarios
+    paired = _queries(baseline) == _queries(current)
+    if paired and all(before[i] > 0 and after[i] > 0 for i in before):
+        differences = [math.log(after[i] / before[i]) for i in before]
+        _, p_value = paired_t_test(differences)
+        ratio = math.exp(statistics.mean(differences))
+    else:
+        paired = False
+        _, p_value = welch_t_test([record.time for record in baseline],
+                                  [record.time for record in current])
+        ratio = statistics.mean(r.time for r in current) / statistics.mean(r.time for r in baseline)
+    significant = not math.isnan(p_value) and p_value < alpha
+    return Comparison(map_name, algorithm,
+                      statistics.mean(before.values()), statistics.mean(after.values()),
+                      ratio, p_value, paired,
+                      _expansions(baseline) != _expansions(current),
+                      significant and ratio > 1 + threshold,
+                      significant and ratio < 1 - threshold)
+
+
+def compare_reports(baseline: BenchmarkReport,
+                    current: BenchmarkReport,
+                    alpha: float = 0.01,
+                    threshold: float = 0.05) -> List[Comparison]:
+    """Compares every (map, algorithm) the two reports have in common.
+
+    Args:
+        baseline (:obj:'BenchmarkReport'): Report to compare against.
+        current (:obj:'BenchmarkReport'): New report.
+        alpha (:obj:'float'): Significance level.
+        threshold (:obj:'float'): Smallest relative change in time that
+            counts, e.g. 0.05 for 5%, so that significant but negligible
+            changes are not flagged.
+
+    Returns:
+        List[Comparison], one per map and algorithm, then one per
+            algorithm over all maps (map '*').
+    """
+    def group(report: BenchmarkReport) -> Dict[Tuple[str, str], List[QueryRecord]]:
+        groups: Dict[Tuple[str, str], List[QueryRecord]] = {}
+        for record in report.records:
+            groups.setdefault((record.map, record.algorithm), []).append(record)
+        return groups
+
+    before, after = group(baseline), group(current)
+    common = [key for key in after if key in before]
+    comparisons = [_compare(*key, before[key], after[key], alpha, threshold) for key in common]
+    for algorithm in dict.fromkeys(algorithm for _, algorithm in common):
+        keys = [key for key in common if key[1] == algorithm]
+        # over all maps queries are told apart by map as well as index
+        merged = [[record._replace(index=(key[0], record.index)) for key in keys
+                   for record in groups[key]] for groups in (before, after)]
+        comparisons.append(_compare('*', algorithm, *merged, alpha, threshold))
+    return comparisons
@@ -0,0 +1,280 @@
+from typing import NamedTuple
+from typing import Callable
+from typing import Optional
+from typing import Dict
+from typing import List
+import glob
+import json
+import math
+import time
+import csv
+import os
+
+from sa_pathfinding.benchmarks.scenario import generate_scenarios
+from sa_pathfinding.benchmarks.scenario import scenario_filename
+from sa_pathfinding.benchmarks.scenario import write_scenarios
+from sa_pathfinding.benchmarks.scenario import read_scenarios
+from sa_pathfinding.environments.grids.octile_grid import OctileGrid
+from sa_pathfinding.benchmarks.scenario import Scenario
+
+"""runner Module
+
+This module runs search algorithms over the scenarios of whole map sets
+and summarises time, expansions and suboptimality as percentiles.
+
+Scenarios are read from 'name.map.scen' files in a scenario directory,
+and generated with a fixed seed (and written there for next time) when a
+map does not have enough of them yet, so every run of a benchmark uses
+the same queries.
+
+Example:
+    Compare two A* variants on the small maps::
+
+        algorithms = [Algorithm('astar', GenericAstar, {'heuristic': OctileGridHeuristic()}),
+                      Algorithm('grid-astar', GridOptimizedAstar,
+                                {'heuristic': OctileGridHeuristic()})]
+        report = run_benchmark(find_maps('data/maps/small'), algorithms,
+                               count=50, scenario_dir='data/scenarios')
+        report.to_json('bench.json')
+        report.to_csv('bench.csv')
+"""
+
+PERCENTILES = (50, 90, 99)
+
+
+class Algorithm(NamedTuple):
+    """A named search configuration: search_cls(env, start=, goal=, **kwargs)."""
+    name: str
+    search_cls: type
+    kwargs: Optional[dict] = None
+
+
+class QueryRecord(NamedTuple):
+    """The outcome of one algorithm on one scenario."""
+    map: str
+    algorithm: str
+    index: int
+    bucket: int
+    optimal: float
+    length: float
+    time: float
+    expansions: int
+    success: bool
+    repetition: int = 0
+
+    @property
+    def suboptimality(self) -> float:
+        """Path length over optimal length, 1.0 when optimal."""
+        if not self.success:
+            return math.inf
+        return self.length / self.optimal if self.optimal > 0 else 1.0
+
+
+def percentile(values: List[float], q: float) -> float:
+    """The q-th percentile of values, interpolating linearly between ranks."""
+    if len(values) == 0:
+        return math.nan
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low = math.floor(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def _finite(value):
+    # JSON has no infinity or NaN, they are written as null
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def _describe(prefix: str, values: List[float]) -> Dict[str, float]:
+    summary = {f'{prefix}_p{q}': percentile(values, q) for q in PERCENTILES}
+    summary[f'{prefix}_mean'] = sum(values) / len(values) if values else math.nan
+    summary[f'{prefix}_max'] = max(values) if values else math.nan
+    return summary
+
+
+class BenchmarkReport:
+    """ The records of a benchmark run, with summaries per map and algorithm.
+
+    Attributes:
+        records (:obj:'list' of :obj:'QueryRecord'): One per algorithm and
+            scenario, in the order they were run.
+    """
+
+    def __init__(self, records: List[QueryRecord] = None) -> None:
+        self._records: List[QueryRecord] = [] if records is None else list(records)
+
+    @property
+    def records(self) -> List[QueryRecord]:
+        return self._records
+
+    def add(self, record: QueryRecord) -> None:
+        self._records.append(record)
+
+    def summary(self, by_map: bool = True) -> List[Dict[str, float]]:
+        """One row per (map, algorithm), or per algorithm over all maps.
+
+        Each row has the query and solved counts, and percentiles, mean
+        and maximum of time (seconds), expansions and suboptimality. The
+        suboptimality figures only cover solved queries.
+        """
+        groups: Dict[tuple, List[QueryRecord]] = {}
+        for record in self._records:
+            key = (record.map if by_map else '*', record.algorithm)
+            groups.setdefault(key, []).append(record)
+        rows = []
+        for (map_name, algorithm), records in groups.items():
+            solved = [record for record in records if record.success]
+            row = {'map': map_name,
+                   'algorithm': algorithm,
+                   'queries': len(records),
+                   'solved': len(solved),
+                   'time_total': sum(record.time for record in records)}
+            row.update(_describe('time', [record.time for record in records]))
+            row.update(_describe('expansions', [record.expansions for record in records]))
+            row.update(_describe('suboptimality', [record.suboptimality for record in solved]))
+            rows.append(row)
+        return rows
+
+    def to_dict(self) -> dict:
+        """Records and both summaries, with infinities and NaNs as None."""
+        def clean(rows):
+            return [{key: _finite(value) for key, value in row.items()} for row in rows]
+        return {'records': clean(record._asdict() for record in self._records),
+                'summary': clean(self.summary()),
+                'overall': clean(self.summary(by_map=False))}
+
+    def to_json(self, filename: str) -> None:
+        """Writes records and both summaries as JSON."""
+        with open(filename, 'w') as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+    @classmethod
+    def from_json(cls, filename: str) -> 'BenchmarkReport':
+        """Reads the records of a report written by to_json()."""
+        with open(filename, 'r') as file:
+            data = json.load(file)
+        return cls(QueryRecord(**dict(record, length=math.inf if record['length'] is None
+                                      else record['length']))
+                   for record in data['records'])
+
+    def to_csv(self, filename: str, records: bool = False) -> None:
+        """Writes the per map summary as CSV, or every record."""
+        rows = [record._asdict() for record in self._records] if records \
+            else self.summary() + self.summary(by_map=False)
+        with open(filename, 'w', newline='') as file:
+            fieldnames = list(QueryRecord._fields) if records else \
+                list(rows[0].keys()) if rows else ['map', 'algorithm']
+            writer = csv.DictWriter(file, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+def find_maps(directory: str, pattern: str = '*.map') -> List[str]:
+    """Map files under directory, searched recursively, sorted by path."""
+    return sorted(glob.glob(os.path.join(directory, '**', pattern), recursive=True))
+
+
+def load_scenarios(map_filename: str,
+                   count: int,
+                   seed: int = 0,
+                   scenario_dir: str = None,
+                   env: OctileGrid = None) -> List[Scenario]:
+    """count scenarios of a map.
+
+    Read from scenario_dir when its file has enough of them, otherwise
+    generated with seed and, if scenario_dir is given, written there.
+    Files are ordered by bucket, so a larger file is sampled at even
+    intervals to keep the mix of short and long queries.
+    """
+    filename = scenario_filename(map_filename, scenario_dir) if scenario_dir else None
+    if filename is not None and os.path.exists(filename):
+        scenarios = read_scenarios(filename)
+        if len(scenarios) >= count:
+            return [scenarios[i * len(scenarios) // count] for i in range(count)]
+    scenarios = generate_scenarios(map_filename, count, seed=seed, env=env)
+    if filename is not None:
+        os.makedirs(scenario_dir, exist_ok=True)
+        write_scenarios(filename, scenarios)
+    return scenarios
+
+
+def run_scenarios(env: OctileGrid,
+                  scenarios: List[Scenario],
+                  algorithm: Algorithm,
+                  map_name: str = None,
+                  repeat: int = 1,
+                  warmup: int = 0) -> List[QueryRecord]:
+    """Runs one algorithm over scenarios of a loaded map.
+
+    Time covers constructing the search and running it to the end.
+
+    Args:
+        repeat (:obj:'int'): Times every scenario is run, each run is
+            recorded with its repetition number.
+        warmup (:obj:'int'): Scenarios run, untimed, before the first
+            repetition, to warm caches and the interpreter up.
+    """
+    kwargs = algorithm.kwargs or {}
+    for scenario in scenarios[:warmup]:
+        algorithm.search_cls(env, start=scenario.start, goal=scenario.goal, **kwargs).get_path()
+    records = []
+    for repetition in range(repeat):
+        for index, scenario in enumerate(scenarios):
+            t1 = time.perf_counter()
+            search = algorithm.search_cls(env, start=scenario.start, goal=scenario.goal, **kwargs)
+            path = search.get_path()
+            elapsed = time.perf_counter() - t1
+            success = len(path) > 0
+            records.append(QueryRecord(map_name or scenario.map, algorithm.name, index,
+                                       scenario.bucket, scenario.optimal,
+                                       env.get_path_cost(path) if success else math.inf,
+                                       elapsed, search.nodes_expanded, success, repetition))
+    return records
+
+
+def run_benchmark(maps: List[str],
+                  algorithms: List[Algorithm],
+                  count: int = 100,
+                  seed: int = 0,
+                  scenario_dir: str = None,
+                  grid_cls: type = OctileGrid,
+                  repeat: int = 1,
+                  warmup: int = 0,
+                  progress: Callable[[str, str], None] = None) -> BenchmarkReport:
+    """Runs every algorithm over count scenarios of every map.
+
+    Each map is loaded once, with grid_cls, and its scenarios are shared
+    by all algorithms.
+
+    Args:
+        maps (:obj:'list' of :obj:'str'): Map files, see find_maps().
+        algorithms (:obj:'list' of :obj:'Algorithm'): What to run.
+        count (:obj:'int'): Scenarios per map.
+        seed (:obj:'int'): Seed for maps that need scenarios generated.
+        scenario_dir (:obj:'str', optional): Where scenario files are
+            read from and written to. Generated scenarios are not kept
+            without one.
+        grid_cls (:obj:'type'): Grid class maps are loaded with.
+        repeat (:obj:'int'): Runs of every scenario, see run_scenarios().
+        warmup (:obj:'int'): Untimed scenarios run first, per algorithm
+            and map.
+        progress (:obj:'callable', optional): Called with the map and
+            algorithm name before each run.
+    """
+    report = BenchmarkReport()
+    for map_filename in maps:
+        env = grid_cls(map_filename)
+        name = os.path.basename(map_filename)
+        scenarios = load_scenarios(map_filename, count, seed=seed,
+                                   scenario_dir=scenario_dir,
+                                   env=env if grid_cls is OctileGrid else None)
+        for algorithm in algorithms:
+            if progress is not None:
+                progress(name, algorithm.name)
+            for record in run_scenarios(env, scenarios, algorithm, map_name=name,
+                                        repeat=repeat, warmup=warmup):
+                report.add(record)
+    return report
@@ -0,0 +1,157 @@
+from typing import NamedTuple
+from typing import Tuple
+from typing import List
+import random
+import math
+import os
+
+from sa_pathfinding.algorithms.astar.grid_optimized_astar import GridOptimizedAstar
+from sa_pathfinding.heuristics.grid_heuristic import OctileGridHeuristic
+from sa_pathfinding.environments.grids.generics.grid import GridState
+from sa_pathfinding.environments.grids.octile_grid import OctileGrid
+
+"""scenario Module
+
+This module reads, writes and generates MovingAI scenario (.scen) files.
+
+A scenario file starts with a 'version 1' line, followed by one query per
+line: bucket, map file, map width and height, start x and y, goal x and y
+and the optimal path length, separated by tabs. Lengths are octile
+distances with sqrt(2) diagonals and no corner cutting, which is what
+OctileGrid searches with its default costs.
+
+Example:
+    Generate a seeded scenario set for a map and read it back::
+
+        scenarios = generate_scenarios('data/maps/small/den403d.map', 100, seed=7)
+        write_scenarios('den403d.map.scen', scenarios)
+        assert read_scenarios('den403d.map.scen') == scenarios
+"""
+
+_VERSION = 'version 1'
+
+# queries are grouped in buckets of this many units of optimal length
+BUCKET_SIZE = 4
+
+
+class Scenario(NamedTuple):
+    """One query of a scenario file."""
+    bucket: int
+    map: str
+    width: int
+    height: int
+    start_x: int
+    start_y: int
+    goal_x: int
+    goal_y: int
+    optimal: float
+
+    @property
+    def start(self) -> GridState:
+        return GridState(self.start_x, self.start_y, valid=True)
+
+    @property
+    def goal(self) -> GridState:
+        return GridState(self.goal_x, self.goal_y, valid=True)
+
+
+def read_scenarios(filename: str) -> List[Scenario]:
+    """Reads a .scen file.
+
+    Raises:
+        ValueError: if the file is not a version 1 scenario file or a line
+            does not have nine fields.
+    """
+    scenarios = []
+    with open(filename, 'r') as file:
+        header = file.readline().strip()
+        if header.lower() != _VERSION:
+            raise ValueError(f"{filename} is not a '{_VERSION}' scenario file.")
+        for number, line in enumerate(file, 2):
+            if not line.strip():
+                continue
+            fields = line.rstrip('\n').split('\t')
+            if len(fields) != 9:
+                raise ValueError(f"{filename}:{number} has {len(fields)} fields, expected 9.")
+            scenarios.append(Scenario(int(fields[0]), fields[1],
+                                      *(int(field) for field in fields[2:8]),
+                                      float(fields[8])))
+    return scenarios
+
+
+def write_scenarios(filename: str, scenarios: List[Scenario]) -> None:
+    """Writes scenarios to a .scen file."""
+    with open(filename, 'w') as file:
+        file.write(_VERSION + '\n')
+        for s in scenarios:
+            file.write(f"{s.bucket}\t{s.map}\t{s.width}\t{s.height}\t"
+                       f"{s.start_x}\t{s.start_y}\t{s.goal_x}\t{s.goal_y}\t"
+                       f"{s.optimal:.8f}\n")
+
+
+def scenario_filename(map_filename: str, directory: str = None) -> str:
+    """The conventional scenario file name of a map, 'name.map.scen',
+    next to the map or in directory."""
+    name = os.path.basename(map_filename) + '.scen'
+    return os.path.join(directory or os.path.dirname(map_filename), name)
+
+
+def generate_scenarios(map_filename: str,
+                       count: int,
+                       seed: int = 0,
+                       env: OctileGrid = None) -> List[Scenario]:
+    """Generates a reproducible set of reachable queries for a map.
+
+    Starts and goals are drawn from a random.Random(seed), so the same
+    map, count and seed always give the same scenarios. Pairs in different
+    connected components, and pairs with start equal to goal, are
+    redrawn. Optimal lengths come from a GridOptimizedAstar search with
+    the octile heuristic. Scenarios are returned ordered by bucket.
+
+    Args:
+        map_filename (:obj:'str'): Path to a MovingAI .map file.
+        count (:obj:'int'): Number of scenarios.
+        seed (:obj:'int'): Random seed.
+        env (:obj:'OctileGrid', optional): The map, if already loaded.
+
+    Raises:
+        ValueError: if the map has fewer than two passable cells in any
+            one connected component.
+    """
+    env = OctileGrid(map_filename) if env is None else env
+    rng = random.Random(seed)
+    cells = [(x, y) for y in range(env.height) for x in range(env.width)
+             if env.env[y][x].valid]
+    if not _has_reachable_pair(env, cells):
+        raise ValueError(f"{map_filename} has no two connected passable cells.")
+    name = os.path.basename(map_filename)
+    scenarios = []
+    while len(scenarios) < count:
+        start = GridState(*rng.choice(cells), valid=True)
+        goal = GridState(*rng.choice(cells), valid=True)
+        if start == goal or not env.is_reachable(start, goal):
+            continue
+        # rounded as written, so scenarios survive a write and read unchanged
+        optimal = round(optimal_length(env, start, goal), 8)
+        scenarios.append(Scenario(int(optimal // BUCKET_SIZE), name,
+                                  env.width, env.height,
+                                  start.x, start.y, goal.x, goal.y, optimal))
+    scenarios.sort(key=lambda scenario: scenario.bucket)
+    return scenarios
+
+
+def optimal_length(env: OctileGrid, start: GridState, goal: GridState) -> float:
+    """Octile length of the shortest path from start to goal, math.inf if
+    there is none."""
+    path = GridOptimizedAstar(env, OctileGridHeuristic(), start=start, goal=goal).run()
+    return env.get_path_cost(path) if len(path) > 0 else math.inf
+
+
+def _has_reachable_pair(env: OctileGrid, cells: List[Tuple[int, int]]) -> bool:
+    components = set()
+    for cell in cells:
+        component = env.component(GridState(*cell, valid=True))
+        if component in components:
+            return True
+        components.add(component)
+    return False
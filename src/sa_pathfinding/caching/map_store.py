@@ -0,0 +1,316 @@
+from collections import OrderedDict
+from typing import NamedTuple
+from typing import Callable
+from typing import Optional
+from typing import Tuple
+from typing import Dict
+from typing import List
+from typing import Any
+import threading
+import glob
+import sys
+import os
+
+from sa_pathfinding.environments.grids.octile_grid import OctileGrid
+from sa_pathfinding.preprocessing.compile import load_compiled
+from sa_pathfinding.environments.grids.generics.grid import Grid
+
+"""map_store Module
+
+This module contains an LRU store of loaded maps, and of structures
+derived from them, under a memory budget.
+
+Maps are loaded on first use, by file name or path, and evicted least
+recently used first when the budget is exceeded. A map whose file changed
+on disk since it was loaded is loaded again on its next use, and the
+structures derived from the old version are dropped with it.
+
+Example:
+    Serve many maps from a bounded amount of memory::
+
+        store = MapStore(['data/maps'], max_bytes=512 * 2**20)
+        env = store.get('den403d')
+        table = store.derived('den403d', 'table', lambda env: build_table(env))
+        print(store.stats.hit_rate, store.map_stats()['den403d.map'].nbytes)
+"""
+
+
+# attribute values of a GridState, which sys.getsizeof leaves out
+_CELL_VALUES = 40
+
+
+class StoreStats(NamedTuple):
+    hits: int
+    misses: int
+    reloads: int
+    evictions: int
+    maps: int
+    nbytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class MapStats(NamedTuple):
+    """Counters of one map. nbytes is 0 while the map is not resident."""
+    path: str
+    hits: int
+    misses: int
+    reloads: int
+    evictions: int
+    resident: bool
+    nbytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def grid_nbytes(env: Grid) -> int:
+    """Estimated memory of a grid, its cells and its component labels.
+
+    Every row is the same size, so one row is measured and multiplied
+    rather than every cell, which keeps the estimate cheap enough to redo
+    on every lookup.
+    """
+    if env.height == 0 or env.width == 0:
+        return sys.getsizeof(env)
+    row = env.env[0]
+    return sys.getsizeof(env) + sys.getsizeof(env.env) + \
+        env.height * (sys.getsizeof(row) + env.width * (sys.getsizeof(row[0]) + _CELL_VALUES)) + \
+        env.component_nbytes()
+
+
+class _Entry:
+
+    __slots__ = 'env stamp nbytes derived'.split()
+
+    def __init__(self, env: Grid, stamp: Tuple[int, int]) -> None:
+        self.env = env
+        self.stamp = stamp
+        self.nbytes = grid_nbytes(env)
+        # key -> (structure, estimated bytes)
+        self.derived: Dict[Any, Tuple[Any, int]] = {}
+
+    def total(self) -> int:
+        return self.nbytes + sum(nbytes for _, nbytes in self.derived.values())
+
+
+class MapStore:
+    """ An LRU store of loaded maps with a memory budget.
+
+    Maps are named by file name, with or without '.map', when they are
+    one of the store's map files or found in one of its directories, or
+    by path. Both resolve to the absolute path of the file, which is the
+    key of everything the store keeps for the map.
+
+    Memory is estimated with grid_nbytes() for the maps, re-estimated on
+    every lookup since component labels are built lazily, plus whatever
+    the derived structures were estimated at. The map just looked up is
+    never evicted, so a map larger than the whole budget is still served,
+    on its own.
+
+    Lookups are thread safe. A lookup that loads a map holds the store's
+    lock while loading, and, with components=True, while building the
+    map's component labels, so that no other thread can see a map before
+    its labels are complete.
+
+    Attributes:
+        max_bytes (:obj:'int'): Memory budget.
+        nbytes (:obj:'int'): Estimated memory of the resident maps and
+            their derived structures.
+        stats (:obj:'StoreStats'): Hit, miss, reload and eviction counters.
+    """
+
+    def __init__(self,
+                 paths: List[str] = None,
+                 max_bytes: int = 512 * 2**20,
+                 grid_cls: type = OctileGrid,
+                 check_mtime: bool = True,
+                 cache_dir: str = None,
+                 components: bool = False) -> None:
+        """MapStore __init__ method.
+
+        Args:
+            paths (:obj:'list' of :obj:'str', optional): Map files, and
+                directories searched recursively for *.map files, that can
+                then be named by file name.
+            max_bytes (:obj:'int'): Memory budget.
+            grid_cls (:obj:'type'): Grid class maps are loaded with.
+            check_mtime (:obj:'bool'): Stat the file on every lookup and
+                reload maps that changed on disk.
+            cache_dir (:obj:'str', optional): Directory of compiled map
+                artifacts, see preprocessing.compile. Maps are loaded from
+                their artifacts when they are up to date.
+            components (:obj:'bool'): Build the component labels of maps
+                as they are loaded rather than on their first use.
+        """
+        self._max_bytes = max_bytes
+        self._grid_cls = grid_cls
+        self._check_mtime = check_mtime
+        self._cache_dir = cache_dir
+        self._components = components
+        self._names: Dict[str, str] = {}
+        for path in paths or ():
+            filenames = sorted(glob.glob(os.path.join(path, '**', '*.map'), recursive=True)) \
+                if os.path.isdir(path) else [path]
+            for filename in filenames:
+                self._names.setdefault(os.path.basename(filename), os.path.abspath(filename))
+        self._entries: 'OrderedDict[str, _Entry]' = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.RLock()
+        # path -> [hits, misses, reloads, evictions]
+        self._counters: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, name: str) -> bool:
+        path = self.resolve(name)
+        return path is not None and path in self._entries
+
+    @property
+    def names(self) -> Dict[str, str]:
+        """File name to path of every map given or found in the directories."""
+        return self._names
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    @property
+    def stats(self) -> StoreStats:
+        with self._lock:
+            totals = [sum(counters[i] for counters in self._counters.values()) for i in range(4)]
+            return StoreStats(*totals, len(self._entries), self._nbytes)
+
+    def map_stats(self) -> Dict[str, MapStats]:
+        """Counters per map that was ever looked up, by file name."""
+        with self._lock:
+            return {os.path.basename(path): self._map_stats(path) for path in self._counters}
+
+    def stats_for(self, name: str) -> MapStats:
+        """Counters of one map, zero if it was never looked up."""
+        path = self.resolve(name)
+        if path is None:
+            raise KeyError(name)
+        with self._lock:
+            return self._map_stats(path)
+
+    def resolve(self, name: str) -> Optional[str]:
+        """The path of a map name, None if there is no such map."""
+        path = self._names.get(name) or self._names.get(name + '.map')
+        if path is None and os.path.isfile(name):
+            path = os.path.abspath(name)
+        return path
+
+    def get(self, name: str) -> Grid:
+        """Returns a map, loading it if it is not resident or changed.
+
+        Raises:
+            KeyError: if name is neither a known map nor a map file.
+        """
+        path = self.resolve(name)
+        if path is None:
+            raise KeyError(name)
+        with self._lock:
+            return self._lookup(path).env
+
+    def derived(self,
+                name: str,
+                key: Any,
+                build: Callable[[Grid], Any],
+                nbytes: Callable[[Any], int] = sys.getsizeof) -> Any:
+        """Returns a structure derived from a map, building it on first use.
+
+        The structure is kept with the map, counts towards the budget and
+        is dropped when the map is evicted or reloaded.
+
+        Args:
+            name (:obj:'str'): Map name or path.
+            key: Identifies the structure among those of the map.
+            build (:obj:'callable'): Builds the structure from the map.
+            nbytes (:obj:'callable'): Estimates the memory of the structure.
+        """
+        path = self.resolve(name)
+        if path is None:
+            raise KeyError(name)
+        with self._lock:
+            entry = self._lookup(path)
+            if key not in entry.derived:
+                value = build(entry.env)
+                size = nbytes(value)
+                entry.derived[key] = (value, size)
+                self._nbytes += size
+                self._evict(keep=path)
+            return entry.derived[key][0]
+
+    def evict(self, name: str) -> bool:
+        """Drops a map and its derived structures, True if it was resident."""
+        path = self.resolve(name)
+        with self._lock:
+            if path is None or path not in self._entries:
+                return False
+            self._remove(path)
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            for path in list(self._entries):
+                self._remove(path)
+
+    def _map_stats(self, path: str) -> MapStats:
+        entry = self._entries.get(path)
+        return MapStats(path, *self._counters.get(path, (0, 0, 0, 0)), entry is not None,
+                        0 if entry is None else entry.total())
+
+    def _lookup(self, path: str) -> _Entry:
+        counters = self._counters.setdefault(path, [0, 0, 0, 0])
+        entry = self._entries.get(path)
+        stamp = self._stamp(path) if self._check_mtime or entry is None else entry.stamp
+        if entry is not None and entry.stamp == stamp:
+            counters[0] += 1
+            self._entries.move_to_end(path)
+            # component labels may have been built since the last estimate
+            nbytes = grid_nbytes(entry.env)
+            self._nbytes += nbytes - entry.nbytes
+            entry.nbytes = nbytes
+        else:
+            counters[1] += 1
+            if entry is not None:
+                counters[2] += 1
+                self._remove(path)
+            env = self._grid_cls(path) if self._cache_dir is None else \
+                load_compiled(path, self._cache_dir, self._grid_cls)
+            if self._components:
+                env.ensure_components()
+            entry = _Entry(env, stamp)
+            self._entries[path] = entry
+            self._nbytes += entry.nbytes
+        self._evict(keep=path)
+        return entry
+
+    def _evict(self, keep: str) -> None:
+        while self._nbytes > self._max_bytes and len(self._entries) > 1:
+            path = next(iter(self._entries))
+            if path == keep:
+                self._entries.move_to_end(path)
+                path = next(iter(self._entries))
+            self._remove(path)
+            self._counters[path][3] += 1
+
+    def _remove(self, path: str) -> None:
+        entry = self._entries.pop(path)
+        self._nbytes -= entry.total()
+
+    @staticmethod
+    def _stamp(path: str) -> Tuple[int, int]:
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
@@ -0,0 +1,255 @@
+from collections import OrderedDict
+from weakref import WeakKeyDictionary
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+from typing import Dict
+from typing import List
+from typing import Set
+import itertools
+import sys
+
+from sa_pathfinding.algorithms.generics.search_result import Termination
+from sa_pathfinding.environments.generics.env import Environment
+from sa_pathfinding.environments.generics.state import State
+from sa_pathfinding.heuristics.heuristic import Heuristic
+
+"""path_cache Module
+
+This module contains an LRU cache of search results that sits in front of
+any Search class.
+
+Example:
+    Serve repeated spawn-to-objective queries from memory::
+
+        cache = PathCache(max_bytes=32 * 2**20)
+        path = cache.get_path(env, GridOptimizedAstar, start, goal,
+                              heuristic=OctileGridHeuristic())
+        print(cache.stats)
+"""
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    sub_path_hits: int
+    misses: int
+    evictions: int
+    entries: int
+    nbytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.sub_path_hits + self.misses
+        return (self.hits + self.sub_path_hits) / lookups if lookups else 0.0
+
+
+class _Entry:
+
+    __slots__ = 'path positions nbytes optimal'.split()
+
+    def __init__(self, path: List[State], optimal: bool) -> None:
+        self.path = path
+        self.optimal = optimal
+        self.positions = {state: i for i, state in enumerate(path)} if optimal else None
+        self.nbytes = sys.getsizeof(path) + sum(sys.getsizeof(state) for state in path)
+        if self.positions is not None:
+            self.nbytes += sys.getsizeof(self.positions)
+
+
+class PathCache:
+    """ An LRU cache of paths with a memory budget.
+
+    Entries are keyed by (map, map version, start, goal, algorithm,
+    heuristic, other search arguments). The map is identified by the environment object itself and
+    its version by the environment's 'version' attribute (see Grid), so
+    blocking or unblocking a cell makes every entry for that map stale;
+    stale entries are dropped the next time the map is looked up.
+
+    Paths found by optimal searches (Search.optimal) also serve sub-path
+    hits: every section of a least-cost path is itself a least-cost path,
+    so a query for two cells that appear in that order on a cached optimal
+    path is answered with the section between them. Only paths cached
+    with the same algorithm, heuristic and search arguments serve a
+    query: Search.optimal assumes an admissible heuristic, which the
+    cache cannot check, so paths of a search run with an inadmissible
+    one never reach queries of another.
+
+    Unreachable and exhausted queries are cached as empty paths. Searches
+    stopped by a limit are not cached.
+
+    Attributes:
+        max_bytes (:obj:'int'): Memory budget, estimated with
+            sys.getsizeof over the cached paths and their states.
+        stats (:obj:'CacheStats'): Hit, miss and eviction counters.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 2**20) -> None:
+        self._max_bytes = max_bytes
+        self._entries: 'OrderedDict[tuple, _Entry]' = OrderedDict()
+        self._nbytes = 0
+
+        # map identity and version bookkeeping
+        self._tokens = WeakKeyDictionary()
+        self._token_counter = itertools.count()
+        self._versions: Dict[int, int] = {}
+        self._map_keys: Dict[int, Set[tuple]] = {}
+
+        # (map token, state) -> keys of optimal entries whose path has state
+        self._cells: Dict[Tuple[int, State], Set[tuple]] = {}
+
+        self._hits = 0
+        self._sub_path_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(self._hits, self._sub_path_hits, self._misses,
+                          self._evictions, len(self._entries), self._nbytes)
+
+    def get_path(self,
+                 env: Environment,
+                 search_cls: type,
+                 start: State,
+                 goal: State,
+                 heuristic: Heuristic = None,
+                 **search_kwargs) -> List[State]:
+        """Returns the cached path, or runs the search and caches its path.
+
+        Args:
+            env (:obj:'Environment'): Environment to search.
+            search_cls (:obj:'type'): Search class to run on a miss.
+            start (:obj:'State'): State to start search from.
+            goal (:obj:'State'): State to search to.
+            heuristic (:obj:'Heuristic', optional): Passed to the search,
+                for searches that take one.
+            **search_kwargs: Further keyword arguments for the search.
+
+        Returns:
+            List[State], empty if no path exists.
+        """
+        path = self.lookup(env, search_cls, start, goal, heuristic, **search_kwargs)
+        if path is not None:
+            return path
+        if heuristic is not None:
+            search_kwargs['heuristic'] = heuristic
+        search = search_cls(env, start=start, goal=goal, **search_kwargs)
+        path = search.get_path()
+        search_kwargs.pop('heuristic', None)
+        if search.result.termination in (Termination.SUCCESS,
+                                         Termination.EXHAUSTED,
+                                         Termination.UNREACHABLE):
+            self.store(env, search_cls, start, goal, heuristic, path, **search_kwargs)
+        return path
+
+    def lookup(self,
+               env: Environment,
+               search_cls: type,
+               start: State,
+               goal: State,
+               heuristic: Heuristic = None,
+               **search_kwargs) -> Optional[List[State]]:
+        """Returns a cached path for the query, or None on a miss."""
+        token = self._token(env)
+        key = self._key(token, search_cls, start, goal, heuristic, search_kwargs)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return list(entry.path)
+        if search_cls.optimal:
+            for other in self._cells.get((token, start), ()):
+                # same search, heuristic and arguments only
+                if other[3:] != key[3:]:
+                    continue
+                entry = self._entries[other]
+                i, j = entry.positions[start], entry.positions.get(goal)
+                if j is not None and j >= i:
+                    self._entries.move_to_end(other)
+                    self._sub_path_hits += 1
+                    return entry.path[i:j + 1]
+        self._misses += 1
+        return None
+
+    def store(self,
+              env: Environment,
+              search_cls: type,
+              start: State,
+              goal: State,
+              heuristic: Heuristic,
+              path: List[State],
+              **search_kwargs) -> None:
+        """Caches a path, evicting least recently used entries to fit."""
+        token = self._token(env)
+        key = self._key(token, search_cls, start, goal, heuristic, search_kwargs)
+        if key in self._entries:
+            self._remove(key)
+        entry = _Entry(list(path), search_cls.optimal and len(path) > 0)
+        if entry.nbytes > self._max_bytes:
+            return
+        while self._nbytes + entry.nbytes > self._max_bytes:
+            self._remove(next(iter(self._entries)))
+            self._evictions += 1
+        self._entries[key] = entry
+        self._nbytes += entry.nbytes
+        self._map_keys.setdefault(token, set()).add(key)
+        if entry.positions is not None:
+            for state in entry.positions:
+                self._cells.setdefault((token, state), set()).add(key)
+
+    def invalidate(self, env: Environment) -> None:
+        """Drops every entry for a map."""
+        token = self._tokens.get(env)
+        if token is not None:
+            for key in list(self._map_keys.get(token, ())):
+                self._remove(key)
+
+    def clear(self) -> None:
+        for key in list(self._entries):
+            self._remove(key)
+
+    def _token(self, env: Environment) -> int:
+        token = self._tokens.get(env)
+        if token is None:
+            token = next(self._token_counter)
+            self._tokens[env] = token
+        version = getattr(env, 'version', 0)
+        if self._versions.get(token) != version:
+            self.invalidate(env)
+            self._versions[token] = version
+        return token
+
+    @staticmethod
+    def _key(token: int,
+             search_cls: type,
+             start: State,
+             goal: State,
+             heuristic: Heuristic,
+             search_kwargs: Dict[str, object]) -> tuple:
+        # classes, such as open_list, by name, other values by repr
+        options = tuple(sorted((name, getattr(value, '__name__', None) or repr(value))
+                               for name, value in search_kwargs.items()))
+        return (token, start, goal, search_cls.__name__,
+                None if heuristic is None else heuristic.name, options)
+
+    def _remove(self, key: tuple) -> None:
+        entry = self._entries.pop(key)
+        self._nbytes -= entry.nbytes
+        self._map_keys[key[0]].discard(key)
+        if entry.positions is not None:
+            for state in entry.positions:
+                keys = self._cells[(key[0], state)]
+                keys.discard(key)
+                if not keys:
+                    del self._cells[(key[0], state)]
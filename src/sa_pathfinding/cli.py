@@ -13,115 +13,481 @@ Why does this file exist, and why not put this in __main__?
     there's no ``sa-pathfinding.__main__`` in ``sys.modules``.
 
   Also see (1) from http://click.pocoo.org/5/setuptools/#setuptools-integration
+
+Subcommands:
+
+  bench   Run algorithms over the scenarios of map sets, save the results
+          and compare them against a baseline::
+
+            $ sa_pathfinding bench data/maps/small -a grid-astar grid-dijkstra \\
+                --queries 50 --repeat 3 --output bench.json --baseline baseline.json
+
+  query   Load a map once and stream queries through it, read as JSON lines
+          or CSV from a file or stdin, one result line per query::
+
+            $ echo '{"start": [18, 24], "goal": [30, 24]}' | \\
+                sa_pathfinding query data/maps/small/den403d.map --workers 4
+
+  serve   Keep maps loaded and answer path queries over HTTP on localhost
+          or a Unix socket, with /health and /metrics endpoints::
+
+            $ sa_pathfinding serve data/maps --port 8400 --workers 4 &
+            $ curl -d '{"map": "den403d", "start": [18, 24], "goal": [30, 24]}' \\
+                localhost:8400/path
+
+  compile Build per-map artifacts (packed bitmaps, component labels) once,
+          skipping those already up to date, for faster loading::
+
+            $ sa_pathfinding compile data/maps --output compiled
+            $ sa_pathfinding serve data/maps --cache-dir compiled
 """
-import inspect
-from typing import Tuple
-from pydoc import locate
+from typing import TYPE_CHECKING
+from typing import Iterator
+from typing import TextIO
+from typing import List
 import argparse
+import json
+import csv
 import time
 import sys
 import os
 
-from sa_pathfinding.environments.towers_of_hanoi.towers_of_hanoi import TowersOfHanoi
-from sa_pathfinding.algorithms.astar.grid_optimized_astar import GridOptimizedAstar
-from sa_pathfinding.environments.towers_of_hanoi.towers_of_hanoi import TOHAction
-from sa_pathfinding.environments.towers_of_hanoi.towers_of_hanoi import TOHState
-from sa_pathfinding.algorithms.dijkstra.generic_dijkstra import GenericDijkstra
-from sa_pathfinding.heuristics.grid_heuristic import OctileGridHeuristic
-from sa_pathfinding.algorithms.astar.generic_astar import GenericAstar
-from sa_pathfinding.algorithms.generics.search_node import SearchNode
-from sa_pathfinding.environments.grids.generics.grid import GridState
-from sa_pathfinding.environments.grids.octile_grid import OctileGrid
-from sa_pathfinding.environments.generics.env import Environment
-from sa_pathfinding.algorithms.bfs.generic_bfs import GenericBFS
-from sa_pathfinding.algorithms.dfs.generic_dfs import GenericDFS
-from sa_pathfinding.environments.generics.state import State
-from sa_pathfinding.algorithms.generics.search import Search
-
-verbose: bool = False
-filepath = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + '/data/maps/large/brc202d.map')
-
-def main(argv=sys.argv):
-  print('running...')
-
-  astar = GenericDijkstra(OctileGrid('/Users/nathan/dev/python/python-sa-pathfinding/data/maps/small/den403d.map'))
-  path = astar.get_path()
-  print(path)
-  print('test')
-
-  args = _parse_args()
-  _execute_args(args)
-  return 0
+from sa_pathfinding.registry import takes_heuristic
+from sa_pathfinding.registry import SearchConfigs
+from sa_pathfinding.registry import search_config
+from sa_pathfinding.registry import HEURISTICS
+from sa_pathfinding.registry import ALGORITHMS
+from sa_pathfinding.registry import GRID
+
+if TYPE_CHECKING:
+  from sa_pathfinding.parallel.batch import QueryResult
+
+# Subcommands import what they use when they run, so starting the app
+# only costs the modules of the one subcommand, and of the algorithms it
+# is asked for.
+
 
-def _parse_args() -> argparse.Namespace:
-  parser = argparse.ArgumentParser()
-  parser.add_argument("-v", 
-                      "--verbose", 
-                      action='store_true', 
+def main(argv=None):
+  args = _parse_args(sys.argv[1:] if argv is None else argv)
+  if args.command is None:
+    _parser().print_help()
+    return 0
+  return args.func(args)
+
+
+def _parser() -> argparse.ArgumentParser:
+  parser = argparse.ArgumentParser(prog='sa_pathfinding')
+  parser.add_argument("-v",
+                      "--verbose",
+                      action='store_true',
                       help="print supplementary info vs get results")
+  subparsers = parser.add_subparsers(dest='command')
+
+  bench = subparsers.add_parser('bench',
+                                help="benchmark algorithms over map sets",
+                                description="""Run algorithms over seeded scenarios of
+                                            map sets, save the results and compare
+                                            them against a baseline.""")
+  bench.add_argument("maps",
+                     nargs='+',
+                     help="map files, or directories searched for *.map files")
+  bench.add_argument("-a", "--algorithms",
+                     nargs='+',
+                     default=['grid-astar'],
+                     choices=ALGORITHMS.for_environment(GRID),
+                     help="algorithms to run (default: grid-astar)")
+  bench.add_argument("-H", "--heuristics",
+                     nargs='+',
+                     default=['octile'],
+                     choices=HEURISTICS,
+                     help="heuristics for the algorithms that take one (default: octile)")
+  bench.add_argument("-n", "--queries",
+                     type=int,
+                     default=100,
+                     help="scenarios per map (default: 100)")
+  bench.add_argument("--max-maps",
+                     type=int,
+                     help="only the first N maps, in path order")
+  bench.add_argument("--seed",
+                     type=int,
+                     default=0,
+                     help="seed for generated scenarios (default: 0)")
+  bench.add_argument("--scenario-dir",
+                     help="where scenario files are kept, so runs share queries")
+  bench.add_argument("--warmup",
+                     type=int,
+                     default=5,
+                     help="untimed scenarios run first per map and algorithm (default: 5)")
+  bench.add_argument("--repeat",
+                     type=int,
+                     default=1,
+                     help="runs of every scenario (default: 1)")
+  bench.add_argument("-o", "--output",
+                     help="save the results as JSON, usable as a later --baseline")
+  bench.add_argument("--csv",
+                     help="save the per map summary as CSV")
+  bench.add_argument("--baseline",
+                     help="JSON results to compare against")
+  bench.add_argument("--alpha",
+                     type=float,
+                     default=0.01,
+                     help="significance level of the comparison (default: 0.01)")
+  bench.add_argument("--threshold",
+                     type=float,
+                     default=0.05,
+                     help="smallest relative slowdown flagged (default: 0.05)")
+  bench.set_defaults(func=_bench)
+
+  query = subparsers.add_parser('query',
+                                help="stream path queries through a map",
+                                description="""Load a map once and answer queries read as
+                                            JSON lines ({"start": [x, y], "goal": [x, y],
+                                            "algorithm": "grid-astar"}) or CSV (start_x,
+                                            start_y, goal_x, goal_y[, algorithm]).""")
+  query.add_argument("map",
+                     help="map file to search")
+  query.add_argument("-i", "--input",
+                     default='-',
+                     help="query file, - for stdin (default)")
+  query.add_argument("-o", "--output",
+                     default='-',
+                     help="result file, - for stdout (default)")
+  query.add_argument("-f", "--format",
+                     choices=['jsonl', 'csv'],
+                     help="input format (default: from the file extension, else jsonl)")
+  query.add_argument("--output-format",
+                     choices=['jsonl', 'csv'],
+                     default='jsonl',
+                     help="result format (default: jsonl)")
+  query.add_argument("-a", "--algorithm",
+                     default='grid-astar',
+                     choices=ALGORITHMS.for_environment(GRID),
+                     help="algorithm of queries that do not name one (default: grid-astar)")
+  query.add_argument("-H", "--heuristic",
+                     default='octile',
+                     choices=HEURISTICS,
+                     help="heuristic of the algorithms that take one (default: octile)")
+  query.add_argument("-w", "--workers",
+                     type=int,
+                     default=0,
+                     help="worker processes, 0 to search in this process (default: 0)")
+  query.add_argument("--chunksize",
+                     type=int,
+                     default=16,
+                     help="queries handed to a worker at a time (default: 16)")
+  query.add_argument("--unordered",
+                     action='store_true',
+                     help="write results as they complete instead of in query order")
+  query.add_argument("--metrics",
+                     action='store_true',
+                     help="add the search metrics to every result")
+  query.set_defaults(func=_query)
+
+  serve = subparsers.add_parser('serve',
+                                help="answer path queries over HTTP",
+                                description="""Keep maps loaded and answer POST /path
+                                            requests ({"map": "den403d", "start": [x, y],
+                                            "goal": [x, y]}) on localhost or a Unix
+                                            socket, with GET /health and /metrics.""")
+  serve.add_argument("maps",
+                     nargs='+',
+                     help="map files, or directories searched for *.map files")
+  serve.add_argument("--host",
+                     default='127.0.0.1',
+                     help="address to listen on (default: 127.0.0.1)")
+  serve.add_argument("-p", "--port",
+                     type=int,
+                     default=8400,
+                     help="port to listen on (default: 8400)")
+  serve.add_argument("--unix-socket",
+                     help="listen on this Unix socket instead of TCP")
+  serve.add_argument("-a", "--algorithm",
+                     default='grid-astar',
+                     choices=ALGORITHMS.for_environment(GRID),
+                     help="algorithm of requests that do not name one (default: grid-astar)")
+  serve.add_argument("-H", "--heuristic",
+                     default='octile',
+                     choices=HEURISTICS,
+                     help="heuristic of the algorithms that take one (default: octile)")
+  serve.add_argument("-w", "--workers",
+                     type=int,
+                     default=0,
+                     help="search processes, 0 to search in the request threads (default: 0)")
+  serve.add_argument("-m", "--max-memory",
+                     type=int,
+                     default=512,
+                     help="MiB of loaded maps kept per search process (default: 512)")
+  serve.add_argument("--cache-dir",
+                     help="load maps from the artifacts compiled into this directory")
+  serve.add_argument("--preload",
+                     action='store_true',
+                     help="load maps at start-up, as many as fit, instead of on first query")
+  serve.add_argument("--access-log",
+                     action='store_true',
+                     help="log every request to stderr")
+  serve.set_defaults(func=_serve)
+
+  compile_ = subparsers.add_parser('compile',
+                                   help="precompute per-map artifacts",
+                                   description="""Build the artifacts of every map that are
+                                               missing or out of date into a cache directory,
+                                               in parallel, and print what was built.""")
+  compile_.add_argument("maps",
+                        nargs='+',
+                        help="map files, or directories searched for *.map files")
+  compile_.add_argument("-o", "--output",
+                        default='compiled',
+                        help="cache directory (default: compiled)")
+  compile_.add_argument("-p", "--preprocessors",
+                        nargs='+',
+                        help="artifacts to build: bitmap, components (default: all)")
+  compile_.add_argument("-w", "--workers",
+                        type=int,
+                        help="worker processes, 0 to compile in this process (default: all cores)")
+  compile_.add_argument("--force",
+                        action='store_true',
+                        help="rebuild artifacts that are up to date")
+  compile_.set_defaults(func=_compile)
+  return parser
+
+
+def _parse_args(argv: List[str]) -> argparse.Namespace:
+  return _parser().parse_args(argv)
+
+
+def _algorithms(algorithm_names: List[str], heuristic_names: List[str]) -> list:
+  from sa_pathfinding.benchmarks.runner import Algorithm
+  # algorithms that take a heuristic are run once with each of them
+  algorithms = []
+  for name in algorithm_names:
+    search_cls = ALGORITHMS.get(name)
+    if takes_heuristic(search_cls):
+      for heuristic in heuristic_names:
+        algorithms.append(Algorithm(f'{name}/{heuristic}', *search_config(name, heuristic)))
+    else:
+      algorithms.append(Algorithm(name, search_cls))
+  return algorithms
+
+
+def _find_maps(paths: List[str]) -> List[str]:
+  from sa_pathfinding.benchmarks.runner import find_maps
+  maps = []
+  for path in paths:
+    maps.extend(find_maps(path) if os.path.isdir(path) else [path])
+  return maps
+
+
+def _bench(args: argparse.Namespace) -> int:
+  from sa_pathfinding.benchmarks.compare import compare_reports
+  from sa_pathfinding.benchmarks.runner import BenchmarkReport
+  from sa_pathfinding.benchmarks.runner import run_benchmark
+  maps = _find_maps(args.maps)[:args.max_maps]
+  if len(maps) == 0:
+    print(f"No maps found in {' '.join(args.maps)}.", file=sys.stderr)
+    return 2
+  algorithms = _algorithms(args.algorithms, args.heuristics)
+
+  def progress(map_name: str, algorithm: str) -> None:
+    if args.verbose:
+      print(f"{map_name:24s} {algorithm}", file=sys.stderr)
+
+  report = run_benchmark(maps, algorithms,
+                         count=args.queries,
+                         seed=args.seed,
+                         scenario_dir=args.scenario_dir,
+                         repeat=args.repeat,
+                         warmup=args.warmup,
+                         progress=progress)
+  if args.output:
+    report.to_json(args.output)
+  if args.csv:
+    report.to_csv(args.csv)
+
+  print(f"{'algorithm':24s} {'queries':>8s} {'solved':>8s} "
+        f"{'p50 ms':>9s} {'p90 ms':>9s} {'p99 ms':>9s} {'exp p50':>9s} {'subopt max':>10s}")
+  for row in report.summary(by_map=False):
+    print(f"{row['algorithm']:24s} {row['queries']:8d} {row['solved']:8d} "
+          f"{row['time_p50'] * 1000:9.3f} {row['time_p90'] * 1000:9.3f} "
+          f"{row['time_p99'] * 1000:9.3f} {row['expansions_p50']:9.0f} "
+          f"{row['suboptimality_max']:10.4f}")
+
+  if args.baseline is None:
+    return 0
+  comparisons = compare_reports(BenchmarkReport.from_json(args.baseline), report,
+                                alpha=args.alpha, threshold=args.threshold)
+  _print_comparisons(comparisons, args.verbose)
+  return 1 if any(comparison.regression for comparison in comparisons) else 0
+
+
+def _print_comparisons(comparisons: list, verbose: bool) -> None:
+  if len(comparisons) == 0:
+    print("\nNothing in common with the baseline to compare.")
+    return
+  print(f"\n{'map':24s} {'algorithm':24s} {'change':>8s} {'p':>8s}")
+  for comparison in comparisons:
+    flag = 'REGRESSION' if comparison.regression else \
+      'improved' if comparison.improvement else ''
+    if comparison.expansions_changed:
+      flag += ' (expansions changed)'
+    # per map lines only when they say something, unless verbose
+    if comparison.map != '*' and not flag and not verbose:
+      continue
+    print(f"{comparison.map:24s} {comparison.algorithm:24s} "
+          f"{(comparison.ratio - 1) * 100:+7.1f}% {comparison.p_value:8.4f} {flag}")
+
+
+def _read_queries(file: TextIO, fmt: str) -> Iterator[tuple]:
+  """Yields (start, goal) or (start, goal, algorithm) per input line."""
+  if fmt == 'csv':
+    for number, row in enumerate(csv.reader(file), 1):
+      if len(row) == 0 or row[0].strip().startswith('#'):
+        continue
+      if number == 1 and not row[0].strip().lstrip('-').isdigit():
+        continue  # header
+      if len(row) not in (4, 5):
+        raise ValueError(f"line {number}: expected start_x, start_y, goal_x, goal_y[, algorithm].")
+      try:
+        x1, y1, x2, y2 = (int(field) for field in row[:4])
+      except ValueError:
+        raise ValueError(f"line {number}: coordinates must be integers.")
+      algorithm = row[4].strip() if len(row) == 5 and row[4].strip() else None
+      yield ((x1, y1), (x2, y2)) if algorithm is None else ((x1, y1), (x2, y2), algorithm)
+    return
+  for number, line in enumerate(file, 1):
+    if not line.strip():
+      continue
+    try:
+      record = json.loads(line)
+      start, goal = record['start'], record['goal']
+    except (ValueError, KeyError, TypeError):
+      raise ValueError(f"line {number}: expected {{\"start\": [x, y], \"goal\": [x, y]}}.")
+    if not all(isinstance(point, list) and len(point) == 2 and
+               all(type(v) is int for v in point) for point in (start, goal)):
+      raise ValueError(f"line {number}: start and goal must be [x, y] pairs of integers.")
+    start, goal = tuple(start), tuple(goal)
+    algorithm = record.get('algorithm')
+    yield (start, goal) if algorithm is None else (start, goal, algorithm)
+
+
+_RESULT_FIELDS = 'index start goal algorithm success cost nodes_expanded path error'.split()
+
+
+def _result_record(result: 'QueryResult', algorithm: str) -> dict:
+  record = {'index': result.index,
+            'start': list(result.start),
+            'goal': list(result.goal),
+            'algorithm': result.algorithm or algorithm,
+            'success': result.success,
+            'cost': result.cost,
+            'nodes_expanded': result.nodes_expanded,
+            'path': [[state.x, state.y] for state in result.states()]}
+  if result.error is not None:
+    record['error'] = result.error
+  if result.metrics is not None:
+    record['metrics'] = result.metrics
+  return record
+
+
+def _query(args: argparse.Namespace) -> int:
+  from sa_pathfinding.environments.grids.octile_grid import OctileGrid
+  from sa_pathfinding.parallel.batch import BatchSearch
+  env = OctileGrid(args.map)
+  fmt = args.format or ('csv' if args.input.endswith('.csv') else 'jsonl')
+  # only the algorithms the queries name are imported
+  algorithms = SearchConfigs(args.heuristic, environment=GRID,
+                             **({'metrics': True} if args.metrics else {}))
+  search_cls, search_kwargs = algorithms[args.algorithm]
+
+  infile = sys.stdin if args.input == '-' else open(args.input, 'r', newline='')
+  outfile = sys.stdout if args.output == '-' else open(args.output, 'w', newline='')
+  writer = None
+  if args.output_format == 'csv':
+    fields = _RESULT_FIELDS + (['metrics'] if args.metrics else [])
+    writer = csv.DictWriter(outfile, fieldnames=fields, extrasaction='ignore')
+    writer.writeheader()
+  try:
+    with BatchSearch(env, search_cls,
+                     workers=args.workers,
+                     chunksize=args.chunksize,
+                     algorithms=algorithms,
+                     **search_kwargs) as batch:
+      for result in batch.run(_read_queries(infile, fmt), ordered=not args.unordered):
+        record = _result_record(result, args.algorithm)
+        if writer is None:
+          outfile.write(json.dumps(record) + '\n')
+        else:
+          record['start'] = ' '.join(map(str, record['start']))
+          record['goal'] = ' '.join(map(str, record['goal']))
+          record['path'] = ';'.join(f'{x} {y}' for x, y in record['path'])
+          if 'metrics' in record:
+            record['metrics'] = json.dumps(record['metrics'])
+          writer.writerow(record)
+        outfile.flush()
+  except ValueError as e:
+    print(f"{args.input}: {e}", file=sys.stderr)
+    return 2
+  finally:
+    if infile is not sys.stdin:
+      infile.close()
+    if outfile is not sys.stdout:
+      outfile.close()
+  return 0
+
+
+def _serve(args: argparse.Namespace) -> int:
+  from sa_pathfinding.server import PathServer
+  server = PathServer(args.maps, SearchConfigs(args.heuristic, environment=GRID), args.algorithm,
+                      workers=args.workers,
+                      max_bytes=args.max_memory * 2**20,
+                      cache_dir=args.cache_dir,
+                      preload=args.preload,
+                      verbose=args.access_log)
+  if len(server.maps) == 0:
+    print(f"No maps found in {' '.join(args.maps)}.", file=sys.stderr)
+    return 2
+  server.start(args.host, args.port, args.unix_socket)
+  where = args.unix_socket or '%s:%d' % server.address[:2]
+  print(f"Serving {len(server.maps)} maps on {where}", file=sys.stderr)
+  server.serve()
+  return 0
+
+
+def _compile(args: argparse.Namespace) -> int:
+  from sa_pathfinding.preprocessing.compile import PREPROCESSORS
+  from sa_pathfinding.preprocessing.compile import compile_maps
+  maps = _find_maps(args.maps)
+  if len(maps) == 0:
+    print(f"No maps found in {' '.join(args.maps)}.", file=sys.stderr)
+    return 2
+  unknown = [name for name in args.preprocessors or () if name not in PREPROCESSORS]
+  if unknown:
+    print(f"Unknown preprocessor {unknown[0]!r}, expected one of {', '.join(PREPROCESSORS)}.",
+          file=sys.stderr)
+    return 2
+
+  def progress(report) -> None:
+    if args.verbose:
+      print(f"{os.path.basename(report.map):24s} {report.built} built", file=sys.stderr)
+
+  t1 = time.perf_counter()
+  reports = compile_maps(maps, args.output,
+                         preprocessors=args.preprocessors,
+                         workers=args.workers,
+                         force=args.force,
+                         progress=progress)
+  elapsed = time.perf_counter() - t1
 
-  # environment start_x start_y goal_x goal_y SearchClassName(HeuristicClassName) SearchClassName
-  parser.add_argument("-sc", 
-                    metavar='-',
-                    nargs=7,
-                    type=str,
-                    help="""Compare wall clock running time of 2 search algorithms on a given environment. 
-                          define string args as: 
-                          env='EnvironmentClassName:filepath' 
-                          start='EnvironmentStateClassName:param1, param2, ...' 
-                          goal='EnvironmentStateClassName:param1, param2, ...'
-                          search_1='SearchClassName:param1, param2, ...'
-                          search_2='SearchClassName:param1, param2, ...'
-                          usage: __main__.py -sc env start goal search_1 search_2""")
-             
-  return parser.parse_args()
-
-def _execute_args(args) -> None:
-  verbose = args.verbose
-
-def speed_test(env: Environment, 
-              search_1: Search.__class__, 
-              search_2: Search.__class__, 
-              start: State=None, 
-              goal: State=None, 
-              heuristic=None) -> Tuple[float, float]:
-
-  if start is None:
-    start = env.get_random(valid=True)
-  
-  if goal is None:
-    goal = env.get_random(valid=True)
-  
-  
-
-  generic_astar = GenericAstar(env, 
-                              heuristic=OctileGridHeuristic(), 
-                              start=SearchNode(start), 
-                              goal=SearchNode(goal))
-  gridopt_astar = GridOptimizedAstar(env, 
-                                      heuristic=OctileGridHeuristic(), 
-                                      start=SearchNode(start), 
-                                      goal=SearchNode(goal))
-  if verbose:
-    print('\n-----Beginning Speeedtest-----\n')
-    print(f'environment: {str(env)}')
-    print(f'start: {str(start)}')
-    print(f'goal: {str(goal)}')
-    print(f'heuristic: {str(OctileGridHeuristic())}')
-    print('\nrunning GenericAstar...')
-  generic_t1 = time.time()
-  generic_astar.get_path()
-  generic_t2 = time.time()
-  generic_time = generic_t2 - generic_t1
-  if verbose:
-    print(f'completed in: ' + str(round(generic_time, 2)) + 's')
-    print('\nrunning GridOptimizedAstar...')
-  gridopt_t1 = time.time()
-  gridopt_astar.get_path()
-  gridopt_t2 = time.time()
-  gridopt_time = gridopt_t2 - gridopt_t1
-  if verbose:
-    print(f'completed in: ' + str(round(gridopt_time, 2)) + 's')
-    print(f"\n{'GenericAstar' if generic_time < gridopt_time else 'GridOptimizedAstar'} was faster!")
-  if not verbose:
-    print(generic_time + ' ' + gridopt_time)
\ No newline at end of file
+  print(f"{'map':24s} {'artifact':12s} {'status':>8s} {'ms':>9s} {'bytes':>10s}")
+  for report in reports:
+    name = os.path.basename(report.map)
+    if report.error is not None:
+      print(f"{name:24s} {'':12s} {'error':>8s} {report.error}")
+    for artifact in report.artifacts:
+      print(f"{name:24s} {artifact.name:12s} {'built' if artifact.built else 'skipped':>8s} "
+            f"{artifact.time * 1000:9.2f} {artifact.nbytes:10d}")
+  artifacts = [artifact for report in reports for artifact in report.artifacts]
+  errors = sum(report.error is not None for report in reports)
+  print(f"\n{len(reports)} maps, {sum(a.built for a in artifacts)} artifacts built, "
+        f"{sum(not a.built for a in artifacts)} up to date, {errors} errors, "
+        f"{sum(a.nbytes for a in artifacts)} bytes, {elapsed:.2f}s")
+  return 1 if errors else 0
@@ -48,3 +48,37 @@ class Environment(ABC):
     @abstractmethod
     def get_random(self, valid: bool = True) -> State:
         pass
+
+    def is_reachable(self, start: State, goal: State) -> bool:
+        """Cheap connectivity check run before a search starts.
+
+        Returns False only if no path from start to goal can exist.
+        Environments without a connectivity index always return True.
+        """
+        return True
+
+    def concrete_path(self, path: List[State]) -> List[State]:
+        """The path a search found, as states the actions really visit.
+
+        Environments whose searches only visit one representative of
+        equivalent states return a path of actual moves here; all others
+        return the path as is.
+        """
+        return path
+
+    def get_path_cost(self, path: List[State]) -> float:
+        """Sums the action costs along a path of successive states.
+
+        Raises:
+            ValueError: if a state is not reachable from the one before it
+                with a single action.
+        """
+        cost = 0
+        for state, next_state in zip(path, path[1:]):
+            for action, action_cost in self.get_actions(state, None):
+                if self.apply_action(state, action) == next_state:
+                    cost += action_cost
+                    break
+            else:
+                raise ValueError(f"{next_state} is not a successor of {state}.")
+        return cost
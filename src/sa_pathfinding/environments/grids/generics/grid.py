@@ -1,7 +1,9 @@
 from abc import abstractmethod
 from typing import Tuple
 from typing import List
+from collections import deque
 import random
+import sys
 
 from sa_pathfinding.environments.generics.env import StateDoesNotExistError
 from sa_pathfinding.environments.generics.env import Environment
@@ -23,6 +25,9 @@ class GridState(State):
 
     def __ne__(self, other) -> bool:
         return not self.__eq__(other)
+
+    def __hash__(self) -> int:
+        return hash((self._x, self._y))
     
     def __str__(self) -> str:
         return str(self._x) + ', ' + str(self._y)
@@ -57,25 +62,68 @@ class Grid(Environment):
         file = open(filename, "r")
 
         # grab map type, height, and weight info from file
-        self._type: str = file.readline()[5:-1]
-        self._height: int = int(file.readline()[7:])
-        self._width: int = int(file.readline()[6:])
+        map_type: str = file.readline()[5:-1]
+        height: int = int(file.readline()[7:])
+        width: int = int(file.readline()[6:])
 
         # skip over useless line before map
         file.readline()
 
         # read map from file
-        grid_map = []
-        for y in range(0, self._height):
-            grid_map.append(list(file.readline()[:-1]))
+        passable = []
+        for y in range(0, height):
+            passable.extend(c == '.' for c in file.readline()[:width])
+        file.close()
+        self._load(map_type, height, width, passable)
+
+    @classmethod
+    def from_bytes(cls,
+                   data,
+                   width: int,
+                   height: int,
+                   map_type: str = 'octile') -> 'Grid':
+        """Builds a grid from row-major passability data, as produced by to_bytes().
+
+        Args:
+            data (bytes-like): One byte per cell, non-zero meaning passable.
+                Anything supporting the buffer protocol works, including a
+                multiprocessing.shared_memory buffer.
+            width (:obj:'int'): Grid width.
+            height (:obj:'int'): Grid height.
+            map_type (:obj:'str'): Map type as found in the .map header.
+        """
+        data = memoryview(data)
+        if len(data) < width * height:
+            raise ValueError(f"{len(data)} bytes is too little for a "
+                             f"{width}x{height} grid.")
+        grid = cls.__new__(cls)
+        grid._load(map_type, height, width, data[:width * height].tolist())
+        return grid
+
+    def to_bytes(self) -> bytes:
+        """Row-major passability data, one byte per cell (1 = passable)."""
+        return bytes(state.valid for row in self._env for state in row)
 
-        # convert char map to 2D bool array (true = passable, false = obstacle)
+    def _load(self,
+              map_type: str,
+              height: int,
+              width: int,
+              passable: List[bool]) -> None:
+        self._type = map_type
+        self._height = height
+        self._width = width
+        self._version = 0
+
+        # connected-component labels, built on first use
+        self._labels: List[int] = None
+        self._label_parent: List[int] = None
+
+        # convert flat passability list to 2D array of GridStates
         self._env: List[List[GridState]] = list()
         for y in range(0, self._height):
-            self._env.append(list())
-            for x in range(0, self._width):
-                passable = True if grid_map[y][x] == '.' else False
-                self._env[y].append(GridState(x, y, valid=passable))
+            row = passable[y * width:(y + 1) * width]
+            self._env.append([GridState(x, y, valid=bool(row[x]))
+                              for x in range(0, self._width)])
 
     def __str__(self) -> str:
         return str(self._width) + 'x' + str(self._height)
@@ -100,6 +148,224 @@ class Grid(Environment):
             line += '\n'
         return line
 
+    def set_valid(self, x: int, y: int, valid: bool) -> None:
+        """Blocks or unblocks a cell, keeping component labels up to date.
+
+        Unblocking merges the components around the cell, blocking floods
+        out from the cell's neighbours only as far as needed to find out
+        whether the component was split.
+
+        Args:
+            x (:obj:'int'): Column of the cell.
+            y (:obj:'int'): Row of the cell.
+            valid (:obj:'bool'): True to make the cell passable.
+        """
+        if not self.is_defined(GridState(x, y)):
+            raise StateDoesNotExistError(GridState(x, y))
+        if self._env[y][x].valid == valid:
+            return
+        self._env[y][x] = GridState(x, y, valid=valid)
+        self._version += 1
+        if self._labels is None:
+            return
+        if valid:
+            self._unblock(y * self._width + x)
+        else:
+            self._block(y * self._width + x)
+
+    def component(self, state: GridState) -> int:
+        """Connected-component label of a cell, 0 for blocked cells.
+
+        Octile moves may not cut corners, so a diagonal step is only legal
+        where the two cardinal steps around it are, and octile and cardinal
+        grids share the same components.
+        """
+        if not self.is_defined(state):
+            raise StateDoesNotExistError(state)
+        self.ensure_components()
+        return self._find(self._labels[state.y * self._width + state.x])
+
+    def component_labels(self) -> List[int]:
+        """Row-major component label of every cell, 0 for blocked cells."""
+        self.ensure_components()
+        return [self._find(label) for label in self._labels]
+
+    @property
+    def components_built(self) -> bool:
+        """True once the component labels are built or installed."""
+        return self._labels is not None
+
+    def ensure_components(self) -> None:
+        """Builds the component labels now, if they are not built yet,
+        rather than on the first component() call."""
+        if self._labels is None:
+            self._build_components()
+
+    def component_nbytes(self) -> int:
+        """Estimated memory of the component labels, 0 if not built."""
+        if self._labels is None:
+            return 0
+        # labels above 256 are int objects of their own
+        return sys.getsizeof(self._labels) + sys.getsizeof(self._label_parent) + \
+            len(self._label_parent) * sys.getsizeof(2**16)
+
+    def set_component_labels(self, labels: List[int]) -> None:
+        """Installs labels saved with component_labels() instead of
+        building them on first use.
+
+        Raises:
+            ValueError: if labels is not one per cell, or labels a blocked
+                cell or leaves a passable cell unlabelled.
+        """
+        labels = list(labels)
+        if len(labels) != self._width * self._height:
+            raise ValueError(f"{len(labels)} labels for a {self._width}x{self._height} grid.")
+        if bytes(map(bool, labels)) != self.to_bytes():
+            raise ValueError("Labels do not match the passable cells of the grid.")
+        self._label_parent = list(range(max(labels, default=0) + 1))
+        self._labels = labels
+
+    def is_reachable(self, start: GridState, goal: GridState) -> bool:
+        component = self.component(start)
+        return component != 0 and component == self.component(goal)
+
+    def _find(self, label: int) -> int:
+        parent = self._label_parent
+        while parent[label] != label:
+            parent[label] = parent[parent[label]]
+            label = parent[label]
+        return label
+
+    def _neighbours(self, i: int) -> List[int]:
+        width = self._width
+        x = i % width
+        neighbours = []
+        if i >= width:
+            neighbours.append(i - width)
+        if x < width - 1:
+            neighbours.append(i + 1)
+        if i + width < len(self._labels):
+            neighbours.append(i + width)
+        if x > 0:
+            neighbours.append(i - 1)
+        return neighbours
+
+    def _new_label(self) -> int:
+        label = len(self._label_parent)
+        self._label_parent.append(label)
+        return label
+
+    def _build_components(self) -> None:
+        # single raster pass with union-find over provisional labels, into
+        # local lists so that other threads never see half-built labels
+        width = self._width
+        labels = [0] * (width * self._height)
+        parent = [0]
+
+        def find(label: int) -> int:
+            while parent[label] != label:
+                parent[label] = parent[parent[label]]
+                label = parent[label]
+            return label
+
+        for y in range(self._height):
+            row = self._env[y]
+            for x in range(width):
+                if not row[x].valid:
+                    continue
+                i = y * width + x
+                left = labels[i - 1] if x > 0 else 0
+                up = labels[i - width] if y > 0 else 0
+                if left and up:
+                    left, up = find(left), find(up)
+                    labels[i] = min(left, up)
+                    parent[max(left, up)] = min(left, up)
+                elif left or up:
+                    labels[i] = left or up
+                else:
+                    labels[i] = len(parent)
+                    parent.append(labels[i])
+        for i, label in enumerate(labels):
+            if label:
+                labels[i] = find(label)
+        # _labels last, readers check it before using _label_parent
+        self._label_parent = parent
+        self._labels = labels
+
+    def _unblock(self, i: int) -> None:
+        roots = {self._find(self._labels[j])
+                 for j in self._neighbours(i) if self._labels[j]}
+        if not roots:
+            self._labels[i] = self._new_label()
+            return
+        root = min(roots)
+        for other in roots:
+            self._label_parent[other] = root
+        self._labels[i] = root
+
+    def _block(self, i: int) -> None:
+        labels = self._labels
+        labels[i] = 0
+        starts = [j for j in self._neighbours(i) if labels[j]]
+        if len(starts) < 2:
+            return
+
+        # flood fill from every neighbour at once, merging fills that meet.
+        # Once a single fill is still growing, every fill that ran out of
+        # cells is a piece cut off from the rest and gets a new label.
+        group_parent = list(range(len(starts)))
+        frontiers = [deque([j]) for j in starts]
+        cells = [[j] for j in starts]
+
+        def find(group: int) -> int:
+            while group_parent[group] != group:
+                group = group_parent[group]
+            return group
+
+        def union(a: int, b: int) -> int:
+            a, b = find(a), find(b)
+            if a != b:
+                group_parent[b] = a
+                frontiers[a].extend(frontiers[b])
+                cells[a].extend(cells[b])
+                frontiers[b].clear()
+                cells[b].clear()
+            return a
+
+        owner = {j: group for group, j in enumerate(starts)}
+        while True:
+            roots = [g for g in range(len(starts)) if group_parent[g] == g]
+            if len(roots) == 1:
+                return
+            growing = [g for g in roots if frontiers[g]]
+            if len(growing) <= 1:
+                break
+            for group in growing:
+                group = find(group)
+                if not frontiers[group]:
+                    continue
+                cell = frontiers[group].popleft()
+                for j in self._neighbours(cell):
+                    if not labels[j]:
+                        continue
+                    other = owner.get(j)
+                    if other is None:
+                        owner[j] = group
+                        frontiers[group].append(j)
+                        cells[group].append(j)
+                    elif find(other) != group:
+                        group = union(group, other)
+
+        # the piece still growing (or the largest, if all are done) keeps
+        # the old label
+        keep = max(roots, key=lambda g: (len(frontiers[g]) > 0, len(cells[g])))
+        for group in roots:
+            if group == keep:
+                continue
+            label = self._new_label()
+            for j in cells[group]:
+                labels[j] = label
+
     def get_random(self, valid: bool = True) -> GridState:
         x = random.randint(0, self._width - 1)
         y = random.randint(0, self._height - 1)
@@ -124,6 +390,11 @@ class Grid(Environment):
     def env(self):
         return self._env
 
+    @property
+    def version(self) -> int:
+        """Incremented every time a cell is blocked or unblocked."""
+        return self._version
+
     @abstractmethod
     def apply_action(self,
                      state: GridState,
@@ -21,13 +21,47 @@ class OctileGridAction(Action):
 
 
 class OctileGrid(Grid):
+    """ An 8-connected grid where diagonal moves may not cut corners.
 
-    def __init__(self, filename: str) -> None:
+    By default cardinal moves cost 1 and diagonal moves sqrt(2). Passing
+    integer costs, e.g. (70, 99) or (1000, 1414), switches to fixed-point
+    mode: every path cost is an exact integer, so searches compare costs
+    without float drift. Heuristics must then be built with the same costs.
+
+    Attributes:
+        costs (:obj:'tuple'): (cardinal, diagonal) move costs.
+        integer_costs (:obj:'bool'): True in fixed-point mode.
+    """
+
+    _cardinal_cost = 1
+    _diagonal_cost = math.sqrt(2)
+
+    def __init__(self, filename: str, costs: Tuple[int, int] = None) -> None:
         super().__init__(filename)
+        if costs is not None:
+            self.set_costs(*costs)
 
     def __repr__(self):
         repr(super())
 
+    @property
+    def costs(self) -> Tuple[float, float]:
+        return self._cardinal_cost, self._diagonal_cost
+
+    @property
+    def integer_costs(self) -> bool:
+        return isinstance(self._diagonal_cost, int)
+
+    def set_costs(self, cardinal: int, diagonal: int) -> None:
+        """Switches to integer move costs, diagonal/cardinal approximating sqrt(2)."""
+        if not isinstance(cardinal, int) or not isinstance(diagonal, int) or \
+                not 0 < cardinal <= diagonal:
+            raise ValueError(f"Costs ({cardinal}, {diagonal}) must be integers "
+                             f"with 0 < cardinal <= diagonal.")
+        self._cardinal_cost = cardinal
+        self._diagonal_cost = diagonal
+        self._version += 1
+
     def apply_action(self,
                      state: GridState,
                      action: OctileGridAction) -> GridState:
@@ -80,7 +114,7 @@ class OctileGrid(Grid):
                 self._env[state.y + 1][state.x].valid and \
                 (parent is None or (parent.y != state.y + 1 or
                                     parent.x != state.x + 1)):
-            actions.append((OctileGridAction.DOWN_RIGHT, math.sqrt(2)))
+            actions.append((OctileGridAction.DOWN_RIGHT, self._diagonal_cost))
 
         # down-left action check
         if state.y < self._height - 1 and \
@@ -90,7 +124,7 @@ class OctileGrid(Grid):
                 self._env[state.y + 1][state.x].valid and \
                 (parent is None or (parent.y != state.y + 1 or
                                     parent.x != state.x - 1)):
-            actions.append((OctileGridAction.DOWN_LEFT, math.sqrt(2)))
+            actions.append((OctileGridAction.DOWN_LEFT, self._diagonal_cost))
 
         # up-right action check
         if state.x < self._width - 1 and \
@@ -100,7 +134,7 @@ class OctileGrid(Grid):
                 self._env[state.y - 1][state.x].valid and \
                 (parent is None or (parent.y != state.y - 1 or
                                     parent.x != state.x + 1)):
-            actions.append((OctileGridAction.UP_RIGHT, math.sqrt(2)))
+            actions.append((OctileGridAction.UP_RIGHT, self._diagonal_cost))
 
         # up-left action check
         if state.x > 0 and \
@@ -110,34 +144,34 @@ class OctileGrid(Grid):
                 self._env[state.y - 1][state.x].valid and \
                 (parent is None or (parent.y != state.y - 1 or
                                     parent.x != state.x - 1)):
-            actions.append((OctileGridAction.UP_LEFT, math.sqrt(2)))
+            actions.append((OctileGridAction.UP_LEFT, self._diagonal_cost))
 
         # up action check
         if state.y > 0 and \
                 self._env[state.y - 1][state.x].valid and \
                 (parent is None or (parent.y != state.y - 1 or
                                     parent.x != state.x)):
-            actions.append((OctileGridAction.UP, 1))
+            actions.append((OctileGridAction.UP, self._cardinal_cost))
 
         # right action check
         if state.x < self._width - 1 and \
                 self._env[state.y][state.x + 1].valid and \
                 (parent is None or (parent.y != state.y or
                                     parent.x != state.x + 1)):
-            actions.append((OctileGridAction.RIGHT, 1))
+            actions.append((OctileGridAction.RIGHT, self._cardinal_cost))
 
         # down action check
         if state.y < self._height - 1 and \
                 self._env[state.y + 1][state.x].valid and \
                 (parent is None or (parent.y != state.y + 1 or
                                     parent.x != state.x)):
-            actions.append((OctileGridAction.DOWN, 1))
+            actions.append((OctileGridAction.DOWN, self._cardinal_cost))
 
         # left action check
         if state.x > 0 and \
                 self._env[state.y][state.x - 1].valid and \
                 (parent is None or (parent.y != state.y or
                                     parent.x != state.x - 1)):
-            actions.append((OctileGridAction.LEFT, 1))
+            actions.append((OctileGridAction.LEFT, self._cardinal_cost))
 
         return actions
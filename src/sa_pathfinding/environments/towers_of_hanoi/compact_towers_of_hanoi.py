@@ -0,0 +1,336 @@
+from typing import Tuple
+from typing import List
+import random
+
+from sa_pathfinding.environments.towers_of_hanoi.towers_of_hanoi import TowersOfHanoi
+from sa_pathfinding.environments.towers_of_hanoi.towers_of_hanoi import TOHAction
+from sa_pathfinding.environments.towers_of_hanoi.towers_of_hanoi import TOHState
+from sa_pathfinding.environments.generics.env import StateDoesNotExistError
+from sa_pathfinding.environments.generics.state import State
+
+"""compact_towers_of_hanoi Module
+
+This module contains a Towers of Hanoi environment whose states are single
+integers instead of lists of pegs.
+
+Disks can only ever sit on a peg in decreasing order of size, so a state is
+fully described by which peg each disk is on. With p pegs and n disks that
+is an n digit base-p number, digit d - 1 holding the peg of disk d (disk 1
+being the smallest). The number doubles as a perfect rank of the state in
+[0, p^n): states hash and compare as ints, the top of every peg is found
+by reading digits from the smallest disk up, and moving disk d from peg a
+to peg b is adding (b - a) * p^(d - 1).
+
+Example:
+    Search the compact form of an environment and convert the path back::
+
+        toh = TowersOfHanoi(4, 8, start_peg=0, goal_peg=3)
+        env = CompactTowersOfHanoi.from_environment(toh)
+        path = GenericBFS(env, start=env.start, goal=env.goal).get_path()
+        pegs = [env.to_toh_state(state) for state in path]
+"""
+
+
+class CompactTOHState(State):
+    """ A Towers of Hanoi state as the base-p number of its disks' pegs.
+
+    The state does not know its number of pegs or disks, convert it with
+    the CompactTowersOfHanoi it belongs to.
+
+    Attributes:
+        code (:obj:'int'): Rank of the state, digit d - 1 in base p is the
+            peg of disk d.
+    """
+
+    __slots__ = '_code'
+
+    def __init__(self, code: int) -> None:
+        self._code = code
+
+    def __eq__(self, other) -> bool:
+        return self._code == other._code
+
+    def __ne__(self, other) -> bool:
+        return self._code != other._code
+
+    def __hash__(self) -> int:
+        return hash(self._code)
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+    def __repr__(self) -> str:
+        return f'CompactTOHState<{self._code}>'
+
+    def get_state(self) -> int:
+        return self._code
+
+    @property
+    def code(self) -> int:
+        return self._code
+
+
+class CompactTOHAction(TOHAction):
+    """ A TOHAction that also knows which disk it moves, so applying it is
+    a single addition."""
+
+    def __init__(self, start_peg: int, goal_peg: int, disk: int) -> None:
+        super().__init__(start_peg, goal_peg)
+        self._disk = disk
+
+    @property
+    def disk(self) -> int:
+        return self._disk
+
+
+class CompactTowersOfHanoi(TowersOfHanoi):
+    """ TowersOfHanoi over CompactTOHState.
+
+    Takes the same arguments as TowersOfHanoi. Actions are built once, in
+    the constructor, and the same objects are returned by every
+    get_actions() call.
+
+    With symmetric=True, every child is replaced by its canonical() state,
+    so searches detect states that only differ by a permutation of the
+    pegs that are neither start nor goal peg as duplicates, and visit one
+    state of every such class; with four pegs that halves the states, with
+    five it divides them by six. Searches turn the path they find back
+    into real moves with concrete_path(). The goal must leave those pegs
+    empty, as the stacked goal does.
+    """
+
+    def __init__(self,
+                 pegs: int,
+                 disks: int,
+                 start_peg: int = -1,
+                 goal_peg: int = -1,
+                 symmetric: bool = False):
+        super().__init__(pegs, disks, start_peg, goal_peg)
+        self._symmetric = symmetric
+        # the pegs that are neither the start nor the goal peg can be
+        # permuted without changing the distance to the goal
+        self._free_pegs = [peg for peg in range(pegs)
+                           if peg not in (self._start_peg, self._goal_peg)]
+        # labels of the pegs before canonicalising, -1 for free pegs
+        self._fixed_labels = [-1 if peg in self._free_pegs else peg for peg in range(pegs)]
+        # p^(d - 1) for every disk d
+        self._powers = [pegs ** d for d in range(disks)]
+        self._size = pegs ** disks
+        # _moves[d - 1][a][b] moves disk d from peg a to peg b
+        self._moves = [[[(CompactTOHAction(a, b, d + 1), 1) for b in range(pegs)]
+                        for a in range(pegs)] for d in range(disks)]
+
+    @classmethod
+    def from_environment(cls, env: TowersOfHanoi, symmetric: bool = False) -> 'CompactTowersOfHanoi':
+        """The compact form of a TowersOfHanoi, with the same start and goal."""
+        return cls(env.num_pegs, env.num_disks, env.start_peg, env.goal_peg, symmetric)
+
+    def _top_disks(self, code: int) -> List[int]:
+        # index (d - 1) of the top disk of every peg, num_disks if empty
+        pegs = self._num_pegs
+        tops = [self._num_disks] * pegs
+        unseen = (1 << pegs) - 1
+        for d in range(self._num_disks):
+            code, peg = divmod(code, pegs)
+            if unseen >> peg & 1:
+                tops[peg] = d
+                unseen ^= 1 << peg
+                if not unseen:
+                    break
+        return tops
+
+    def tops(self, state: CompactTOHState) -> List[int]:
+        """The top disk of every peg, -1 for empty pegs, as TOHState.tops."""
+        return [-1 if d == self._num_disks else d + 1 for d in self._top_disks(state.code)]
+
+    def apply_action(self,
+                     state: CompactTOHState,
+                     action: TOHAction) -> CompactTOHState:
+        if isinstance(action, CompactTOHAction):
+            d = action.disk - 1
+        else:
+            d = self._top_disks(state.code)[action.start_peg]
+        code = state.code + (action.goal_peg - action.start_peg) * self._powers[d]
+        return CompactTOHState(self._canonical_code(code) if self._symmetric else code)
+
+    def get_actions(self,
+                    state: CompactTOHState,
+                    parent: CompactTOHState) -> List[Tuple[CompactTOHAction, float]]:
+        tops = self._top_disks(state.code)
+        empty = self._num_disks
+        action_cost_tuples = []
+        for a, disk in enumerate(tops):
+            if disk == empty:
+                continue
+            moves = self._moves[disk][a]
+            # a disk goes onto an empty peg or a bigger disk
+            for b, other in enumerate(tops):
+                if disk < other:
+                    action_cost_tuples.append(moves[b])
+        return action_cost_tuples
+
+    def _canonical_code(self, code: int) -> int:
+        free = self._free_pegs
+        last = len(free) - 1
+        if last < 1:
+            return code
+        pegs = self._num_pegs
+        powers = self._powers
+        labels = list(self._fixed_labels)
+        assigned = 0
+        canonical = 0
+        # free pegs are labelled in the order they are first used by the
+        # disks, from the largest down
+        for d in range(self._num_disks - 1, -1, -1):
+            power = powers[d]
+            peg = code // power % pegs
+            label = labels[peg]
+            if label < 0:
+                label = labels[peg] = free[assigned]
+                assigned += 1
+                if assigned == last:
+                    for other in free:
+                        if labels[other] < 0:
+                            labels[other] = free[last]
+                    # the digits below keep their pegs, nothing left to relabel
+                    if all(labels[other] == other for other in free):
+                        return canonical + code % (power * pegs)
+            canonical += label * power
+        return canonical
+
+    def canonical(self, state: CompactTOHState) -> CompactTOHState:
+        """The representative of the states that only differ from state by
+        a permutation of the pegs that are neither start nor goal peg.
+
+        Equivalent states are the same number of moves from any goal that
+        leaves these pegs empty, such as the stacked goal state.
+        """
+        return CompactTOHState(self._canonical_code(state.code))
+
+    def _successor_codes(self, code: int) -> List[int]:
+        tops = self._top_disks(code)
+        empty = self._num_disks
+        powers = self._powers
+        codes = []
+        for a, disk in enumerate(tops):
+            if disk == empty:
+                continue
+            step = powers[disk]
+            for b, other in enumerate(tops):
+                if disk < other:
+                    codes.append(code + (b - a) * step)
+        return codes
+
+    def get_successor_codes(self, code: int) -> List[int]:
+        """Codes of the children of a code, get_actions() and
+        apply_action() without the state and action objects."""
+        if self._symmetric:
+            canonical = self._canonical_code
+            return list({canonical(child): None for child in self._successor_codes(code)})
+        return self._successor_codes(code)
+
+    def concrete_path(self, path: List[CompactTOHState]) -> List[CompactTOHState]:
+        """Replays a path of canonical states from its first state, picking
+        at every step the move whose child is equivalent to the next state.
+
+        Raises:
+            ValueError: if a state is not equivalent to a child of the one
+                before it.
+        """
+        if not self._symmetric or len(path) == 0:
+            return path
+        canonical = self._canonical_code
+        code = path[0].code
+        concrete = [path[0]]
+        for state in path[1:]:
+            for child in self._successor_codes(code):
+                if canonical(child) == state.code:
+                    code = child
+                    break
+            else:
+                raise ValueError(f"{state} is not a successor of {concrete[-1]}.")
+            concrete.append(CompactTOHState(code))
+        return concrete
+
+    def get_path_cost(self, path: List[CompactTOHState]) -> int:
+        """The number of moves of a path of concrete states.
+
+        Raises:
+            ValueError: if a state is not one move from the one before it.
+        """
+        for state, next_state in zip(path, path[1:]):
+            if next_state.code not in self._successor_codes(state.code):
+                raise ValueError(f"{next_state} is not a successor of {state}.")
+        return max(len(path) - 1, 0)
+
+    def get_stacked_state(self, peg: int) -> CompactTOHState:
+        # every digit is peg: peg * (p^n - 1) / (p - 1)
+        return CompactTOHState(peg * ((self._size - 1) // (self._num_pegs - 1)))
+
+    def get_random(self, valid: bool = True) -> CompactTOHState:
+        return self.unrank(random.randrange(self._size))
+
+    def is_action_valid(self, state: CompactTOHState, action: TOHAction) -> bool:
+        if not self.is_action_defined(state, action):
+            return False
+        tops = self._top_disks(state.code)
+        disk = tops[action.start_peg]
+        if disk == self._num_disks or disk >= tops[action.goal_peg]:
+            return False
+        return not isinstance(action, CompactTOHAction) or action.disk == disk + 1
+
+    def is_defined(self, state: CompactTOHState) -> bool:
+        return 0 <= state.code < self._size
+
+    def is_valid(self, state: CompactTOHState) -> bool:
+        # every assignment of disks to pegs is a legal stacking
+        return self.is_defined(state)
+
+    def rank(self, state: CompactTOHState) -> int:
+        """The index of a state in [0, num_pegs ** num_disks)."""
+        return state.code
+
+    def unrank(self, rank: int) -> CompactTOHState:
+        """The state of an index in [0, num_pegs ** num_disks)."""
+        return CompactTOHState(rank)
+
+    def from_toh_state(self, state: TOHState) -> CompactTOHState:
+        """The compact form of a TOHState of this environment.
+
+        Raises:
+            StateDoesNotExistError: if the pegs do not hold every disk of
+                the environment exactly once, in decreasing order.
+        """
+        if len(state.pegs) != self._num_pegs or not super().is_valid(state) or \
+                sum(len(stack) for stack in state.pegs) != self._num_disks:
+            raise StateDoesNotExistError(state)
+        code = 0
+        disks = 0
+        for peg, stack in enumerate(state.pegs):
+            for disk in stack:
+                # a disk out of range or listed twice
+                if not 1 <= disk <= self._num_disks or disks >> disk & 1:
+                    raise StateDoesNotExistError(state)
+                code += peg * self._powers[disk - 1]
+                disks |= 1 << disk
+        if disks != (1 << self._num_disks + 1) - 2:
+            raise StateDoesNotExistError(state)
+        return CompactTOHState(code)
+
+    def to_toh_state(self, state: CompactTOHState) -> TOHState:
+        """The TOHState of a compact state."""
+        pegs = [[] for _ in range(self._num_pegs)]
+        code = state.code
+        digits = []
+        for _ in range(self._num_disks):
+            code, peg = divmod(code, self._num_pegs)
+            digits.append(peg)
+        # biggest disk first, so every peg is in decreasing order
+        for d in range(self._num_disks, 0, -1):
+            pegs[digits[d - 1]].append(d)
+        return TOHState(pegs)
+
+    @property
+    def size(self) -> int:
+        """Number of states, num_pegs ** num_disks."""
+        return self._size
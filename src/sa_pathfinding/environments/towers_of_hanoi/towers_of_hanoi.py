@@ -1,7 +1,6 @@
 from typing import Tuple
 from typing import List
 import random
-import copy
 import math
 
 from sa_pathfinding.environments.generics.env import StateDoesNotExistError
@@ -26,6 +25,9 @@ class TOHState(State):
 
     def __ne__(self, other) -> bool:
         return not self.__eq__(other)
+
+    def __hash__(self) -> int:
+        return hash(tuple(tuple(peg) for peg in self._pegs))
     
     def __str__(self) -> str:
         return self.__repr__()
@@ -119,7 +121,8 @@ class TowersOfHanoi(Environment):
     def apply_action(self,
                      state: TOHState,
                      action: TOHAction) -> TOHState:
-        new_pegs = copy.deepcopy(state.pegs)
+        # pegs only hold ints, copying the lists is a full copy
+        new_pegs = [list(peg) for peg in state.pegs]
         disk = new_pegs[action.start_peg].pop()
         new_pegs[action.goal_peg].append(disk)
         return TOHState(new_pegs)
@@ -4,19 +4,13 @@ import tkinter as tk
 import math
 import os
 
-from sa_pathfinding.algorithms.dijkstra.grid_optimized_dijkstra import GridOptimizedDijkstra
-from sa_pathfinding.algorithms.astar.grid_optimized_astar import GridOptimizedAstar
-from sa_pathfinding.algorithms.dijkstra.generic_dijkstra import GenericDijkstra
 from sa_pathfinding.environments.grids.octile_grid import StateNotValidError
-from sa_pathfinding.heuristics.grid_heuristic import ManhattanGridHeuristic
-from sa_pathfinding.heuristics.grid_heuristic import EuclideanGridHeuristic
-from sa_pathfinding.heuristics.grid_heuristic import OctileGridHeuristic
-from sa_pathfinding.algorithms.astar.generic_astar import GenericAstar
 from sa_pathfinding.environments.grids.generics.grid import GridState
 from sa_pathfinding.algorithms.generics.search_node import SearchNode
 from sa_pathfinding.environments.grids.octile_grid import OctileGrid
-from sa_pathfinding.algorithms.bfs.generic_bfs import GenericBFS
-from sa_pathfinding.algorithms.dfs.generic_dfs import GenericDFS
+from sa_pathfinding.registry import search_config
+from sa_pathfinding.registry import HEURISTICS
+from sa_pathfinding.registry import ALGORITHMS
 
 
 class AppFrame(ttk.Frame):
@@ -54,12 +48,11 @@ class AppFrame(ttk.Frame):
         self.label2 = ttk.Label(self, text="Search Algorithm:")
         self.label3 = ttk.Label(self, text='Heuristic:')
 
-        search_list = ['Generic A*', 'Grid Optimized A*', 'Generic Dijkstra', 'Grid Optomized Dijkstra', 'BFS', 'DFS']
+        search_list = ALGORITHMS.names()
         self.combo1 = ttk.Combobox(self, state='readonly', values=search_list)
         self.combo1.set(search_list[0])
 
-        self.heuristic_list = ['Octile Distance', 'Manhattan Distance',
-                               'Euclidean Distance']
+        self.heuristic_list = HEURISTICS.names()
         self.combo2 = ttk.Combobox(self, state='readonly',
                                    values=self.heuristic_list)
         self.combo2.set(self.heuristic_list[0])
@@ -308,23 +301,6 @@ class SearchVizApp(tk.Tk):
     def pressed_start(self) -> None:
         if self.start is None or self.goal is None:
             raise Exception('Search started without start / goal')
-        search = 'gas'
-        if self.app_frame.combo1.get() == 'Generic Dijkstra':
-            search = 'gd'
-        elif self.app_frame.combo1.get() == 'Grid Optimized Dijkstra':
-            search = 'god'
-        elif self.app_frame.combo1.get() == 'Grid Optimized A*':
-            search = 'goas'
-        elif self.app_frame.combo1.get() == 'BFS':
-            search = 'bfs'
-        elif self.app_frame.combo1.get() == 'DFS':
-            search = 'dfs'
-        
-        heuristic = OctileGridHeuristic()
-        if self.app_frame.combo2.get() == 'Manhattan Distance':
-            heuristic = ManhattanGridHeuristic()
-        elif self.app_frame.combo2.get() == 'Euclidean Distance':
-            heuristic = EuclideanGridHeuristic()
         if not self.env.is_valid(self.start.state):
             raise StateNotValidError(self.start.state)
         else:
@@ -333,38 +309,13 @@ class SearchVizApp(tk.Tk):
             raise StateNotValidError(self.goal.state)
         else:
             self.goal.state._valid = True
-        if search == 'gas':
-            self.search = GenericAstar(self.env,
-                                             start=self.start,
-                                             goal=self.goal,
-                                             heuristic=heuristic,
-                                             verbose=self.verbose)
-        elif search == 'gd':
-            self.search = GenericDijkstra(self.env,
-                                   start=self.start,
-                                   goal=self.goal,
-                                   verbose=self.verbose)
-        elif search == 'god':
-            self.search = GridOptimizedDijkstra(self.env,
-                                   start=self.start,
-                                   goal=self.goal,
-                                   verbose=self.verbose)
-        elif search == 'goas':
-            self.search = GridOptimizedAstar(self.env,
-                                   start=self.start,
-                                   goal=self.goal,
-                                   heuristic=heuristic,
-                                   verbose=self.verbose)
-        elif search == 'bfs':
-            self.search = GenericBFS(self.env,
-                                   start=self.start,
-                                   goal=self.goal,
-                                   verbose=self.verbose)
-        elif search == 'dfs':
-            self.search = GenericDFS(self.env,
-                                   start=self.start,
-                                   goal=self.goal,
-                                   verbose=self.verbose)
+        search_cls, kwargs = search_config(self.app_frame.combo1.get(),
+                                           self.app_frame.combo2.get())
+        self.search = search_cls(self.env,
+                                 start=self.start,
+                                 goal=self.goal,
+                                 verbose=self.verbose,
+                                 **kwargs)
         self.draw_initial()
         self.after(1000, self.draw_step)
 
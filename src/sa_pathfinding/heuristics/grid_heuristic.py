@@ -1,3 +1,4 @@
+from typing import Tuple
 import math
 
 from sa_pathfinding.environments.grids.generics.grid import GridState
@@ -5,9 +6,24 @@ from sa_pathfinding.heuristics.heuristic import Heuristic
 
 
 class GridHeuristic(Heuristic):
+    """ Base class of the grid heuristics.
 
-    def __init__(self):
+    Built with integer (cardinal, diagonal) move costs matching an
+    OctileGrid in fixed-point mode, the heuristics return exact integers
+    that never overestimate the integer path cost.
+    """
+
+    def __init__(self, costs: Tuple[int, int] = None):
         super().__init__()
+        self._costs = costs
+
+    @property
+    def costs(self) -> Tuple[int, int]:
+        return self._costs
+
+    @property
+    def integer_costs(self) -> bool:
+        return self._costs is not None
 
     def __str__(self):
         return super().__str__() + ', env: Grid'
@@ -23,8 +39,8 @@ class GridHeuristic(Heuristic):
 
 class OctileGridHeuristic(GridHeuristic):
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, costs: Tuple[int, int] = None):
+        super().__init__(costs)
         self._name = 'OCTILE'
 
     def __str__(self):
@@ -32,6 +48,10 @@ class OctileGridHeuristic(GridHeuristic):
 
     def get_cost(self, start: GridState, goal: GridState):
         super().get_cost(start, goal)
+        if self._costs is not None:
+            cardinal, diagonal = self._costs
+            return cardinal * max(abs(start.x - goal.x), abs(start.y - goal.y)) + \
+                (diagonal - cardinal) * min(abs(start.x - goal.x), abs(start.y - goal.y))
         return max(abs(start.x - goal.x), abs(start.y - goal.y)) + \
                (math.sqrt(2) - 1) * \
                min(abs(start.x - goal.x), abs(start.y - goal.y))
@@ -39,8 +59,8 @@ class OctileGridHeuristic(GridHeuristic):
 
 class ManhattanGridHeuristic(GridHeuristic):
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, costs: Tuple[int, int] = None):
+        super().__init__(costs)
         self._name = 'MANHATTAN'
 
     def __str__(self):
@@ -48,18 +68,26 @@ class ManhattanGridHeuristic(GridHeuristic):
 
     def get_cost(self, start: GridState, goal: GridState):
         super().get_cost(start, goal)
+        if self._costs is not None:
+            return self._costs[0] * (abs(start.x - goal.x) + abs(start.y - goal.y))
         return float(abs(start.x - goal.x) + abs(start.y - goal.y))
 
 
 class EuclideanGridHeuristic(GridHeuristic):
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, costs: Tuple[int, int] = None):
+        super().__init__(costs)
         self._name = 'EUCLIDEAN'
+        # cost per unit of straight-line distance; a diagonal cost rounded
+        # below cardinal * sqrt(2) (e.g. 1414/1000) lowers it
+        self._scale = None if costs is None else min(costs[0], costs[1] / math.sqrt(2))
 
     def __str__(self):
         return super().__str__()
 
     def get_cost(self, start: GridState, goal: GridState):
         super().get_cost(start, goal)
+        if self._costs is not None:
+            return math.floor(self._scale * math.sqrt((start.x - goal.x) ** 2 +
+                                                      (start.y - goal.y) ** 2))
         return math.sqrt((start.x - goal.x) ** 2 + (start.y - goal.y) ** 2)
@@ -1,4 +1,5 @@
 from abc import abstractmethod
+from typing import List
 from abc import ABC
 
 from sa_pathfinding.environments.generics.state import State
@@ -22,6 +23,12 @@ class Heuristic(ABC):
     def get_cost(self, node: State, goal: State):
         pass
 
+    def get_costs(self, states: List[State], goal: State) -> List[float]:
+        """Heuristic costs of several states to the same goal, e.g. all the
+        children of one expansion. Subclasses override this when they can
+        do better than one get_cost() call per state."""
+        return [self.get_cost(state, goal) for state in states]
+
 
 class ZeroHeuristic(Heuristic):
 
@@ -33,4 +40,5 @@ class ZeroHeuristic(Heuristic):
         return super().__str__()
 
     def get_cost(self, start: State = None, goal: State = None):
-        return 0.0
+        # an int keeps integer path costs integral
+        return 0
@@ -0,0 +1,123 @@
+from typing import Iterator
+from typing import Tuple
+from typing import Dict
+from typing import List
+
+from sa_pathfinding.environments.grids.generics.grid import GridState
+from sa_pathfinding.environments.generics.state import State
+from sa_pathfinding.heuristics.heuristic import Heuristic
+
+
+class MultiGoalHeuristic(Heuristic):
+    """Minimum of a base heuristic over a set of goals.
+
+    The goal passed to get_cost() is ignored, the estimate is always taken
+    against the closest of the goals the heuristic was built with. Values are
+    memoized per state, so re-generating a state (very common on grids) costs
+    a single dict lookup instead of a scan over every goal.
+    """
+
+    __slots__ = '_base _goals _table'.split()
+
+    def __init__(self, base: Heuristic, goals: List[State]):
+        super().__init__()
+        self._base = base
+        self._goals = list(goals)
+        self._table: Dict[State, float] = {}
+        self._name = f'MIN({base.name})'
+
+    @property
+    def base(self) -> Heuristic:
+        return self._base
+
+    @property
+    def goals(self) -> List[State]:
+        return self._goals
+
+    def get_cost(self, state: State, goal: State = None):
+        try:
+            return self._table[state]
+        except KeyError:
+            cost = self._min_cost(state)
+            self._table[state] = cost
+            return cost
+
+    def _min_cost(self, state: State) -> float:
+        return min(self._base.get_cost(state, goal) for goal in self._goals)
+
+
+class MultiGoalGridHeuristic(MultiGoalHeuristic):
+    """Minimum of a grid heuristic over a set of goals, using a spatial index.
+
+    Goals are bucketed into square cells of bucket_size x bucket_size. For a
+    query, buckets are visited in rings of growing Chebyshev distance around
+    the state's bucket, and the scan stops once the heuristic value of the
+    smallest offset a ring can have cannot beat the best goal found so far;
+    within a ring, buckets whose bounding box cannot beat it are skipped.
+    Only the buckets closer than the closest goal are looked at, rather
+    than every bucket. This is valid for the octile, manhattan and euclidean
+    grid heuristics, which never decrease as |dx| or |dy| grows.
+    """
+
+    __slots__ = '_bucket_size _buckets _extent'.split()
+
+    def __init__(self,
+                 base: Heuristic,
+                 goals: List[GridState],
+                 bucket_size: int = 8):
+        super().__init__(base, goals)
+        self._bucket_size = bucket_size
+        self._buckets: Dict[Tuple[int, int], List[GridState]] = {}
+        for goal in self._goals:
+            key = (goal.x // bucket_size, goal.y // bucket_size)
+            self._buckets.setdefault(key, []).append(goal)
+        # (min bx, max bx, min by, max by) of the buckets holding goals
+        self._extent = (min(bx for bx, _ in self._buckets), max(bx for bx, _ in self._buckets),
+                        min(by for _, by in self._buckets), max(by for _, by in self._buckets)) \
+            if self._buckets else None
+
+    def _ring(self, sx: int, sy: int, r: int) -> Iterator[Tuple[int, int]]:
+        # buckets at Chebyshev distance r of (sx, sy), within the extent
+        min_x, max_x, min_y, max_y = self._extent
+        xs = range(max(sx - r, min_x), min(sx + r, max_x) + 1)
+        for by in (sy - r, sy + r) if r > 0 else (sy,):
+            if min_y <= by <= max_y:
+                for bx in xs:
+                    yield bx, by
+        for bx in (sx - r, sx + r) if r > 0 else ():
+            if min_x <= bx <= max_x:
+                for by in range(max(sy - r + 1, min_y), min(sy + r - 1, max_y) + 1):
+                    yield bx, by
+
+    def _min_cost(self, state: GridState) -> float:
+        if self._extent is None:
+            return None
+        size = self._bucket_size
+        get_cost = self._base.get_cost
+        buckets = self._buckets
+        sx, sy = state.x // size, state.y // size
+        min_x, max_x, min_y, max_y = self._extent
+        rings = max(sx - min_x, max_x - sx, sy - min_y, max_y - sy)
+        best = None
+        for r in range(rings + 1):
+            if best is not None and r > 1:
+                # a bucket r rings away is at least this far along x or y
+                offset = (r - 1) * size + 1
+                if min(get_cost(state, GridState(state.x + offset, state.y)),
+                       get_cost(state, GridState(state.x, state.y + offset))) >= best:
+                    break
+            for bx, by in self._ring(sx, sy, r):
+                goals = buckets.get((bx, by))
+                if goals is None:
+                    continue
+                if best is not None:
+                    # closest point of the bucket's bounding box to the state
+                    nearest = GridState(min(max(state.x, bx * size), bx * size + size - 1),
+                                        min(max(state.y, by * size), by * size + size - 1))
+                    if get_cost(state, nearest) >= best:
+                        continue
+                for goal in goals:
+                    cost = get_cost(state, goal)
+                    if best is None or cost < best:
+                        best = cost
+        return best
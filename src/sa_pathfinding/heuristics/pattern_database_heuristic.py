@@ -0,0 +1,332 @@
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+from typing import Dict
+from typing import List
+import struct
+import mmap
+import os
+
+from sa_pathfinding.environments.towers_of_hanoi.compact_towers_of_hanoi import CompactTowersOfHanoi
+from sa_pathfinding.environments.towers_of_hanoi.compact_towers_of_hanoi import CompactTOHState
+from sa_pathfinding.environments.towers_of_hanoi.towers_of_hanoi import TowersOfHanoi
+from sa_pathfinding.environments.towers_of_hanoi.towers_of_hanoi import TOHState
+from sa_pathfinding.heuristics.heuristic import Heuristic
+
+"""pattern_database_heuristic Module
+
+This module contains pattern database (PDB) heuristics for the Towers of
+Hanoi.
+
+A pattern is a subset of the disks. Ignoring every other disk, the moves
+needed to bring the pattern's disks onto the goal peg are a lower bound on
+the moves needed to solve the whole puzzle. They are found for every
+placement of the pattern's disks at once, by a breadth-first search
+backwards from the goal, and kept in a table indexed by the rank of the
+placement, the same base-p number as CompactTOHState.
+
+Every move moves exactly one disk, so the costs of disjoint patterns can
+be added and stay admissible. Patterns that overlap can only be combined
+with max.
+
+Only the relative size of the disks matters to the number of moves, so a
+database for k disks serves every k disk pattern with the same number of
+pegs and goal peg. Databases can be saved to, and memory mapped from, a
+cache directory, so they are built once and shared between processes.
+
+Tables hold every placement, not one per class of placements that only
+differ by a permutation of the non-goal pegs: filling in the other members
+of a class costs more than the smaller search saves. The canonical states
+of a symmetric CompactTowersOfHanoi are looked up as they are, and cost
+the same as every state they stand for.
+
+The puzzle has many paths to every state, which IDA* expands again and
+again, so it only pays off with databases that are close to exact;
+HashedAstar detects them and is usually much faster.
+
+Example:
+    Solve 4 pegs and 12 disks with an 8 + 4 disk additive PDB::
+
+        toh = CompactTowersOfHanoi(4, 12, start_peg=0, goal_peg=3)
+        heuristic = TOHPatternDatabaseHeuristic(toh, pattern_size=8, cache_dir='pdbs')
+        path = HashedAstar(toh, heuristic, start=toh.start, goal=toh.goal).get_path()
+"""
+
+_MAGIC = b'SAPD'
+# magic, version, pegs, disks, goal peg
+_HEADER = struct.Struct('<4sHHHH')
+_UNSEEN = 255
+
+
+class PatternDatabase:
+    """ Moves needed to stack k disks on the goal peg, from every
+    placement of them on p pegs.
+
+    Moves are stored one byte each in a bytearray, or a read only memory
+    map when loaded from a file. Distances over 254 are stored as 254,
+    which keeps them admissible.
+
+    Attributes:
+        pegs (:obj:'int'): Number of pegs.
+        disks (:obj:'int'): Number of disks of the pattern.
+        goal_peg (:obj:'int'): Peg the disks are stacked on.
+    """
+
+    __slots__ = '_pegs _disks _goal_peg _table _mmap _filename'.split()
+
+    version = 1
+
+    def __init__(self,
+                 pegs: int,
+                 disks: int,
+                 goal_peg: int,
+                 table: Union[bytearray, memoryview],
+                 mapped: mmap.mmap = None,
+                 filename: str = None) -> None:
+        self._pegs = pegs
+        self._disks = disks
+        self._goal_peg = goal_peg
+        self._table = table
+        self._mmap = mapped
+        self._filename = filename
+
+    def __reduce__(self):
+        # a loaded database is mapped again by the process it is sent to,
+        # e.g. HashDistributedAstar's workers, instead of being copied
+        if self._mmap is not None:
+            return self.load, (self._filename,)
+        return self.__class__, (self._pegs, self._disks, self._goal_peg, self._table)
+
+    def __getitem__(self, rank: int) -> int:
+        return self._table[rank]
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    @property
+    def pegs(self) -> int:
+        return self._pegs
+
+    @property
+    def disks(self) -> int:
+        return self._disks
+
+    @property
+    def goal_peg(self) -> int:
+        return self._goal_peg
+
+    @property
+    def table(self) -> Union[bytearray, memoryview]:
+        return self._table
+
+    @classmethod
+    def build(cls, pegs: int, disks: int, goal_peg: int) -> 'PatternDatabase':
+        """Builds the database with a breadth-first search from the goal.
+
+        Moves are reversible, so the depth a placement is found at is its
+        distance to the goal.
+        """
+        env = CompactTowersOfHanoi(pegs, disks, start_peg=goal_peg, goal_peg=goal_peg)
+        successors = env.get_successor_codes
+        table = bytearray([_UNSEEN]) * env.size
+        goal = env.goal.code
+        table[goal] = 0
+        frontier = [goal]
+        depth = 0
+        while frontier:
+            depth = min(depth + 1, _UNSEEN - 1)
+            next_frontier = []
+            for code in frontier:
+                for child in successors(code):
+                    if table[child] == _UNSEEN:
+                        table[child] = depth
+                        next_frontier.append(child)
+            frontier = next_frontier
+        return cls(pegs, disks, goal_peg, table)
+
+    def save(self, filename: str) -> None:
+        """Writes the database to a file, through a temporary file so
+        readers never see a partial one."""
+        temporary = f'{filename}.{os.getpid()}.tmp'
+        with open(temporary, 'wb') as file:
+            file.write(_HEADER.pack(_MAGIC, self.version, self._pegs, self._disks,
+                                    self._goal_peg))
+            file.write(self._table)
+        os.replace(temporary, filename)
+
+    @classmethod
+    def load(cls, filename: str) -> 'PatternDatabase':
+        """Memory maps a database saved with save().
+
+        Raises:
+            OSError: if the file can not be read.
+            ValueError: if it is not a database of this version.
+        """
+        with open(filename, 'rb') as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(mapped) >= _HEADER.size:
+            magic, version, pegs, disks, goal_peg = _HEADER.unpack_from(mapped)
+            if magic == _MAGIC and version == cls.version and \
+                    len(mapped) == _HEADER.size + pegs ** disks:
+                return cls(pegs, disks, goal_peg, memoryview(mapped)[_HEADER.size:],
+                           mapped, filename)
+        mapped.close()
+        raise ValueError(f"{filename} is not a version {cls.version} pattern database.")
+
+    @classmethod
+    def cached(cls, pegs: int, disks: int, goal_peg: int, cache_dir: str) -> 'PatternDatabase':
+        """Loads the database from cache_dir, building and saving it there
+        first if it is missing or unreadable."""
+        filename = os.path.join(cache_dir, f'toh-{pegs}-{disks}-{goal_peg}.pdb')
+        try:
+            return cls.load(filename)
+        except (OSError, ValueError):
+            pass
+        database = cls.build(pegs, disks, goal_peg)
+        os.makedirs(cache_dir, exist_ok=True)
+        database.save(filename)
+        return database
+
+    def close(self) -> None:
+        """Unmaps a loaded database, it can not be used afterwards."""
+        if self._mmap is not None:
+            self._table.release()
+            self._mmap.close()
+            self._mmap = None
+
+
+class TOHPatternDatabaseHeuristic(Heuristic):
+    """ A Towers of Hanoi heuristic looked up in pattern databases.
+
+    Works on the states of both TowersOfHanoi and CompactTowersOfHanoi;
+    TOHStates are converted to their compact form first. Goals have to be
+    stacked states, databases are built, or loaded, for a goal peg when it
+    is first asked for.
+
+    Attributes:
+        patterns (:obj:'list' of :obj:'tuple'): The disks of every pattern.
+        combine (:obj:'str'): 'add' or 'max'.
+    """
+
+    __slots__ = '_compact _patterns _combine _cache_dir _databases ' \
+                '_goal_code _lookups'.split()
+
+    def __init__(self,
+                 env: TowersOfHanoi,
+                 patterns: Sequence[Sequence[int]] = None,
+                 combine: str = 'add',
+                 pattern_size: int = 8,
+                 cache_dir: str = None):
+        """TOHPatternDatabaseHeuristic __init__ method.
+
+        Args:
+            env (:obj:'TowersOfHanoi'): The puzzle, compact or not.
+            patterns (:obj:'list' of :obj:'list' of :obj:'int', optional):
+                Disks of every pattern, 1 being the smallest. By default
+                the disks are split into patterns of pattern_size disks,
+                the largest disks together.
+            combine (:obj:'str'): 'add' to sum the patterns' costs, which
+                must then be disjoint, or 'max' to take the largest.
+            pattern_size (:obj:'int'): Disks per pattern by default. A
+                pattern of k disks takes pegs ** k bytes.
+            cache_dir (:obj:'str', optional): Where databases are saved
+                and loaded from. They are only kept in memory by default.
+
+        Raises:
+            ValueError: for unknown disks, overlapping additive patterns
+                or an unknown combine.
+        """
+        super().__init__()
+        self._compact = env if isinstance(env, CompactTowersOfHanoi) \
+            else CompactTowersOfHanoi.from_environment(env)
+        disks = self._compact.num_disks
+        if patterns is None:
+            patterns = [range(max(top - pattern_size, 0) + 1, top + 1)
+                        for top in range(disks, 0, -pattern_size)]
+        self._patterns = [tuple(sorted(pattern)) for pattern in patterns]
+        if combine not in ('add', 'max'):
+            raise ValueError(f"combine must be 'add' or 'max', not {combine!r}.")
+        used = [disk for pattern in self._patterns for disk in pattern]
+        if any(not 1 <= disk <= disks for disk in used) or not all(self._patterns):
+            raise ValueError(f"Patterns must hold disks 1 to {disks}.")
+        if combine == 'add' and len(set(used)) != len(used):
+            raise ValueError("Additive patterns must be disjoint.")
+        self._combine = combine
+        self._cache_dir = cache_dir
+        self._databases: Dict[Tuple[int, int], PatternDatabase] = {}
+        self._goal_code = None
+        self._lookups: List[tuple] = None
+        self._name = f"PDB({combine.upper()} " \
+                     f"{'+'.join(str(len(pattern)) for pattern in self._patterns)})"
+
+    @property
+    def patterns(self) -> List[Tuple[int, ...]]:
+        return self._patterns
+
+    @property
+    def combine(self) -> str:
+        return self._combine
+
+    def database(self, disks: int, goal_peg: int) -> PatternDatabase:
+        """The database of a pattern size and goal peg, shared by every
+        pattern of that size."""
+        key = (disks, goal_peg)
+        if key not in self._databases:
+            pegs = self._compact.num_pegs
+            self._databases[key] = PatternDatabase.build(pegs, disks, goal_peg) \
+                if self._cache_dir is None \
+                else PatternDatabase.cached(pegs, disks, goal_peg, self._cache_dir)
+        return self._databases[key]
+
+    def _code(self, state: Union[TOHState, CompactTOHState]) -> int:
+        if isinstance(state, CompactTOHState):
+            return state.code
+        return self._compact.from_toh_state(state).code
+
+    def _set_goal(self, goal_code: int) -> None:
+        compact = self._compact
+        pegs = compact.num_pegs
+        # a stacked state has every digit equal: peg * 11...1 in base p
+        ones = (compact.size - 1) // (pegs - 1)
+        goal_peg, rest = divmod(goal_code, ones)
+        if rest != 0 or goal_peg >= pegs:
+            raise ValueError("Pattern databases only answer for stacked goals.")
+        # per pattern: (divisor, modulus, powers, table); a run of
+        # consecutive disks is a slice of the code's digits, other
+        # patterns are ranked digit by digit
+        lookups = []
+        for pattern in self._patterns:
+            table = self.database(len(pattern), goal_peg).table
+            if pattern[-1] - pattern[0] == len(pattern) - 1:
+                lookups.append((pegs ** (pattern[0] - 1), pegs ** len(pattern), None, table))
+            else:
+                powers = [(pegs ** (disk - 1), pegs ** i) for i, disk in enumerate(pattern)]
+                lookups.append((1, pegs, powers, table))
+        self._goal_code = goal_code
+        self._lookups = lookups
+
+    def _cost(self, code: int) -> int:
+        costs = []
+        for divisor, modulus, powers, table in self._lookups:
+            if powers is None:
+                costs.append(table[code // divisor % modulus])
+            else:
+                costs.append(table[sum(code // power % modulus * place
+                                       for power, place in powers)])
+        return sum(costs) if self._combine == 'add' else max(costs)
+
+    def get_cost(self, state: Union[TOHState, CompactTOHState],
+                 goal: Union[TOHState, CompactTOHState]) -> int:
+        goal_code = self._code(goal)
+        if goal_code != self._goal_code:
+            self._set_goal(goal_code)
+        return self._cost(self._code(state))
+
+    def get_costs(self, states: List[Union[TOHState, CompactTOHState]],
+                  goal: Union[TOHState, CompactTOHState]) -> List[int]:
+        goal_code = self._code(goal)
+        if goal_code != self._goal_code:
+            self._set_goal(goal_code)
+        cost = self._cost
+        code = self._code
+        return [cost(code(state)) for state in states]
@@ -0,0 +1,108 @@
+from collections import OrderedDict
+from array import array
+from typing import List
+
+from sa_pathfinding.heuristics.grid_heuristic import EuclideanGridHeuristic
+from sa_pathfinding.heuristics.grid_heuristic import ManhattanGridHeuristic
+from sa_pathfinding.heuristics.grid_heuristic import OctileGridHeuristic
+from sa_pathfinding.environments.grids.generics.grid import GridState
+from sa_pathfinding.heuristics.grid_heuristic import GridHeuristic
+from sa_pathfinding.environments.grids.generics.grid import Grid
+
+
+class TableGridHeuristic(GridHeuristic):
+    """A grid heuristic answered from per-goal lookup tables.
+
+    For each goal, the base heuristic's value for every cell is stored in a
+    flat array('d') indexed by y * width + x, so evaluating the heuristic is
+    one index. Tables are kept for the most recently used goals, so the
+    same instance can be shared by many searches to the same goals.
+
+    The octile, manhattan and euclidean heuristics only depend on |dx| and
+    |dy|, so a single width x height table of offsets is computed once; the
+    table for a goal is then assembled row by row from slices of it, which
+    copies memory instead of evaluating the heuristic in Python.
+
+    Integer-cost base heuristics are tabled in array('q').
+
+    Attributes:
+        base (:obj:'GridHeuristic'): The heuristic being tabled.
+        max_tables (:obj:'int'): Number of goal tables kept, each of
+            8 * width * height bytes.
+    """
+
+    __slots__ = '_base _width _height _max_tables _offsets _tables ' \
+                '_last_goal _last_table'.split()
+
+    def __init__(self,
+                 grid: Grid,
+                 base: GridHeuristic = None,
+                 max_tables: int = 8):
+        super().__init__()
+        self._base = OctileGridHeuristic() if base is None else base
+        if not isinstance(self._base, (OctileGridHeuristic,
+                                       ManhattanGridHeuristic,
+                                       EuclideanGridHeuristic)):
+            raise NotImplementedError(f'{self._base.name} heuristic can not be tabled.')
+        self._width = grid.width
+        self._height = grid.height
+        self._max_tables = max_tables
+        self._offsets: List[array] = None
+        self._tables: 'OrderedDict[tuple, array]' = OrderedDict()
+        self._last_goal = None
+        self._last_table = None
+        self._name = f'TABLE({self._base.name})'
+
+    def __str__(self):
+        return super().__str__()
+
+    @property
+    def base(self) -> GridHeuristic:
+        return self._base
+
+    @property
+    def max_tables(self) -> int:
+        return self._max_tables
+
+    def get_cost(self, start: GridState, goal: GridState):
+        return self._table(goal)[start.y * self._width + start.x]
+
+    def get_costs(self, states: List[GridState], goal: GridState) -> List[float]:
+        table = self._table(goal)
+        width = self._width
+        return [table[state.y * width + state.x] for state in states]
+
+    def _table(self, goal: GridState) -> array:
+        key = (goal.x, goal.y)
+        if key == self._last_goal:
+            return self._last_table
+        table = self._tables.get(key)
+        if table is None:
+            table = self._build_table(goal)
+            self._tables[key] = table
+            if len(self._tables) > self._max_tables:
+                self._tables.popitem(last=False)
+        else:
+            self._tables.move_to_end(key)
+        self._last_goal = key
+        self._last_table = table
+        return table
+
+    def _build_table(self, goal: GridState) -> array:
+        if not 0 <= goal.x < self._width or not 0 <= goal.y < self._height:
+            raise ValueError(f'goal {goal} is outside the {self._width}x{self._height} grid.')
+        if self._offsets is None:
+            # offsets[dy][dx] is the base heuristic between cells dx, dy apart
+            origin = GridState(0, 0)
+            typecode = 'q' if self._base.integer_costs else 'd'
+            self._offsets = [array(typecode, [self._base.get_cost(GridState(dx, dy), origin)
+                                         for dx in range(self._width)])
+                             for dy in range(self._height)]
+        table = array(self._offsets[0].typecode)
+        left, right = goal.x, self._width - goal.x
+        for y in range(self._height):
+            offsets = self._offsets[abs(y - goal.y)]
+            # columns left of the goal, walking away from it, then the rest
+            table += offsets[left:0:-1]
+            table += offsets[:right]
+        return table
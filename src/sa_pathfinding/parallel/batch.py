@@ -0,0 +1,349 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import wait
+from typing import NamedTuple
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+from typing import Tuple
+from typing import List
+from typing import Dict
+from typing import Any
+from array import array
+import collections
+import itertools
+import os
+
+from sa_pathfinding.environments.generics.env import StateDoesNotExistError
+from sa_pathfinding.environments.generics.env import StateNotValidError
+from sa_pathfinding.algorithms.generics.metrics import SearchMetrics
+from sa_pathfinding.environments.grids.generics.grid import GridState
+from sa_pathfinding.environments.generics.env import Environment
+from sa_pathfinding.environments.grids.generics.grid import Grid
+from sa_pathfinding.algorithms.generics.search import Search
+
+"""batch Module
+
+This module contains a batch query engine that runs many independent
+(start, goal) searches in parallel worker processes.
+
+For grids, the map's passability data is placed in a
+multiprocessing.shared_memory block once, and every worker builds its grid
+from that block instead of re-parsing the .map file or receiving a pickled
+copy of the environment. Other environments are pickled to each worker once,
+at pool start-up, as are grids on Python 3.7, which has no
+multiprocessing.shared_memory.
+
+Example:
+    Run a list of queries with grid-optimized A*::
+
+        queries = [(GridState(1, 2), GridState(40, 7)), ((3, 3), (12, 60))]
+        with BatchSearch(env, GridOptimizedAstar,
+                         heuristic=OctileGridHeuristic()) as batch:
+            for result in batch.run(queries):
+                print(result.index, result.cost, result.nodes_expanded)
+"""
+
+
+class QueryResult(NamedTuple):
+    """Compact, picklable outcome of one query.
+
+    For grids, start and goal are (x, y) tuples and path is a flat
+    array('i') of alternating x and y coordinates. For other environments
+    they are the states themselves and path is a list of states.
+
+    metrics is SearchMetrics.as_dict() of the search when the batch was
+    run with metrics=True. algorithm is the name a query picked from the
+    batch's algorithms, None for the default search.
+    """
+    index: int
+    start: Any
+    goal: Any
+    path: Any
+    cost: Optional[float]
+    nodes_expanded: int
+    success: bool
+    error: Optional[str] = None
+    metrics: Optional[Dict[str, float]] = None
+    algorithm: Optional[str] = None
+
+    def states(self) -> List[Any]:
+        """The path as a list of states, rebuilding GridStates for grids."""
+        if isinstance(self.path, array):
+            return [GridState(x, y, valid=True)
+                    for x, y in zip(self.path[0::2], self.path[1::2])]
+        return list(self.path)
+
+
+# per-process state set up by the pool initializer
+_worker_env: Optional[Environment] = None
+_worker_search: Optional[type] = None
+_worker_kwargs: dict = {}
+_worker_algorithms: dict = {}
+
+
+def _init_grid_worker(shm_name: str,
+                      grid_cls: type,
+                      width: int,
+                      height: int,
+                      map_type: str,
+                      search_cls: type,
+                      search_kwargs: dict,
+                      costs: tuple = None,
+                      algorithms: dict = None) -> None:
+    global _worker_env, _worker_search, _worker_kwargs, _worker_algorithms
+    from multiprocessing import shared_memory
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        _worker_env = grid_cls.from_bytes(shm.buf, width, height, map_type)
+    finally:
+        shm.close()
+    if costs is not None:
+        _worker_env.set_costs(*costs)
+    _worker_search = search_cls
+    _worker_kwargs = search_kwargs
+    _worker_algorithms = algorithms or {}
+
+
+def _has_shared_memory() -> bool:
+    # imported lazily, multiprocessing.shared_memory is new in Python 3.8
+    try:
+        from multiprocessing import shared_memory  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _init_env_worker(env: Environment,
+                     search_cls: type,
+                     search_kwargs: dict,
+                     algorithms: dict = None) -> None:
+    global _worker_env, _worker_search, _worker_kwargs, _worker_algorithms
+    _worker_env = env
+    _worker_search = search_cls
+    _worker_kwargs = search_kwargs
+    _worker_algorithms = algorithms or {}
+
+
+def _to_state(env: Environment, state: Any) -> Any:
+    if isinstance(env, Grid):
+        if not isinstance(state, GridState):
+            state = GridState(*state)
+        # searches expect grid states to carry their passability
+        return GridState(state.x, state.y, valid=env.is_valid(state))
+    return state
+
+
+def run_query(env: Environment,
+              search_cls: type,
+              search_kwargs: dict,
+              index: int,
+              start: Any,
+              goal: Any) -> QueryResult:
+    """Runs one query in this process, as the batch's workers do.
+
+    Invalid start or goal states are reported in the result's error
+    rather than raised.
+    """
+    is_grid = isinstance(env, Grid)
+    if search_kwargs.get('metrics') is True:
+        # every query counts into metrics of its own
+        search_kwargs = dict(search_kwargs, metrics=SearchMetrics())
+    try:
+        search: Search = search_cls(env,
+                                    start=_to_state(env, start),
+                                    goal=_to_state(env, goal),
+                                    **search_kwargs)
+    except (StateNotValidError, StateDoesNotExistError) as e:
+        return QueryResult(index, start, goal, array('i') if is_grid else [],
+                           None, 0, False, error=e.message)
+    path = search.get_path()
+    cost = env.get_path_cost(path) if len(path) > 0 else None
+    if is_grid:
+        compact = array('i')
+        for state in path:
+            compact.append(state.x)
+            compact.append(state.y)
+        path = compact
+        start = (search.start.x, search.start.y)
+        goal = (search.goal.x, search.goal.y)
+    metrics = search.metrics.as_dict() if search.metrics is not None else None
+    return QueryResult(index, start, goal, path, cost,
+                       search.nodes_expanded, len(search.path) > 0,
+                       metrics=metrics)
+
+
+def _run_named_query(env: Environment,
+                     search_cls: type,
+                     search_kwargs: dict,
+                     algorithms: dict,
+                     index: int,
+                     start: Any,
+                     goal: Any,
+                     algorithm: str = None) -> QueryResult:
+    if algorithm is None:
+        return run_query(env, search_cls, search_kwargs, index, start, goal)
+    if algorithm not in algorithms:
+        return QueryResult(index, start, goal, array('i') if isinstance(env, Grid) else [],
+                           None, 0, False, error=f"Unknown algorithm {algorithm!r}.",
+                           algorithm=algorithm)
+    return run_query(env, *algorithms[algorithm], index, start, goal)._replace(algorithm=algorithm)
+
+
+def _run_chunk(chunk: List[Tuple[int, Any, Any]]) -> List[QueryResult]:
+    return [_run_named_query(_worker_env, _worker_search, _worker_kwargs,
+                             _worker_algorithms, *query)
+            for query in chunk]
+
+
+class BatchSearch:
+    """ Runs batches of independent searches over one environment in parallel.
+
+    Queries are split into chunks of 'chunksize' and handed to a pool of
+    worker processes. At most 'max_pending' chunks are in flight at any
+    time, so iterators of any length can be consumed in constant memory.
+
+    With workers=0 the queries are run in the calling process, which is
+    useful for debugging and for comparing against the parallel throughput.
+
+    Queries may name one of 'algorithms' as a third element, to be run
+    with that search instead of search_cls.
+
+    Attributes:
+        env (:obj:'Environment'): The environment being searched.
+        search_cls (:obj:'type'): Search subclass each query is run with.
+        workers (:obj:'int'): Number of worker processes.
+    """
+
+    def __init__(self,
+                 env: Environment,
+                 search_cls: type,
+                 workers: int = None,
+                 chunksize: int = 16,
+                 max_pending: int = None,
+                 algorithms: Dict[str, Tuple[type, dict]] = None,
+                 **search_kwargs) -> None:
+        """BatchSearch __init__ method.
+
+        Args:
+            env (:obj:'Environment'): Environment being being searched.
+            search_cls (:obj:'type'): Search subclass to run, e.g.
+                GridOptimizedAstar or GenericBFS.
+            workers (:obj:'int', optional): Number of worker processes,
+                defaults to the number of CPUs.
+            chunksize (:obj:'int'): Queries sent to a worker at a time.
+            max_pending (:obj:'int', optional): Chunks in flight at a time,
+                defaults to 4 per worker.
+            algorithms (:obj:'dict', optional): Name to (search class,
+                kwargs) of the searches queries may pick by name.
+            **search_kwargs: Passed to every search_cls construction,
+                e.g. heuristic=OctileGridHeuristic(). metrics=True gives
+                every query its own SearchMetrics, returned as a dict in
+                QueryResult.metrics.
+        """
+        self._env = env
+        self._search_cls = search_cls
+        self._search_kwargs = search_kwargs
+        self._algorithms = algorithms or {}
+        self._workers = (os.cpu_count() or 1) if workers is None else workers
+        self._chunksize = max(1, chunksize)
+        self._max_pending = max_pending or 4 * max(1, self._workers)
+        self._shm = None
+        self._executor = None
+
+    def __enter__(self) -> 'BatchSearch':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    @property
+    def env(self) -> Environment:
+        return self._env
+
+    @property
+    def search_cls(self) -> type:
+        return self._search_cls
+
+    @property
+    def workers(self) -> int:
+        return self._workers
+
+    def start(self) -> None:
+        """Starts the worker pool. Called implicitly by run()."""
+        if self._executor is not None or self._workers == 0:
+            return
+        if isinstance(self._env, Grid) and _has_shared_memory():
+            from multiprocessing import shared_memory
+            data = self._env.to_bytes()
+            self._shm = shared_memory.SharedMemory(create=True, size=max(1, len(data)))
+            self._shm.buf[:len(data)] = data
+            initializer = _init_grid_worker
+            # integer move costs are not part of the passability data
+            costs = self._env.costs if getattr(self._env, 'integer_costs', False) else None
+            initargs = (self._shm.name, type(self._env), self._env.width,
+                        self._env.height, self._env.type, self._search_cls,
+                        self._search_kwargs, costs, self._algorithms)
+        else:
+            initializer = _init_env_worker
+            initargs = (self._env, self._search_cls, self._search_kwargs, self._algorithms)
+        self._executor = ProcessPoolExecutor(max_workers=self._workers,
+                                             initializer=initializer,
+                                             initargs=initargs)
+
+    def close(self) -> None:
+        """Shuts the worker pool down and releases the shared memory block."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def run(self,
+            queries: Iterable[Tuple[Any, Any]],
+            ordered: bool = True) -> Iterator[QueryResult]:
+        """Runs every (start, goal) query and yields a QueryResult for each.
+
+        For grids, start and goal may be GridStates or (x, y) tuples.
+        The iterable is consumed as the workers take queries, so it can
+        be a generator over a stream of any length.
+
+        Args:
+            queries: Iterable of (start, goal) pairs, or (start, goal,
+                algorithm name) triples.
+            ordered (:obj:'bool'): When True results are yielded in query
+                order, otherwise as soon as each chunk completes.
+        """
+        indexed = ((i,) + tuple(query) for i, query in enumerate(queries))
+        if self._workers == 0:
+            for query in indexed:
+                yield _run_named_query(self._env, self._search_cls, self._search_kwargs,
+                                       self._algorithms, *query)
+            return
+
+        self.start()
+        chunks = iter(lambda: list(itertools.islice(indexed, self._chunksize)), [])
+        pending = collections.deque()
+        for chunk in chunks:
+            pending.append(self._executor.submit(_run_chunk, chunk))
+            if len(pending) >= self._max_pending:
+                yield from self._collect(pending, ordered)
+        while len(pending) > 0:
+            yield from self._collect(pending, ordered)
+
+    def run_all(self, queries: Iterable[Tuple[Any, Any]]) -> List[QueryResult]:
+        """Runs every query and returns the results in query order."""
+        return list(self.run(queries))
+
+    @staticmethod
+    def _collect(pending: collections.deque, ordered: bool) -> Iterator[QueryResult]:
+        if ordered:
+            yield from pending.popleft().result()
+            return
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            pending.remove(future)
+            yield from future.result()
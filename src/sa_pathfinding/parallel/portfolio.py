@@ -0,0 +1,240 @@
+from typing import NamedTuple
+from typing import Optional
+from typing import Dict
+from typing import List
+from typing import Any
+import multiprocessing
+import queue
+import json
+import time
+import os
+
+from sa_pathfinding.environments.generics.env import Environment
+from sa_pathfinding.environments.generics.state import State
+
+"""portfolio Module
+
+This module contains a portfolio runner that races several configured
+searches for the same query in separate worker processes and keeps the
+first acceptable answer.
+
+Example:
+    Race grid A* against grid Dijkstra and remember who wins per map::
+
+        portfolio = Portfolio([
+            SearchConfig('grid-astar', GridOptimizedAstar,
+                         {'heuristic': OctileGridHeuristic()}),
+            SearchConfig('grid-dijkstra', GridOptimizedDijkstra),
+        ], stats=PortfolioStats('portfolio_stats.json'))
+        result = portfolio.run(env, start, goal, map_key='den403d')
+        print(result.winner, result.cost)
+"""
+
+
+class SearchConfig(NamedTuple):
+    """One entry of a portfolio: a search class and its keyword arguments.
+
+    optimal overrides the search class' own optimal flag, e.g. to declare
+    GenericBFS optimal on a unit-cost CardinalGrid.
+    """
+    name: str
+    search_cls: type
+    kwargs: Dict[str, Any] = {}
+    optimal: Optional[bool] = None
+
+    def is_optimal(self) -> bool:
+        return self.search_cls.optimal if self.optimal is None else self.optimal
+
+
+class PortfolioResult(NamedTuple):
+    winner: str
+    path: List[State]
+    cost: Optional[float]
+    nodes_expanded: int
+    elapsed: float
+    launched: List[str]
+
+
+class PortfolioStats:
+    """ Per-map win counts of portfolio entries.
+
+    Counts are kept as {map_key: {config_name: wins}} and, when a filename
+    is given, loaded from and saved to that JSON file.
+    """
+
+    def __init__(self, filename: str = None) -> None:
+        self._filename = filename
+        self._wins: Dict[str, Dict[str, int]] = {}
+        if filename is not None and os.path.exists(filename):
+            with open(filename, 'r') as file:
+                self._wins = json.load(file)
+
+    def record(self, map_key: str, winner: str) -> None:
+        wins = self._wins.setdefault(map_key, {})
+        wins[winner] = wins.get(winner, 0) + 1
+
+    def wins(self, map_key: str) -> Dict[str, int]:
+        return dict(self._wins.get(map_key, {}))
+
+    def races(self, map_key: str) -> int:
+        return sum(self._wins.get(map_key, {}).values())
+
+    def select(self,
+               map_key: str,
+               configs: List[SearchConfig],
+               top: int,
+               min_races: int = 10) -> List[SearchConfig]:
+        """Picks the 'top' configs with the most wins on a map.
+
+        Until 'min_races' races have been recorded for the map every config
+        is returned, so that each gets a chance to win.
+        """
+        if self.races(map_key) < min_races:
+            return list(configs)
+        wins = self._wins[map_key]
+        ranked = sorted(enumerate(configs),
+                        key=lambda item: (-wins.get(item[1].name, 0), item[0]))
+        return [config for _, config in ranked[:top]]
+
+    def save(self) -> None:
+        if self._filename is None:
+            raise ValueError('PortfolioStats has no filename to save to.')
+        tmp = self._filename + '.tmp'
+        with open(tmp, 'w') as file:
+            json.dump(self._wins, file, indent=2, sort_keys=True)
+        os.replace(tmp, self._filename)
+
+
+def _race(results: multiprocessing.Queue,
+          config: SearchConfig,
+          env: Environment,
+          start: State,
+          goal: State) -> None:
+    t1 = time.perf_counter()
+    try:
+        search = config.search_cls(env, start=start, goal=goal, **config.kwargs)
+        path = search.get_path()
+        cost = env.get_path_cost(path) if len(path) > 0 else None
+    except Exception as e:
+        results.put((config.name, None, None, 0, 0.0, repr(e)))
+        return
+    results.put((config.name, path, cost, search.nodes_expanded,
+                 time.perf_counter() - t1, None))
+
+
+class Portfolio:
+    """ Races a portfolio of searches on the same query in worker processes.
+
+    Each launched config runs in its own process. The first config to finish
+    whose result satisfies the optimality requirement wins, and the
+    remaining processes are terminated. Wins are recorded per map in a
+    PortfolioStats, and with 'launch_top' set the portfolio only launches
+    the configs that have won most often on that map once enough races have
+    been recorded.
+
+    Attributes:
+        configs (:obj:'list' of :obj:'SearchConfig'): The portfolio entries.
+        stats (:obj:'PortfolioStats'): Per-map win statistics.
+    """
+
+    def __init__(self,
+                 configs: List[SearchConfig],
+                 require_optimal: bool = True,
+                 stats: PortfolioStats = None,
+                 launch_top: int = None,
+                 min_races: int = 10) -> None:
+        """Portfolio __init__ method.
+
+        Args:
+            configs (:obj:'list' of :obj:'SearchConfig'): Searches to race.
+            require_optimal (:obj:'bool'): Only accept results of configs
+                that are optimal. Non-optimal configs are not launched.
+            stats (:obj:'PortfolioStats', optional): Where wins are recorded.
+            launch_top (:obj:'int', optional): Once a map has 'min_races'
+                recorded races, only launch this many of its best configs.
+            min_races (:obj:'int'): Races needed before launch_top applies.
+        """
+        if len(set(config.name for config in configs)) != len(configs):
+            raise ValueError('Portfolio config names must be unique.')
+        self._configs = list(configs)
+        self._require_optimal = require_optimal
+        self._stats = stats if stats is not None else PortfolioStats()
+        self._launch_top = launch_top
+        self._min_races = min_races
+
+    @property
+    def configs(self) -> List[SearchConfig]:
+        return self._configs
+
+    @property
+    def stats(self) -> PortfolioStats:
+        return self._stats
+
+    def _candidates(self, map_key: str) -> List[SearchConfig]:
+        configs = self._configs
+        if self._require_optimal:
+            configs = [config for config in configs if config.is_optimal()]
+        if len(configs) == 0:
+            raise ValueError('No config in the portfolio satisfies the '
+                             'optimality requirement.')
+        if self._launch_top is not None:
+            configs = self._stats.select(map_key, configs,
+                                         self._launch_top, self._min_races)
+        return configs
+
+    def run(self,
+            env: Environment,
+            start: State,
+            goal: State,
+            map_key: str = None,
+            timeout: float = None) -> PortfolioResult:
+        """Races the portfolio on one query.
+
+        Args:
+            env (:obj:'Environment'): Environment being being searched.
+            start (:obj:`State`): State to start search from.
+            goal (:obj:`State`): State to search to.
+            map_key (:obj:'str', optional): Key that win statistics are kept
+                under, defaults to the environment's class and str().
+            timeout (:obj:'float', optional): Seconds to wait for a winner.
+
+        Raises:
+            TimeoutError: if no config finished within the timeout.
+            RuntimeError: if every launched config failed.
+        """
+        if map_key is None:
+            map_key = f'{type(env).__name__}:{env}'
+        configs = self._candidates(map_key)
+        ctx = multiprocessing.get_context()
+        results = ctx.Queue()
+        t1 = time.perf_counter()
+        workers = [ctx.Process(target=_race,
+                               args=(results, config, env, start, goal),
+                               daemon=True)
+                   for config in configs]
+        for worker in workers:
+            worker.start()
+        errors = []
+        try:
+            while len(errors) < len(workers):
+                remaining = None if timeout is None \
+                    else max(0.0, timeout - (time.perf_counter() - t1))
+                try:
+                    name, path, cost, expanded, _, error = results.get(timeout=remaining)
+                except queue.Empty:
+                    raise TimeoutError(f'No portfolio config finished within {timeout}s.')
+                if error is not None:
+                    errors.append(f'{name}: {error}')
+                    continue
+                self._stats.record(map_key, name)
+                return PortfolioResult(name, path, cost, expanded,
+                                       time.perf_counter() - t1,
+                                       [config.name for config in configs])
+            raise RuntimeError('Every portfolio config failed: ' + '; '.join(errors))
+        finally:
+            for worker in workers:
+                if worker.is_alive():
+                    worker.terminate()
+            for worker in workers:
+                worker.join()
+            results.close()
@@ -0,0 +1,335 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import as_completed
+from typing import NamedTuple
+from typing import Callable
+from typing import Optional
+from typing import Tuple
+from typing import Dict
+from typing import List
+from abc import abstractmethod
+from array import array
+from abc import ABC
+import hashlib
+import struct
+import json
+import time
+import sys
+import os
+
+from sa_pathfinding.environments.grids.octile_grid import OctileGrid
+from sa_pathfinding.environments.grids.generics.grid import Grid
+
+"""compile Module
+
+This module builds per-map structures once, offline, and stores them as
+versioned artifacts in a cache directory, from which maps are then loaded
+without parsing the .map file or labelling components again.
+
+Every map gets a directory of its own in the cache, named after the map
+file and a hash of its absolute path, so maps with the same file name in
+different directories never share one, holding one file per artifact and a manifest.json with the SHA-1 of
+the map file and the version of every artifact. An artifact is up to date
+when both match, so changed maps and preprocessors whose version was
+raised are rebuilt and everything else is skipped. Artifacts and the
+manifest are written to a temporary file and renamed into place, and the
+manifest is rewritten after every artifact, so an interrupted compile
+leaves no partial files and resumes where it stopped.
+
+Artifact files start with a 14 byte header: b'SAPF', the artifact version
+(uint16), and the grid width and height (uint32), all little-endian.
+
+Example:
+    Compile the bundled maps on every core, then load one back::
+
+        reports = compile_maps(find_maps('data/maps'), 'compiled')
+        env = load_compiled('data/maps/small/den403d.map', 'compiled')
+"""
+
+MANIFEST = 'manifest.json'
+_MAGIC = b'SAPF'
+_HEADER = struct.Struct('<4sHII')
+
+
+class Preprocessor(ABC):
+    """ Builds one artifact of a map and applies it to a loaded grid.
+
+    Raise version whenever the artifact format or its contents change,
+    so existing artifacts are rebuilt.
+    """
+
+    name: str = None
+    version: int = 1
+
+    @abstractmethod
+    def build(self, env: Grid) -> bytes:
+        pass
+
+    @abstractmethod
+    def apply(self, env: Optional[Grid], data: memoryview, width: int, height: int,
+              manifest: dict, grid_cls: type) -> Grid:
+        """Returns env with the artifact applied, or a grid built from it
+        if env is None."""
+        pass
+
+
+class BitmapPreprocessor(Preprocessor):
+    """Passable cells packed 8 to a byte, row-major, first cell in the
+    most significant bit."""
+
+    name = 'bitmap'
+    version = 1
+
+    def build(self, env: Grid) -> bytes:
+        cells = env.to_bytes()
+        if len(cells) == 0:
+            return b''
+        bits = cells.translate(_TO_BITS)
+        bits += b'0' * (-len(bits) % 8)
+        return int(bits, 2).to_bytes(len(bits) // 8, 'big')
+
+    def apply(self, env: Optional[Grid], data: memoryview, width: int, height: int,
+              manifest: dict, grid_cls: type) -> Grid:
+        if env is not None:
+            return env
+        count = width * height
+        bits = bin(int.from_bytes(data, 'big'))[2:].zfill(len(data) * 8)[:count]
+        return grid_cls.from_bytes(bits.encode('ascii').translate(_FROM_BITS), width, height,
+                                   map_type=manifest.get('type', 'octile'))
+
+
+class ComponentsPreprocessor(Preprocessor):
+    """Connected-component label of every cell as little-endian uint32."""
+
+    name = 'components'
+    version = 1
+
+    def build(self, env: Grid) -> bytes:
+        labels = array('I', env.component_labels())
+        if sys.byteorder == 'big':
+            labels.byteswap()
+        return labels.tobytes()
+
+    def apply(self, env: Optional[Grid], data: memoryview, width: int, height: int,
+              manifest: dict, grid_cls: type) -> Grid:
+        if env is None:
+            return None
+        labels = array('I')
+        labels.frombytes(data)
+        if sys.byteorder == 'big':
+            labels.byteswap()
+        env.set_component_labels(labels)
+        return env
+
+
+_TO_BITS = bytes.maketrans(b'\x00\x01', b'01')
+_FROM_BITS = bytes.maketrans(b'01', b'\x00\x01')
+
+# in the order artifacts are applied when loading; the bitmap builds the grid
+PREPROCESSORS: Dict[str, Preprocessor] = {
+    'bitmap': BitmapPreprocessor(),
+    'components': ComponentsPreprocessor(),
+}
+
+
+class ArtifactReport(NamedTuple):
+    name: str
+    built: bool
+    time: float
+    nbytes: int
+
+
+class MapReport(NamedTuple):
+    """What compiling one map did. time covers reading and parsing the map
+    as well as building its artifacts."""
+    map: str
+    artifacts: List[ArtifactReport]
+    time: float
+    error: Optional[str] = None
+
+    @property
+    def built(self) -> int:
+        return sum(artifact.built for artifact in self.artifacts)
+
+
+def artifact_dir(map_filename: str, cache_dir: str) -> str:
+    """The cache directory of a map's artifacts."""
+    key = hashlib.sha1(os.path.abspath(map_filename).encode('utf-8')).hexdigest()[:12]
+    return os.path.join(cache_dir, f'{os.path.basename(map_filename)}-{key}')
+
+
+def _sha1(filename: str) -> str:
+    with open(filename, 'rb') as file:
+        return hashlib.sha1(file.read()).hexdigest()
+
+
+def _write_atomic(filename: str, data: bytes) -> None:
+    temporary = f'{filename}.{os.getpid()}.tmp'
+    with open(temporary, 'wb') as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, filename)
+
+
+def read_manifest(map_filename: str, cache_dir: str) -> Optional[dict]:
+    """The manifest of a map's artifacts, None if it was never compiled."""
+    filename = os.path.join(artifact_dir(map_filename, cache_dir), MANIFEST)
+    try:
+        with open(filename, 'r') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def _up_to_date(manifest: dict, directory: str, preprocessor: Preprocessor) -> bool:
+    entry = manifest['artifacts'].get(preprocessor.name)
+    return entry is not None and entry['version'] == preprocessor.version and \
+        os.path.exists(os.path.join(directory, entry['file']))
+
+
+def compile_map(map_filename: str,
+                cache_dir: str,
+                preprocessors: List[str] = None,
+                force: bool = False,
+                grid_cls: type = OctileGrid) -> MapReport:
+    """Builds the artifacts of one map that are missing or out of date.
+
+    Args:
+        map_filename (:obj:'str'): Path to a MovingAI .map file.
+        cache_dir (:obj:'str'): Where artifacts are written.
+        preprocessors (:obj:'list' of :obj:'str', optional): Names from
+            PREPROCESSORS, all of them by default.
+        force (:obj:'bool'): Rebuild artifacts that are up to date.
+        grid_cls (:obj:'type'): Grid class the map is loaded with.
+
+    Raises:
+        KeyError: for unknown preprocessor names.
+    """
+    t1 = time.perf_counter()
+    selected = [PREPROCESSORS[name] for name in (preprocessors or PREPROCESSORS)]
+    directory = artifact_dir(map_filename, cache_dir)
+    sha1 = _sha1(map_filename)
+    manifest = read_manifest(map_filename, cache_dir)
+    if manifest is None or manifest.get('source_sha1') != sha1:
+        manifest = {'map': os.path.abspath(map_filename), 'source_sha1': sha1, 'artifacts': {}}
+
+    env = None
+    reports = []
+    for preprocessor in selected:
+        entry = manifest['artifacts'].get(preprocessor.name)
+        if not force and _up_to_date(manifest, directory, preprocessor):
+            reports.append(ArtifactReport(preprocessor.name, False, 0.0, entry['bytes']))
+            continue
+        if env is None:
+            env = grid_cls(map_filename)
+            os.makedirs(directory, exist_ok=True)
+            manifest.update(width=env.width, height=env.height, type=env.type)
+        t2 = time.perf_counter()
+        data = _HEADER.pack(_MAGIC, preprocessor.version, env.width, env.height) + \
+            preprocessor.build(env)
+        filename = preprocessor.name + '.bin'
+        _write_atomic(os.path.join(directory, filename), data)
+        elapsed = time.perf_counter() - t2
+        manifest['artifacts'][preprocessor.name] = {'file': filename,
+                                                    'version': preprocessor.version,
+                                                    'bytes': len(data),
+                                                    'time': elapsed}
+        _write_atomic(os.path.join(directory, MANIFEST),
+                      json.dumps(manifest, indent=2).encode('utf-8'))
+        reports.append(ArtifactReport(preprocessor.name, True, elapsed, len(data)))
+    return MapReport(map_filename, reports, time.perf_counter() - t1)
+
+
+def _compile_one(map_filename: str, *args) -> MapReport:
+    # a map that fails is reported, not raised, so the others carry on
+    try:
+        return compile_map(map_filename, *args)
+    except (OSError, ValueError) as e:
+        return MapReport(map_filename, [], 0.0, error=str(e))
+
+
+def compile_maps(maps: List[str],
+                 cache_dir: str,
+                 preprocessors: List[str] = None,
+                 workers: int = None,
+                 force: bool = False,
+                 grid_cls: type = OctileGrid,
+                 progress: Callable[[MapReport], None] = None) -> List[MapReport]:
+    """Compiles many maps, in parallel over a process pool.
+
+    Args:
+        maps (:obj:'list' of :obj:'str'): Map files.
+        cache_dir (:obj:'str'): Where artifacts are written.
+        preprocessors (:obj:'list' of :obj:'str', optional): Names from
+            PREPROCESSORS, all of them by default.
+        workers (:obj:'int', optional): Worker processes, os.cpu_count()
+            by default, 0 to compile in this process.
+        force (:obj:'bool'): Rebuild artifacts that are up to date.
+        grid_cls (:obj:'type'): Grid class maps are loaded with.
+        progress (:obj:'callable', optional): Called with each map's
+            report as it completes.
+
+    Returns:
+        List[MapReport], in the order of maps. Maps that could not be read
+            have an error and no artifacts.
+    """
+    for name in preprocessors or ():
+        if name not in PREPROCESSORS:
+            raise KeyError(name)
+    args = (cache_dir, preprocessors, force, grid_cls)
+    workers = os.cpu_count() if workers is None else workers
+    reports: Dict[int, MapReport] = {}
+    if workers == 0 or len(maps) <= 1:
+        for index, map_filename in enumerate(maps):
+            reports[index] = _compile_one(map_filename, *args)
+            if progress is not None:
+                progress(reports[index])
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(maps))) as executor:
+            futures = {executor.submit(_compile_one, map_filename, *args): index
+                       for index, map_filename in enumerate(maps)}
+            for future in as_completed(futures):
+                reports[futures[future]] = future.result()
+                if progress is not None:
+                    progress(reports[futures[future]])
+    return [reports[index] for index in range(len(maps))]
+
+
+def _read_artifact(filename: str, version: int) -> Tuple[memoryview, int, int]:
+    with open(filename, 'rb') as file:
+        data = file.read()
+    if len(data) < _HEADER.size:
+        raise ValueError(f"{filename} is truncated.")
+    magic, artifact_version, width, height = _HEADER.unpack_from(data)
+    if magic != _MAGIC or artifact_version != version:
+        raise ValueError(f"{filename} is not a version {version} artifact.")
+    return memoryview(data)[_HEADER.size:], width, height
+
+
+def load_compiled(map_filename: str,
+                  cache_dir: str,
+                  grid_cls: type = OctileGrid) -> Grid:
+    """Loads a map with its up to date artifacts applied.
+
+    Falls back to parsing the map file when it has no bitmap artifact,
+    and skips artifacts that are missing, out of date or unreadable, so
+    a map always loads.
+    """
+    manifest = read_manifest(map_filename, cache_dir)
+    if manifest is None or manifest.get('source_sha1') != _sha1(map_filename):
+        return grid_cls(map_filename)
+    directory = artifact_dir(map_filename, cache_dir)
+    env = None
+    for preprocessor in PREPROCESSORS.values():
+        if not _up_to_date(manifest, directory, preprocessor):
+            continue
+        try:
+            data, width, height = _read_artifact(
+                os.path.join(directory, manifest['artifacts'][preprocessor.name]['file']),
+                preprocessor.version)
+            if env is None and preprocessor is not PREPROCESSORS['bitmap']:
+                env = grid_cls(map_filename)
+            env = preprocessor.apply(env, data, width, height, manifest, grid_cls)
+        except (OSError, ValueError):
+            continue
+    return grid_cls(map_filename) if env is None else env
@@ -0,0 +1,304 @@
+from collections.abc import Mapping
+from typing import Iterator
+from typing import Optional
+from typing import Union
+from typing import Tuple
+from typing import Dict
+from typing import List
+import importlib
+import inspect
+
+"""registry Module
+
+This module maps short names, such as 'grid-astar' or 'octile', to the
+search and heuristic classes of the package, for the command line app,
+the GUI and anything else that picks classes by name.
+
+Classes are registered as 'module:Class' strings and only imported when
+they are first looked up, so listing the names, or using one algorithm,
+does not import every other one.
+
+Entry points are only searched for when a name is not one of the
+package's own or when all names are listed.
+
+Built in names can be marked with the environments they are meant for.
+The grid commands of the app only offer the 'grid' algorithms: BFS and
+DFS detect no duplicates, so on a grid they can expand states forever.
+Names that are not marked, such as those of entry points, are offered
+for every environment.
+
+Other packages can add algorithms and heuristics through the
+'sa_pathfinding.algorithms' and 'sa_pathfinding.heuristics' entry point
+groups, e.g. in their setup.py::
+
+    entry_points={'sa_pathfinding.algorithms': ['jps = my_package.jps:JumpPointSearch']}
+
+Example:
+    Run the search and heuristic a user named::
+
+        search_cls, kwargs = search_config('grid-astar', 'octile')
+        path = search_cls(env, start=start, goal=goal, **kwargs).get_path()
+"""
+
+# environment of the grid maps the command line app and the server search
+GRID = 'grid'
+TOWERS_OF_HANOI = 'towers-of-hanoi'
+
+
+class Registry:
+    """ Names of classes, imported on first use.
+
+    Attributes:
+        kind (:obj:'str'): What the classes are, used in error messages.
+        group (:obj:'str'): Entry point group searched for more classes.
+    """
+
+    __slots__ = '_kind _group _targets _classes _discovered _environments'.split()
+
+    def __init__(self,
+                 kind: str,
+                 group: str,
+                 targets: Dict[str, str],
+                 environments: Dict[str, Tuple[str, ...]] = None) -> None:
+        self._kind = kind
+        self._group = group
+        # name -> 'module:Class', class or entry point
+        self._targets: Dict[str, object] = dict(targets)
+        self._classes: Dict[str, type] = {}
+        self._discovered = False
+        # name -> environments the class is meant for, every one if missing
+        self._environments: Dict[str, Tuple[str, ...]] = dict(environments or {})
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._targets or name in self._all()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names())
+
+    def __len__(self) -> int:
+        return len(self._all())
+
+    @property
+    def kind(self) -> str:
+        return self._kind
+
+    @property
+    def group(self) -> str:
+        return self._group
+
+    def names(self, environment: str = None) -> List[str]:
+        """Every registered name, built in ones first, without importing,
+        or only those meant for an environment."""
+        return [name for name in self._all()
+                if environment is None or self.supports(name, environment)]
+
+    def supports(self, name: str, environment: str) -> bool:
+        """False if the name is marked with environments other than this one."""
+        environments = self._environments.get(name)
+        return environments is None or environment in environments
+
+    def for_environment(self, environment: str) -> 'RegistryView':
+        """The names meant for an environment, as argparse choices or the
+        algorithms of SearchConfigs."""
+        return RegistryView(self, environment)
+
+    def register(self,
+                 name: str,
+                 target: Union[str, type],
+                 environments: Tuple[str, ...] = None) -> None:
+        """Adds or replaces a name, with a class or a 'module:Class' string,
+        and optionally the environments it is meant for."""
+        self._targets[name] = target
+        self._classes.pop(name, None)
+        if environments is None:
+            self._environments.pop(name, None)
+        else:
+            self._environments[name] = tuple(environments)
+
+    def get(self, name: str) -> type:
+        """Returns the class of a name, importing it if needed.
+
+        Raises:
+            KeyError: if the name is not registered.
+        """
+        cls = self._classes.get(name)
+        if cls is not None:
+            return cls
+        targets = self._targets if name in self._targets else self._all()
+        if name not in targets:
+            raise KeyError(f"Unknown {self._kind} {name!r}, expected one of "
+                           f"{', '.join(targets)}.")
+        target = targets[name]
+        if isinstance(target, str):
+            module, _, attribute = target.partition(':')
+            cls = getattr(importlib.import_module(module), attribute)
+        elif isinstance(target, type):
+            cls = target
+        else:
+            cls = target.load()
+        self._classes[name] = cls
+        return cls
+
+    def _all(self) -> Dict[str, object]:
+        # scanning the installed packages for entry points takes tens of
+        # milliseconds, so it is done once, and only when a name is not
+        # built in or all names are listed
+        if not self._discovered:
+            self._discovered = True
+            for entry_point in _entry_points(self._group):
+                self._targets.setdefault(entry_point.name, entry_point)
+        return self._targets
+
+
+class RegistryView:
+    """ The names of a Registry meant for one environment."""
+
+    __slots__ = '_registry _environment'.split()
+
+    def __init__(self, registry: Registry, environment: str) -> None:
+        self._registry = registry
+        self._environment = environment
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._registry and self._registry.supports(name, self._environment)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names())
+
+    def __len__(self) -> int:
+        return len(self.names())
+
+    @property
+    def environment(self) -> str:
+        return self._environment
+
+    def names(self) -> List[str]:
+        return self._registry.names(self._environment)
+
+    def get(self, name: str) -> type:
+        """Returns the class of a name, see Registry.get().
+
+        Raises:
+            KeyError: if the name is not registered for the environment.
+        """
+        if name in self._registry and name not in self:
+            raise KeyError(f"{self._registry.kind.capitalize()} {name!r} is not meant for "
+                           f"{self._environment}, expected one of {', '.join(self.names())}.")
+        return self._registry.get(name)
+
+
+def _entry_points(group: str) -> list:
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:  # Python 3.7
+        return []
+    found = entry_points()
+    if hasattr(found, 'select'):
+        return list(found.select(group=group))
+    return list(found.get(group, []))
+
+
+ALGORITHMS = Registry('algorithm', 'sa_pathfinding.algorithms', {
+    'astar': 'sa_pathfinding.algorithms.astar.generic_astar:GenericAstar',
+    'grid-astar': 'sa_pathfinding.algorithms.astar.grid_optimized_astar:GridOptimizedAstar',
+    'dijkstra': 'sa_pathfinding.algorithms.dijkstra.generic_dijkstra:GenericDijkstra',
+    'grid-dijkstra': 'sa_pathfinding.algorithms.dijkstra.grid_optimized_dijkstra:'
+                     'GridOptimizedDijkstra',
+    'bfs': 'sa_pathfinding.algorithms.bfs.generic_bfs:GenericBFS',
+    'dfs': 'sa_pathfinding.algorithms.dfs.generic_dfs:GenericDFS',
+    'idastar': 'sa_pathfinding.algorithms.astar.generic_idastar:GenericIDAstar',
+    'hashed-astar': 'sa_pathfinding.algorithms.astar.hashed_astar:HashedAstar',
+}, environments={
+    'astar': (GRID, TOWERS_OF_HANOI),
+    'grid-astar': (GRID,),
+    'dijkstra': (GRID, TOWERS_OF_HANOI),
+    'grid-dijkstra': (GRID,),
+    # no duplicate detection, only for small trees
+    'bfs': (),
+    'dfs': (),
+    # re-expands every transposition, exponential on grids
+    'idastar': (TOWERS_OF_HANOI,),
+    # BucketOpenList needs the integer move costs of the puzzle
+    'hashed-astar': (TOWERS_OF_HANOI,),
+})
+
+HEURISTICS = Registry('heuristic', 'sa_pathfinding.heuristics', {
+    'octile': 'sa_pathfinding.heuristics.grid_heuristic:OctileGridHeuristic',
+    'manhattan': 'sa_pathfinding.heuristics.grid_heuristic:ManhattanGridHeuristic',
+    'euclidean': 'sa_pathfinding.heuristics.grid_heuristic:EuclideanGridHeuristic',
+    'zero': 'sa_pathfinding.heuristics.heuristic:ZeroHeuristic',
+})
+
+
+def takes_heuristic(search_cls: type) -> bool:
+    """True if the search class is constructed with a heuristic."""
+    return 'heuristic' in inspect.signature(search_cls.__init__).parameters
+
+
+def search_config(algorithm: str, heuristic: Optional[str] = 'octile') -> Tuple[type, dict]:
+    """(search class, kwargs) of an algorithm name, with an instance of
+    the named heuristic in kwargs if the algorithm takes one."""
+    search_cls = ALGORITHMS.get(algorithm)
+    if heuristic is not None and takes_heuristic(search_cls):
+        return search_cls, {'heuristic': HEURISTICS.get(heuristic)()}
+    return search_cls, {}
+
+
+class SearchConfigs(Mapping):
+    """ search_config() of every algorithm name, built on first lookup.
+
+    A mapping of name to (search class, kwargs), as BatchSearch and
+    PathServer take, that only imports the algorithms actually used.
+    It contains, and iterates over, every registered name, or every name
+    meant for an environment.
+
+    Attributes:
+        heuristic (:obj:'str'): Heuristic name of the algorithms that
+            take one.
+        environment (:obj:'str'): Environment the names are limited to,
+            None for every name.
+        built (:obj:'list' of :obj:'str'): Names looked up so far.
+    """
+
+    def __init__(self,
+                 heuristic: Optional[str] = 'octile',
+                 environment: str = None,
+                 **kwargs) -> None:
+        """SearchConfigs __init__ method.
+
+        Args:
+            heuristic (:obj:'str', optional): Heuristic name given to the
+                algorithms that take one.
+            environment (:obj:'str', optional): Only offer the algorithms
+                meant for this environment, e.g. GRID.
+            **kwargs: Added to the kwargs of every algorithm.
+        """
+        self.heuristic = heuristic
+        self.environment = environment
+        self.kwargs = kwargs
+        self._configs: Dict[str, Tuple[type, dict]] = {}
+
+    def __getitem__(self, name: str) -> Tuple[type, dict]:
+        config = self._configs.get(name)
+        if config is None:
+            if name not in self:
+                raise KeyError(name)
+            search_cls, kwargs = search_config(name, self.heuristic)
+            config = self._configs[name] = search_cls, dict(kwargs, **self.kwargs)
+        return config
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._names()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names())
+
+    def __len__(self) -> int:
+        return len(self._names())
+
+    @property
+    def built(self) -> List[str]:
+        return list(self._configs)
+
+    def _names(self) -> Union[Registry, RegistryView]:
+        return ALGORITHMS if self.environment is None else ALGORITHMS.for_environment(self.environment)
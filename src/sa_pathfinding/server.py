@@ -0,0 +1,409 @@
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlparse
+from typing import Optional
+from typing import Tuple
+from typing import Dict
+from typing import List
+from typing import Any
+import socketserver
+import collections
+import threading
+import json
+import time
+import os
+
+from sa_pathfinding.caching.map_store import StoreStats
+from sa_pathfinding.caching.map_store import MapStats
+from sa_pathfinding.caching.map_store import MapStore
+from sa_pathfinding.benchmarks.runner import percentile
+from sa_pathfinding.parallel.batch import run_query
+
+"""server Module
+
+This module contains a long-running local path query server. Maps are
+loaded once, with their connected components, and stay in memory between
+requests, up to a memory budget (see MapStore), so a query costs one
+search instead of a process start, an import and a map parse.
+
+The server speaks HTTP/1.1 with JSON bodies, on localhost TCP or on a
+Unix socket:
+
+    GET  /health    {"status": "ok", ...}
+    GET  /metrics   request, query and latency counters
+    POST /path      {"map": "den403d.map", "start": [x, y], "goal": [x, y],
+                     "algorithm": "grid-astar"}
+
+Requests are handled in threads. With workers > 0 the searches run in a
+process pool, where every worker keeps its own loaded maps, so queries on
+different cores do not wait on each other.
+
+Example:
+    Serve the bundled maps on port 8400 with four search processes::
+
+        server = PathServer(['data/maps'], algorithms, default='grid-astar', workers=4)
+        server.serve(port=8400)
+"""
+
+# latencies kept for the percentiles on /metrics
+_LATENCY_WINDOW = 4096
+
+# per-process map store, in the server process and in each pool worker
+_store: Optional[MapStore] = None
+_worker_algorithms: Dict[str, Tuple[type, dict]] = {}
+
+
+class RequestError(Exception):
+    """Raised for requests the server cannot answer, with the HTTP status."""
+    def __init__(self, status: int, message: str):
+        self.status = status
+        self.message = message
+
+
+def _init_worker(map_paths: List[str],
+                 max_bytes: int,
+                 cache_dir: Optional[str],
+                 algorithms: Dict[str, Tuple[type, dict]],
+                 preload: bool) -> None:
+    global _store, _worker_algorithms
+    _store = MapStore(map_paths, max_bytes=max_bytes, cache_dir=cache_dir, components=True)
+    _worker_algorithms = algorithms
+    if preload:
+        _preload(_store)
+
+
+def _preload(store: MapStore) -> None:
+    # as many maps as fit the budget, the first ones given
+    for path in store.names.values():
+        store.get(path)
+        if store.stats.evictions > 0:
+            break
+
+
+def _search(path: str,
+            algorithm: str,
+            start: Tuple[int, int],
+            goal: Tuple[int, int],
+            algorithms: Dict[str, Tuple[type, dict]] = None,
+            store: MapStore = None) -> tuple:
+    """Runs one query on a map of this process's store.
+
+    Returns the response body, the process id, and the map's and the
+    whole store's stats.
+    """
+    store = _store if store is None else store
+    env = store.get(path)
+    search_cls, kwargs = (algorithms or _worker_algorithms)[algorithm]
+    t1 = time.perf_counter()
+    result = run_query(env, search_cls, kwargs, 0, start, goal)
+    response = {'success': result.success,
+                'cost': result.cost,
+                'nodes_expanded': result.nodes_expanded,
+                'elapsed': time.perf_counter() - t1,
+                'path': [[state.x, state.y] for state in result.states()]}
+    if result.error is not None:
+        response['error'] = result.error
+    # the server adds up the store figures of every process
+    return response, os.getpid(), store.stats_for(path), store.stats
+
+
+class _Stats:
+    # request counters, updated from the handler threads
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.requests = collections.Counter()
+        self.errors = 0
+        self.queries = collections.Counter()
+        self.latencies = collections.deque(maxlen=_LATENCY_WINDOW)
+        # latest map store figures of every process, by process id
+        self.stores: Dict[int, StoreStats] = {}
+        self.maps: Dict[Tuple[int, str], MapStats] = {}
+
+    def request(self, endpoint: str) -> None:
+        with self._lock:
+            self.requests[endpoint] += 1
+
+    def error(self) -> None:
+        with self._lock:
+            self.errors += 1
+
+    def query(self,
+              map_name: str,
+              latency: float,
+              pid: int,
+              map_stats: MapStats,
+              store_stats: StoreStats) -> None:
+        with self._lock:
+            self.queries[map_name] += 1
+            self.latencies.append(latency)
+            self.maps[(pid, map_name)] = map_stats
+            self.stores[pid] = store_stats
+
+    def resident(self) -> int:
+        with self._lock:
+            return sum(stats.maps for stats in self.stores.values())
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = list(self.latencies)
+            store = [sum(column) for column in zip(*self.stores.values())] or [0] * 6
+            maps: Dict[str, Dict[str, Any]] = {}
+            for (_, map_name), stats in sorted(self.maps.items()):
+                counts = maps.setdefault(map_name, dict.fromkeys(
+                    ('hits', 'misses', 'reloads', 'evictions', 'resident', 'nbytes'), 0))
+                for field in counts:
+                    counts[field] += getattr(stats, field)
+            return {'uptime': time.time() - self.started,
+                    'requests': dict(self.requests),
+                    'errors': self.errors,
+                    'queries': sum(self.queries.values()),
+                    'queries_per_map': dict(self.queries),
+                    'latency_ms': {f'p{q}': percentile(latencies, q) * 1000 if latencies else None
+                                   for q in (50, 90, 99)},
+                    'store': dict(zip(StoreStats._fields, store),
+                                  hit_rate=StoreStats(*store).hit_rate),
+                    'maps': maps}
+
+
+class PathServer:
+    """ Answers path queries over HTTP on localhost or a Unix socket.
+
+    Maps are found by file name (with or without '.map') under the given
+    map directories, and only those maps can be queried. Loaded maps are
+    kept in a MapStore per process, so a worker's maps stay within
+    max_bytes.
+
+    Attributes:
+        maps (:obj:'dict'): Map name to file path of every servable map.
+        workers (:obj:'int'): Search processes, 0 to search in the
+            request threads.
+        address: The bound (host, port) or Unix socket path, once started.
+    """
+
+    def __init__(self,
+                 map_paths: List[str],
+                 algorithms: Dict[str, Tuple[type, dict]],
+                 default: str,
+                 workers: int = 0,
+                 max_bytes: int = 512 * 2**20,
+                 cache_dir: str = None,
+                 preload: bool = False,
+                 verbose: bool = False) -> None:
+        """PathServer __init__ method.
+
+        Args:
+            map_paths (:obj:'list' of :obj:'str'): Map files, or
+                directories searched for *.map files.
+            algorithms (:obj:'dict'): Name to (search class, kwargs) of the
+                searches requests may pick.
+            default (:obj:'str'): Algorithm of requests that do not name one.
+            workers (:obj:'int'): Search processes, 0 to search in the
+                request threads.
+            max_bytes (:obj:'int'): Memory budget of the loaded maps, per
+                search process.
+            cache_dir (:obj:'str', optional): Directory of compiled map
+                artifacts to load maps from, see preprocessing.compile.
+            preload (:obj:'bool'): Load maps at start-up, as many as fit
+                max_bytes, rather than on their first query.
+            verbose (:obj:'bool'): Log every request to stderr.
+        """
+        if default not in algorithms:
+            raise ValueError(f"Default algorithm {default!r} is not one of {sorted(algorithms)}.")
+        self._map_paths = list(map_paths)
+        self._max_bytes = max_bytes
+        self._cache_dir = cache_dir
+        # labels are built under the store's lock, not by the first
+        # request threads to use a map
+        self._store = MapStore(self._map_paths, max_bytes=max_bytes, cache_dir=cache_dir,
+                               components=True)
+        self._algorithms = algorithms
+        self._default = default
+        self._workers = workers
+        self._preload = preload
+        self._verbose = verbose
+        self._stats = _Stats()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._httpd: Optional[socketserver.BaseServer] = None
+        self._unix_socket: Optional[str] = None
+
+    @property
+    def maps(self) -> Dict[str, str]:
+        return self._store.names
+
+    @property
+    def store(self) -> MapStore:
+        """The map store of searches run in the request threads."""
+        return self._store
+
+    @property
+    def workers(self) -> int:
+        return self._workers
+
+    @property
+    def address(self):
+        return None if self._httpd is None else self._httpd.server_address
+
+    def start(self,
+              host: str = '127.0.0.1',
+              port: int = 8400,
+              unix_socket: str = None) -> None:
+        """Binds the socket and starts the worker pool, without serving yet."""
+        if self._workers > 0:
+            self._executor = ProcessPoolExecutor(max_workers=self._workers,
+                                                 initializer=_init_worker,
+                                                 initargs=(self._map_paths, self._max_bytes,
+                                                           self._cache_dir, self._algorithms,
+                                                           self._preload))
+        elif self._preload:
+            _preload(self._store)
+        handler = _handler(self)
+        if unix_socket is not None:
+            if os.path.exists(unix_socket):
+                os.unlink(unix_socket)
+            self._httpd = _UnixHTTPServer(unix_socket, handler)
+            self._unix_socket = unix_socket
+        else:
+            self._httpd = ThreadingHTTPServer((host, port), handler)
+        self._httpd.daemon_threads = True
+
+    def serve(self,
+              host: str = '127.0.0.1',
+              port: int = 8400,
+              unix_socket: str = None) -> None:
+        """Serves until interrupted, then shuts down."""
+        if self._httpd is None:
+            self.start(host, port, unix_socket)
+        try:
+            self._httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def shutdown(self) -> None:
+        """Stops serve() from another thread."""
+        if self._httpd is not None:
+            self._httpd.shutdown()
+
+    def close(self) -> None:
+        if self._httpd is not None:
+            self._httpd.server_close()
+            self._httpd = None
+        if self._unix_socket is not None and os.path.exists(self._unix_socket):
+            os.unlink(self._unix_socket)
+            self._unix_socket = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def health(self) -> Dict[str, Any]:
+        return {'status': 'ok',
+                'maps': len(self.maps),
+                'loaded': self._stats.resident() if self._workers > 0 else len(self._store),
+                'workers': self._workers,
+                'algorithms': sorted(self._algorithms)}
+
+    def metrics(self) -> Dict[str, Any]:
+        return self._stats.as_dict()
+
+    def path(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Answers a /path request body.
+
+        Raises:
+            RequestError: for malformed requests and unknown maps or
+                algorithms.
+        """
+        if not isinstance(body, dict):
+            raise RequestError(400, "Expected a JSON object.")
+        map_name = str(body.get('map', ''))
+        path = self.maps.get(map_name) or self.maps.get(map_name + '.map')
+        if path is None:
+            raise RequestError(404, f"Unknown map {map_name!r}.")
+        algorithm = body.get('algorithm') or self._default
+        if algorithm not in self._algorithms:
+            raise RequestError(400, f"Unknown algorithm {algorithm!r}.")
+        start, goal = body.get('start'), body.get('goal')
+        # JSON floats are not truncated into cells, nor booleans taken as 0/1
+        if not all(isinstance(point, list) and len(point) == 2 and
+                   all(type(v) is int for v in point) for point in (start, goal)):
+            raise RequestError(400, "start and goal must be [x, y] pairs of integers.")
+        start, goal = tuple(start), tuple(goal)
+
+        t1 = time.perf_counter()
+        if self._executor is None:
+            result, *stats = _search(path, algorithm, start, goal, self._algorithms, self._store)
+        else:
+            result, *stats = self._executor.submit(_search, path, algorithm, start, goal).result()
+        self._stats.query(os.path.basename(path), time.perf_counter() - t1, *stats)
+        result.update({'map': os.path.basename(path), 'algorithm': algorithm,
+                       'start': list(start), 'goal': list(goal)})
+        return result
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def _handler(app: PathServer) -> type:
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def address_string(self) -> str:
+            # Unix socket clients have no address
+            return self.client_address[0] if isinstance(self.client_address, tuple) else 'unix'
+
+        def log_message(self, format: str, *args) -> None:
+            if app._verbose:
+                super().log_message(format, *args)
+
+        def _send(self, status: int, body: Dict[str, Any]) -> None:
+            data = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self) -> None:
+            endpoint = urlparse(self.path).path
+            app._stats.request(endpoint)
+            if endpoint == '/health':
+                self._send(200, app.health())
+            elif endpoint == '/metrics':
+                self._send(200, app.metrics())
+            else:
+                app._stats.error()
+                self._send(404, {'error': f"No endpoint {endpoint}."})
+
+        def do_POST(self) -> None:
+            endpoint = urlparse(self.path).path
+            app._stats.request(endpoint)
+            length = int(self.headers.get('Content-Length') or 0)
+            data = self.rfile.read(length)
+            if endpoint != '/path':
+                app._stats.error()
+                self._send(404, {'error': f"No endpoint {endpoint}."})
+                return
+            try:
+                body = json.loads(data or b'null')
+            except ValueError:
+                app._stats.error()
+                self._send(400, {'error': "Body is not valid JSON."})
+                return
+            try:
+                status, response = 200, app.path(body)
+            except RequestError as e:
+                status, response = e.status, {'error': e.message}
+            except Exception as e:
+                # e.g. a map file deleted while served, or a broken pool;
+                # the client still gets an answer
+                status, response = 500, {'error': f"{type(e).__name__}: {e}"}
+            if status != 200:
+                app._stats.error()
+            self._send(status, response)
+
+    return Handler
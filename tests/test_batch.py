@@ -0,0 +1,66 @@
+import os
+
+from sa_pathfinding.algorithms.dijkstra.grid_optimized_dijkstra import GridOptimizedDijkstra
+from sa_pathfinding.algorithms.astar.grid_optimized_astar import GridOptimizedAstar
+from sa_pathfinding.environments.towers_of_hanoi.towers_of_hanoi import TowersOfHanoi
+from sa_pathfinding.heuristics.grid_heuristic import OctileGridHeuristic
+from sa_pathfinding.environments.grids.generics.grid import GridState
+from sa_pathfinding.environments.grids.octile_grid import OctileGrid
+from sa_pathfinding.algorithms.bfs.generic_bfs import GenericBFS
+from sa_pathfinding.parallel.batch import BatchSearch
+
+env = OctileGrid(os.path.join(os.path.dirname(os.path.dirname(__file__)) + '/data/maps/small/den403d.map'))
+
+
+def test_grid_round_trip_bytes():
+    copy = OctileGrid.from_bytes(env.to_bytes(), env.width, env.height)
+    assert copy.to_bytes() == env.to_bytes()
+    assert copy.is_valid(GridState(18, 10))
+    assert not copy.is_valid(GridState(18, 9))
+
+
+def test_parallel_matches_serial():
+    """Worker results must match in-process results, in query order."""
+    queries = [(env.get_random(valid=True), env.get_random(valid=True)) for _ in range(12)]
+    queries.append(((18, 24), (19, 24)))
+    with BatchSearch(env, GridOptimizedAstar, workers=0,
+                     heuristic=OctileGridHeuristic()) as batch:
+        serial = batch.run_all(queries)
+    with BatchSearch(env, GridOptimizedAstar, workers=2, chunksize=3,
+                     heuristic=OctileGridHeuristic()) as batch:
+        parallel = batch.run_all(queries)
+    assert [r.index for r in parallel] == list(range(len(queries)))
+    for a, b in zip(serial, parallel):
+        assert a.cost == b.cost
+        assert list(a.path) == list(b.path)
+    assert parallel[-1].cost == 1
+    assert parallel[-1].states() == [GridState(18, 24), GridState(19, 24)]
+
+
+def test_invalid_query_is_reported():
+    with BatchSearch(env, GenericBFS, workers=1) as batch:
+        result, = batch.run_all([((18, 9), (19, 24))])
+    assert not result.success
+    assert result.error is not None
+
+
+def test_generic_environment_unordered():
+    toh = TowersOfHanoi(3, 3, start_peg=0, goal_peg=2)
+    queries = [(toh.start, toh.goal), (toh.goal, toh.start)]
+    with BatchSearch(toh, GenericBFS, workers=2, chunksize=1) as batch:
+        results = sorted(batch.run(queries, ordered=False))
+    assert [r.cost for r in results] == [7, 7]
+
+
+def test_queries_pick_algorithms():
+    """A third query element picks one of the batch's named algorithms"""
+    queries = [((18, 24), (30, 24)), ((18, 24), (30, 24), 'dijkstra'), ((18, 24), (30, 24), 'nope')]
+    for workers in (0, 1):
+        with BatchSearch(env, GridOptimizedAstar, workers=workers,
+                         algorithms={'dijkstra': (GridOptimizedDijkstra, {})},
+                         heuristic=OctileGridHeuristic()) as batch:
+            default, dijkstra, unknown = batch.run_all(queries)
+        assert default.algorithm is None and dijkstra.algorithm == 'dijkstra'
+        assert default.cost == dijkstra.cost
+        assert dijkstra.nodes_expanded > default.nodes_expanded
+        assert not unknown.success and 'nope' in unknown.error
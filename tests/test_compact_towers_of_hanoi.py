@@ -0,0 +1,113 @@
+import itertools
+
+from sa_pathfinding.environments.towers_of_hanoi.compact_towers_of_hanoi import CompactTowersOfHanoi
+from sa_pathfinding.environments.towers_of_hanoi.compact_towers_of_hanoi import CompactTOHState
+from sa_pathfinding.environments.towers_of_hanoi.towers_of_hanoi import TowersOfHanoi
+from sa_pathfinding.environments.towers_of_hanoi.towers_of_hanoi import TOHAction
+from sa_pathfinding.environments.towers_of_hanoi.towers_of_hanoi import TOHState
+from sa_pathfinding.algorithms.dijkstra.generic_dijkstra import GenericDijkstra
+from sa_pathfinding.heuristics.pattern_database_heuristic import TOHPatternDatabaseHeuristic
+from sa_pathfinding.environments.generics.env import StateDoesNotExistError
+from sa_pathfinding.algorithms.astar.hashed_astar import HashedAstar
+from sa_pathfinding.heuristics.heuristic import ZeroHeuristic
+from sa_pathfinding.algorithms.bfs.generic_bfs import GenericBFS
+
+
+def test_rank_round_trips_every_state():
+    env = CompactTowersOfHanoi(3, 4, start_peg=0, goal_peg=2)
+    toh = TowersOfHanoi(3, 4, start_peg=0, goal_peg=2)
+    states = set()
+    for rank in range(env.size):
+        state = env.unrank(rank)
+        pegs = env.to_toh_state(state)
+        assert toh.is_valid(pegs)
+        assert env.from_toh_state(pegs) == state and env.rank(state) == rank
+        assert env.tops(state) == pegs.tops
+        states.add(pegs)
+    assert len(states) == 3 ** 4
+    assert env.to_toh_state(env.start) == toh.start
+    assert env.to_toh_state(env.goal) == toh.goal
+
+
+def test_actions_match_towers_of_hanoi():
+    env = CompactTowersOfHanoi(4, 5, start_peg=0, goal_peg=3)
+    toh = TowersOfHanoi(4, 5, start_peg=0, goal_peg=3)
+    for _ in range(50):
+        state = env.get_random()
+        pegs = env.to_toh_state(state)
+        expected = sorted(repr(toh.apply_action(pegs, a)) for a, _ in toh.get_actions(pegs, None))
+        children = [env.apply_action(state, a) for a, _ in env.get_actions(state, None)]
+        assert sorted(repr(env.to_toh_state(c)) for c in children) == expected
+        for action, _ in toh.get_actions(pegs, None):
+            # plain actions find the disk to move themselves
+            assert env.is_action_valid(state, action)
+            assert env.to_toh_state(env.apply_action(state, action)) == \
+                toh.apply_action(pegs, action)
+
+
+def test_invalid_states_and_actions():
+    env = CompactTowersOfHanoi(3, 3, start_peg=0, goal_peg=2)
+    assert not env.is_defined(CompactTOHState(27)) and env.is_valid(CompactTOHState(26))
+    assert not env.is_action_valid(env.start, TOHAction(1, 2))
+    assert not env.is_action_valid(CompactTOHState(1), TOHAction(0, 1))
+    for pegs in ([[3, 2], [], []], [[3, 1, 2], [], []], [[3, 2], [], [4]], [[3, 2, 1], []],
+                 [[3, 2, 1], [1], []], [[3, 2, 1], [2], []]):
+        try:
+            env.from_toh_state(TOHState(pegs))
+            assert False
+        except StateDoesNotExistError:
+            pass
+
+
+def test_searches_run_on_the_compact_form():
+    # GenericBFS does not detect duplicates, so it only gets a small instance
+    for search_cls, pegs, disks, length in ((GenericBFS, 3, 3, 7),
+                                            (GenericDijkstra, 3, 4, 15),
+                                            (GenericDijkstra, 4, 5, 13)):
+        toh = TowersOfHanoi(pegs, disks, start_peg=0, goal_peg=pegs - 1)
+        env = CompactTowersOfHanoi.from_environment(toh)
+        path = search_cls(env, start=env.start, goal=env.goal).get_path()
+        assert len(path) - 1 == length
+        assert toh.get_path_cost([env.to_toh_state(state) for state in path]) == length
+
+
+def test_canonical_states_are_one_per_symmetry_class():
+    env = CompactTowersOfHanoi(5, 3, start_peg=1, goal_peg=3, symmetric=True)
+    free = (0, 2, 4)
+    for code in range(env.size):
+        pegs = [code // 5 ** d % 5 for d in range(3)]
+        variants = set()
+        for permutation in itertools.permutations(free):
+            relabel = dict(zip(free, permutation))
+            variants.add(sum(relabel.get(peg, peg) * 5 ** d for d, peg in enumerate(pegs)))
+        canonical = {env.canonical(CompactTOHState(variant)) for variant in variants}
+        assert len(canonical) == 1 and canonical.pop().code in variants
+    assert env.canonical(env.start) == env.start and env.canonical(env.goal) == env.goal
+
+
+def test_symmetric_searches_return_concrete_moves():
+    for pegs, disks, length in ((4, 6, 17), (5, 6, 15)):
+        plain = CompactTowersOfHanoi(pegs, disks, start_peg=0, goal_peg=pegs - 1)
+        env = CompactTowersOfHanoi(pegs, disks, start_peg=0, goal_peg=pegs - 1, symmetric=True)
+        expanded = []
+        for search_env in (plain, env):
+            search = HashedAstar(search_env, ZeroHeuristic(), start=env.start, goal=env.goal)
+            path = search.get_path()
+            assert plain.get_path_cost(path) == length and path[-1] == env.goal
+            expanded.append(search.nodes_expanded)
+        assert expanded[1] < expanded[0]
+
+        heuristic = TOHPatternDatabaseHeuristic(env, pattern_size=4)
+        state = plain.unrank(1234)
+        assert heuristic.get_cost(env.canonical(state), env.goal) == \
+            heuristic.get_cost(state, env.goal)
+
+    toh = TowersOfHanoi(4, 4, start_peg=0, goal_peg=3)
+    env = CompactTowersOfHanoi.from_environment(toh, symmetric=True)
+    path = GenericDijkstra(env, start=env.start, goal=env.goal).get_path()
+    assert toh.get_path_cost([env.to_toh_state(state) for state in path]) == 9
+    try:
+        env.concrete_path([env.start, env.goal])
+        assert False
+    except ValueError:
+        pass
@@ -0,0 +1,117 @@
+import tempfile
+import shutil
+import json
+import os
+
+from sa_pathfinding.preprocessing.compile import ComponentsPreprocessor
+from sa_pathfinding.environments.grids.generics.grid import GridState
+from sa_pathfinding.environments.grids.octile_grid import OctileGrid
+from sa_pathfinding.preprocessing.compile import PREPROCESSORS
+from sa_pathfinding.preprocessing.compile import load_compiled
+from sa_pathfinding.preprocessing.compile import read_manifest
+from sa_pathfinding.preprocessing.compile import artifact_dir
+from sa_pathfinding.preprocessing.compile import compile_maps
+from sa_pathfinding.preprocessing.compile import compile_map
+from sa_pathfinding.caching.map_store import MapStore
+
+MAPS = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data/maps/small')
+MAP = os.path.join(MAPS, 'den403d.map')
+
+
+def test_compiled_map_loads_the_same():
+    with tempfile.TemporaryDirectory() as cache:
+        report = compile_map(MAP, cache)
+        assert [artifact.name for artifact in report.artifacts] == list(PREPROCESSORS)
+        assert report.built == len(PREPROCESSORS)
+        env, compiled = OctileGrid(MAP), load_compiled(MAP, cache)
+        assert isinstance(compiled, OctileGrid)
+        assert (compiled.width, compiled.height) == (env.width, env.height)
+        assert compiled.to_bytes() == env.to_bytes()
+        # labels were installed, not built again
+        assert compiled.components_built
+        assert compiled.component_labels() == env.component_labels()
+        assert compiled.is_reachable(GridState(18, 24), GridState(30, 24))
+
+
+def test_up_to_date_artifacts_are_skipped():
+    with tempfile.TemporaryDirectory() as cache:
+        compile_map(MAP, cache)
+        assert compile_map(MAP, cache).built == 0
+        assert compile_map(MAP, cache, force=True).built == len(PREPROCESSORS)
+        assert compile_map(MAP, cache, preprocessors=['components']).built == 0
+
+
+def test_changed_map_or_version_is_rebuilt():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = os.path.join(directory, 'cache')
+        filename = os.path.join(directory, 'den403d.map')
+        shutil.copy(MAP, filename)
+        compile_map(filename, cache)
+        with open(filename, 'a') as file:
+            file.write('\n')
+        assert compile_map(filename, cache).built == len(PREPROCESSORS)
+
+        version = ComponentsPreprocessor.version
+        ComponentsPreprocessor.version = version + 1
+        try:
+            report = compile_map(filename, cache)
+        finally:
+            ComponentsPreprocessor.version = version
+        assert [a.name for a in report.artifacts if a.built] == ['components']
+
+
+def test_interrupted_compile_resumes():
+    with tempfile.TemporaryDirectory() as cache:
+        compile_map(MAP, cache, preprocessors=['bitmap'])
+        # as if stopped before the components were written
+        manifest = read_manifest(MAP, cache)
+        assert list(manifest['artifacts']) == ['bitmap']
+        assert not any(name.endswith('.tmp') for name in os.listdir(artifact_dir(MAP, cache)))
+        report = compile_map(MAP, cache)
+        assert [a.name for a in report.artifacts if a.built] == ['components']
+
+        # a missing artifact file is rebuilt, a corrupt manifest starts over
+        os.remove(os.path.join(artifact_dir(MAP, cache), 'bitmap.bin'))
+        assert compile_map(MAP, cache).built == 1
+        with open(os.path.join(artifact_dir(MAP, cache), 'manifest.json'), 'w') as file:
+            file.write('{')
+        assert compile_map(MAP, cache).built == len(PREPROCESSORS)
+
+
+def test_compile_maps_in_parallel():
+    maps = [os.path.join(MAPS, name) for name in ('arena.map', 'den009d.map', 'den403d.map')]
+    with tempfile.TemporaryDirectory() as cache:
+        reports = compile_maps(maps + [os.path.join(cache, 'missing.map')], cache, workers=2)
+        assert [report.map for report in reports][:3] == maps
+        assert all(report.built == len(PREPROCESSORS) for report in reports[:3])
+        assert reports[3].error is not None
+        with open(os.path.join(artifact_dir(maps[0], cache), 'manifest.json')) as file:
+            assert json.load(file)['artifacts']['bitmap']['version'] == 1
+
+        store = MapStore([MAPS], cache_dir=cache)
+        assert store.get('arena').components_built
+
+
+def test_maps_with_the_same_name_do_not_share_artifacts():
+    with tempfile.TemporaryDirectory() as directory:
+        maps = []
+        for sub, source in (('a', 'arena.map'), ('b', 'den009d.map')):
+            os.makedirs(os.path.join(directory, sub))
+            maps.append(os.path.join(directory, sub, 'same.map'))
+            shutil.copy(os.path.join(MAPS, source), maps[-1])
+        cache = os.path.join(directory, 'compiled')
+        assert artifact_dir(maps[0], cache) != artifact_dir(maps[1], cache)
+        compile_maps(maps, cache, workers=0)
+        for filename in maps:
+            assert load_compiled(filename, cache).to_bytes() == OctileGrid(filename).to_bytes()
+
+
+def test_component_labels_must_match():
+    env = OctileGrid(MAP)
+    labels = env.component_labels()
+    labels[0] = 1
+    try:
+        OctileGrid(MAP).set_component_labels(labels)
+        assert False
+    except ValueError:
+        pass
@@ -9,6 +9,8 @@ from sa_pathfinding.heuristics.grid_heuristic import OctileGridHeuristic
 from sa_pathfinding.environments.grids.generics.grid  import GridState
 from sa_pathfinding.algorithms.astar.generic_astar import GenericAstar
 from sa_pathfinding.environments.grids.octile_grid import OctileGrid
+from sa_pathfinding.algorithms.generics.trace import RingBufferTrace
+from sa_pathfinding.algorithms.generics.trace import TraceSink
 from sa_pathfinding.environments.generics.env import Environment
 from sa_pathfinding.heuristics.heuristic import Heuristic
 
@@ -16,13 +18,15 @@ from sa_pathfinding.heuristics.heuristic import Heuristic
 env = OctileGrid(os.path.join(os.path.dirname(os.path.dirname(__file__)) + '/data/maps/small/den403d.map'))
 
 def get_random_search(environment: Environment=env, 
-                    heuristic: Heuristic=OctileGridHeuristic()) -> GenericAstar:
+                    heuristic: Heuristic=OctileGridHeuristic(),
+                    trace: TraceSink=None) -> GenericAstar:
     start = environment.get_random(valid=True)
     goal = environment.get_random(valid=True)
     gastar = GenericAstar(environment,
                                 heuristic, 
                                 start=start, 
-                                goal=goal)
+                                goal=goal,
+                                trace=trace)
     return gastar
 
 
@@ -156,40 +160,41 @@ def test_search_start_replaced():
 def test_history_on_success():
     """Test to make sure history dict is being filled in with all the correct info
     for a successful search. Checking keys are correct - not validating data.
+    Expansions are recorded to the trace sink, not the history dict.
     """
-    gastar = get_random_search()
+    trace = RingBufferTrace(capacity=10**6)
+    gastar = get_random_search(trace=trace)
     gastar.get_path()
     assert 'start' in gastar.history
     assert 'goal' in gastar.history
     assert 'heuristic' in gastar.history
     assert 'path' in gastar.history
     assert 'nodes_expanded' in gastar.history
-    assert 'steps' in gastar.history
+    assert 'steps' not in gastar.history
     assert len(gastar.history['path']) > 0
+    events = trace.events
+    assert trace.states[events[0].expanded] == gastar.start
     for i in range(gastar.history['nodes_expanded'] - 1):
-        step = 'step-' + str(i+1)
-        assert step in gastar.history['steps']
-        assert 'expanded' in gastar.history['steps'][step]
-        assert 'to_open' in gastar.history['steps'][step]
+        assert events[i].step == i + 1
+        assert all(state_id < len(trace.states) for state_id in events[i].generated)
 
 def test_history_on_failure():
     """Test to make sure history dict is being filled in with all the correct info
     for a failed search. Checking keys are correct - not validating data.
+    Expansions are recorded to the trace sink, not the history dict.
     """
-    gastar = get_random_search()
+    trace = RingBufferTrace(capacity=10**6)
+    gastar = get_random_search(trace=trace)
     gastar._goal = GridState(-1, -1)
     gastar.get_path()
     assert 'start' in gastar.history
     assert 'goal' in gastar.history
     assert 'heuristic' in gastar.history
     assert 'nodes_expanded' in gastar.history
-    assert 'steps' in gastar.history
     assert 'path' not in gastar.history
-    for i in range(gastar.history['nodes_expanded'] - 1):
-        step = 'step-' + str(i+1)
-        assert step in gastar.history['steps']
-        assert 'expanded' in gastar.history['steps'][step]
-        assert 'to_open' in gastar.history['steps'][step]
+    assert len(trace) == gastar.history['nodes_expanded']
+    for i, event in enumerate(trace.events):
+        assert event.step == i + 1
 
 def test_small_map():
     """Test on small sized map. Large sizes can fail on travis.ci due to timeout.
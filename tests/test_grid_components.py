@@ -0,0 +1,113 @@
+import random
+import time
+import os
+
+from sa_pathfinding.algorithms.dijkstra.one_to_many_dijkstra import GridOptimizedOneToManyDijkstra
+from sa_pathfinding.algorithms.astar.grid_optimized_astar import GridOptimizedAstar
+from sa_pathfinding.algorithms.generics.search_result import Termination
+from sa_pathfinding.heuristics.grid_heuristic import OctileGridHeuristic
+from sa_pathfinding.environments.grids.generics.grid import GridState
+from sa_pathfinding.environments.grids.cardinal_grid import CardinalGrid
+from sa_pathfinding.environments.grids.octile_grid import OctileGrid
+
+
+MAP = os.path.join(os.path.dirname(os.path.dirname(__file__)) + '/data/maps/small/den403d.map')
+
+# a 7x3 room split down the middle by a wall with one gap at (3, 1)
+ROOM = (b'\x01\x01\x01\x00\x01\x01\x01'
+        b'\x01\x01\x01\x01\x01\x01\x01'
+        b'\x01\x01\x01\x00\x01\x01\x01')
+
+
+def partition(grid):
+    """Cells grouped by label, independent of the label values"""
+    groups = {}
+    for y in range(grid.height):
+        for x in range(grid.width):
+            label = grid.component(GridState(x, y))
+            if label:
+                groups.setdefault(label, set()).add((x, y))
+    return sorted(sorted(group) for group in groups.values())
+
+
+def flood_partition(grid):
+    """Reference components from a plain flood fill"""
+    seen = set()
+    groups = []
+    for y in range(grid.height):
+        for x in range(grid.width):
+            if (x, y) in seen or not grid.env[y][x].valid:
+                continue
+            group, stack = set(), [(x, y)]
+            seen.add((x, y))
+            while stack:
+                cx, cy = stack.pop()
+                group.add((cx, cy))
+                for nx, ny in ((cx + 1, cy), (cx - 1, cy), (cx, cy + 1), (cx, cy - 1)):
+                    if 0 <= nx < grid.width and 0 <= ny < grid.height and \
+                            (nx, ny) not in seen and grid.env[ny][nx].valid:
+                        seen.add((nx, ny))
+                        stack.append((nx, ny))
+            groups.append(sorted(group))
+    return sorted(groups)
+
+
+def test_labels_match_flood_fill():
+    """Octile and cardinal grids share the same components"""
+    for grid in (OctileGrid(MAP), CardinalGrid(MAP)):
+        assert partition(grid) == flood_partition(grid)
+
+
+def test_block_splits_and_unblock_merges():
+    """Closing the gap splits the room, re-opening it merges it again"""
+    grid = OctileGrid.from_bytes(ROOM, 7, 3)
+    left, right = GridState(0, 0, valid=True), GridState(6, 2, valid=True)
+    assert grid.is_reachable(left, right)
+    version = grid.version
+    grid.set_valid(3, 1, False)
+    assert grid.version == version + 1
+    assert not grid.is_reachable(left, right)
+    assert grid.component(GridState(3, 1)) == 0
+    assert partition(grid) == flood_partition(grid)
+    grid.set_valid(3, 1, True)
+    assert grid.is_reachable(left, right)
+    assert partition(grid) == flood_partition(grid)
+
+
+def test_random_edits_match_rebuild():
+    """Incremental updates agree with labelling the grid from scratch"""
+    random.seed(3)
+    grid = CardinalGrid(MAP)
+    grid.component(GridState(0, 0))
+    for _ in range(200):
+        x = random.randrange(grid.width)
+        y = random.randrange(grid.height)
+        grid.set_valid(x, y, not grid.env[y][x].valid)
+    assert partition(grid) == flood_partition(grid)
+
+
+def test_unreachable_rejected_without_expanding():
+    """A* on a disconnected pair terminates at construction"""
+    grid = OctileGrid.from_bytes(ROOM, 7, 3)
+    grid.set_valid(3, 1, False)
+    start, goal = GridState(0, 1, valid=True), GridState(6, 1, valid=True)
+    astar = GridOptimizedAstar(grid, OctileGridHeuristic(), start=start, goal=goal)
+    t1 = time.perf_counter()
+    assert astar.get_path() == []
+    assert time.perf_counter() - t1 < 0.1
+    assert astar.nodes_expanded == 0
+    assert astar.result.termination == Termination.UNREACHABLE
+    assert astar.success is False
+
+
+def test_one_to_many_skips_unreachable_goals():
+    """Goals in other components do not force an exhaustive search"""
+    grid = OctileGrid.from_bytes(ROOM, 7, 3)
+    grid.set_valid(3, 1, False)
+    near, far = GridState(2, 1, valid=True), GridState(6, 1, valid=True)
+    search = GridOptimizedOneToManyDijkstra(grid, goals=[near, far],
+                                            start=GridState(0, 1, valid=True))
+    paths = search.get_paths()
+    assert len(paths[near]) == 3
+    assert paths[far] == []
+    assert search.result.termination == Termination.SUCCESS
@@ -0,0 +1,37 @@
+import math
+import os
+
+from sa_pathfinding.algorithms.astar.hash_distributed_astar import HashDistributedAstar
+from sa_pathfinding.algorithms.astar.grid_optimized_astar import GridOptimizedAstar
+from sa_pathfinding.environments.towers_of_hanoi.towers_of_hanoi import TowersOfHanoi
+from sa_pathfinding.heuristics.grid_heuristic import OctileGridHeuristic
+from sa_pathfinding.environments.grids.octile_grid import OctileGrid
+from sa_pathfinding.heuristics.heuristic import ZeroHeuristic
+
+env = OctileGrid(os.path.join(os.path.dirname(os.path.dirname(__file__)) + '/data/maps/small/den403d.map'))
+
+
+def test_towers_of_hanoi():
+    toh = TowersOfHanoi(3, 4, start_peg=0, goal_peg=2)
+    search = HashDistributedAstar(toh, ZeroHeuristic(), start=toh.start, goal=toh.goal, workers=3)
+    path = search.get_path()
+    assert len(path) == 16  # 2^4 - 1 moves
+    assert path[0] == toh.start and path[-1] == toh.goal
+    assert len(search.worker_expansions) == 3
+    assert search.nodes_expanded == sum(search.worker_expansions)
+    assert search.load_imbalance >= 1.0
+
+
+def test_grid_cost_matches_astar():
+    for _ in range(3):
+        start = env.get_random(valid=True)
+        goal = env.get_random(valid=True)
+        serial = GridOptimizedAstar(env, OctileGridHeuristic(), start=start, goal=goal)
+        serial_path = serial.get_path()
+        search = HashDistributedAstar(env, OctileGridHeuristic(), start=start, goal=goal,
+                                      workers=2, batch_size=8)
+        path = search.get_path()
+        assert len(path) == 0 if len(serial_path) == 0 else len(path) > 0
+        if len(path) > 0:
+            assert math.isclose(search.cost, env.get_path_cost(serial_path))
+            assert math.isclose(env.get_path_cost(path), search.cost)
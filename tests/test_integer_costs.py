@@ -0,0 +1,76 @@
+import random
+import pytest
+import os
+
+from sa_pathfinding.algorithms.dijkstra.grid_optimized_dijkstra import GridOptimizedDijkstra
+from sa_pathfinding.algorithms.astar.grid_optimized_astar import GridOptimizedAstar
+from sa_pathfinding.heuristics.grid_heuristic import EuclideanGridHeuristic
+from sa_pathfinding.heuristics.grid_heuristic import OctileGridHeuristic
+from sa_pathfinding.heuristics.table_heuristic import TableGridHeuristic
+from sa_pathfinding.environments.grids.generics.grid import GridState
+from sa_pathfinding.algorithms.generics.search_node import SearchNode
+from sa_pathfinding.environments.grids.octile_grid import OctileGrid
+
+
+MAP = os.path.join(os.path.dirname(os.path.dirname(__file__)) + '/data/maps/small/den403d.map')
+
+
+def test_integer_action_costs():
+    """All moves cost the configured integers"""
+    env = OctileGrid(MAP, costs=(70, 99))
+    assert env.integer_costs
+    assert not OctileGrid(MAP).integer_costs
+    state = GridState(18, 24, valid=True)
+    costs = {cost for _, cost in env.get_actions(state, None)}
+    assert costs <= {70, 99}
+    assert all(isinstance(cost, int) for cost in costs)
+
+
+def test_invalid_costs():
+    with pytest.raises(ValueError):
+        OctileGrid(MAP, costs=(1.0, 1.4))
+    with pytest.raises(ValueError):
+        OctileGrid(MAP, costs=(100, 70))
+
+
+def test_integer_heuristics_are_admissible():
+    """Integer heuristics never exceed the exact integer octile distance"""
+    for costs in ((70, 99), (1000, 1414), (5, 7)):
+        octile = OctileGridHeuristic(costs)
+        euclidean = EuclideanGridHeuristic(costs)
+        for dx in range(0, 30, 3):
+            for dy in range(0, 30, 4):
+                a, b = GridState(0, 0), GridState(dx, dy)
+                exact = costs[0] * abs(dx - dy) + costs[1] * min(dx, dy)
+                assert octile.get_cost(a, b) == exact
+                assert isinstance(euclidean.get_cost(a, b), int)
+                assert euclidean.get_cost(a, b) <= exact
+
+
+def test_integer_search_matches_dijkstra():
+    """A* with integer costs finds integer, optimal path costs"""
+    random.seed(11)
+    env = OctileGrid(MAP, costs=(70, 99))
+    table = TableGridHeuristic(env, OctileGridHeuristic(env.costs))
+    for _ in range(5):
+        start, goal = env.get_random(), env.get_random()
+        if not env.is_reachable(start, goal):
+            continue
+        astar = GridOptimizedAstar(env, table, start=start, goal=goal)
+        dijkstra = GridOptimizedDijkstra(env, start=start, goal=goal)
+        cost = env.get_path_cost(astar.get_path())
+        assert isinstance(cost, int)
+        assert cost == env.get_path_cost(dijkstra.get_path())
+
+
+def test_exact_node_ordering():
+    """Equal integer f-costs tie-break on higher g, without isclose"""
+    a = SearchNode(GridState(0, 0), gcost=140, hcost=0, fcost=140)
+    b = SearchNode(GridState(1, 0), gcost=70, hcost=70, fcost=140)
+    c = SearchNode(GridState(2, 0), gcost=0, hcost=141, fcost=141)
+    assert a < b and not b < a
+    assert b < c and not c < b
+    # floats within rounding error still count as ties
+    d = SearchNode(GridState(3, 0), gcost=1.0, hcost=0.1 + 0.2, fcost=1.0 + 0.1 + 0.2)
+    e = SearchNode(GridState(4, 0), gcost=0.5, hcost=0.8, fcost=1.3)
+    assert d < e
@@ -0,0 +1,98 @@
+import tempfile
+import shutil
+import sys
+import os
+
+from sa_pathfinding.environments.grids.generics.grid import GridState
+from sa_pathfinding.caching.map_store import grid_nbytes
+from sa_pathfinding.caching.map_store import MapStore
+
+MAPS = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data/maps/small')
+
+
+def test_hits_misses_and_names():
+    store = MapStore([MAPS])
+    env = store.get('den403d')
+    assert store.get('den403d.map') is env
+    assert store.get(os.path.join(MAPS, 'den403d.map')) is env
+    assert store.stats.hits == 2 and store.stats.misses == 1
+    assert store.stats.hit_rate == 2 / 3
+    stats = store.map_stats()['den403d.map']
+    assert stats.resident and stats.nbytes == grid_nbytes(env) == store.nbytes
+    try:
+        store.get('nowhere')
+        assert False
+    except KeyError:
+        pass
+
+
+def test_lru_eviction_under_budget():
+    sizes = {name: grid_nbytes(MapStore([MAPS]).get(name)) for name in ('arena', 'den009d', 'den101d')}
+    store = MapStore([MAPS], max_bytes=sizes['arena'] + max(sizes['den009d'], sizes['den101d']))
+    store.get('arena')
+    store.get('den009d')
+    store.get('arena')
+    store.get('den101d')
+    # den009d was the least recently used
+    assert 'arena' in store and 'den101d' in store and 'den009d' not in store
+    assert store.nbytes <= store.max_bytes
+    assert store.stats.evictions == 1
+    assert store.map_stats()['den009d.map'].nbytes == 0
+
+
+def test_map_over_budget_is_still_served():
+    store = MapStore([MAPS], max_bytes=1)
+    assert store.get('arena').width == 49
+    store.get('den009d')
+    assert len(store) == 1 and 'den009d' in store
+
+
+def test_derived_structures_count_and_go_with_their_map():
+    store = MapStore([MAPS])
+    builds = []
+
+    def build(env):
+        builds.append(env)
+        return bytes(env.width * env.height)
+
+    table = store.derived('den403d', 'table', build)
+    assert store.derived('den403d', 'table', build) is table
+    assert len(builds) == 1
+    assert store.nbytes == grid_nbytes(store.get('den403d')) + sys.getsizeof(table)
+    store.evict('den403d')
+    assert store.nbytes == 0
+    store.derived('den403d', 'table', build)
+    assert len(builds) == 2
+
+
+def test_component_labels_are_counted():
+    store = MapStore([MAPS])
+    env = store.get('den403d')
+    before = store.nbytes
+    assert not env.components_built and env.component_nbytes() == 0
+    env.component(GridState(18, 24))
+    store.get('den403d')
+    assert store.nbytes == before + env.component_nbytes() > before
+
+    eager = MapStore([MAPS], components=True)
+    assert eager.get('den403d').components_built
+
+
+def test_reload_when_file_changes():
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, 'changing.map')
+        shutil.copy(os.path.join(MAPS, 'den403d.map'), filename)
+        store = MapStore([directory])
+        env = store.get('changing')
+        store.derived('changing', 'table', lambda env: bytes(16))
+        with open(filename, 'r') as file:
+            lines = file.readlines()
+        lines[4 + 24] = lines[4 + 24][:18] + '@' + lines[4 + 24][19:]
+        with open(filename, 'w') as file:
+            file.writelines(lines)
+        os.utime(filename, ns=(0, 0))
+        reloaded = store.get('changing')
+        assert reloaded is not env
+        assert not reloaded.is_valid(GridState(18, 24))
+        assert store.stats.reloads == 1
+        assert store.nbytes == grid_nbytes(reloaded)
@@ -0,0 +1,68 @@
+import math
+import os
+
+from sa_pathfinding.algorithms.astar.multi_goal_astar import GridOptimizedMultiGoalAstar
+from sa_pathfinding.heuristics.multi_goal_heuristic import MultiGoalGridHeuristic
+from sa_pathfinding.algorithms.astar.grid_optimized_astar import GridOptimizedAstar
+from sa_pathfinding.environments.towers_of_hanoi.towers_of_hanoi import TowersOfHanoi
+from sa_pathfinding.algorithms.astar.multi_goal_astar import MultiGoalAstar
+from sa_pathfinding.heuristics.grid_heuristic import ManhattanGridHeuristic
+from sa_pathfinding.heuristics.grid_heuristic import OctileGridHeuristic
+from sa_pathfinding.environments.grids.octile_grid import OctileGrid
+from sa_pathfinding.heuristics.heuristic import ZeroHeuristic
+
+env = OctileGrid(os.path.join(os.path.dirname(os.path.dirname(__file__)) + '/data/maps/small/den403d.map'))
+
+
+def path_cost(path):
+    cost = 0
+    for a, b in zip(path, path[1:]):
+        cost += math.sqrt(2) if a.x != b.x and a.y != b.y else 1
+    return cost
+
+
+def test_nearest_goal_is_reached():
+    """The multi-goal search should end at the goal with the cheapest
+    single-goal path.
+    """
+    start = env.get_random(valid=True)
+    goals = [env.get_random(valid=True) for _ in range(10)]
+    search = GridOptimizedMultiGoalAstar(env,
+                                         OctileGridHeuristic(),
+                                         goals=goals,
+                                         start=start)
+    path = search.get_path()
+    costs = []
+    for goal in goals:
+        single = GridOptimizedAstar(env, OctileGridHeuristic(), start=start, goal=goal)
+        single_path = single.get_path()
+        if len(single_path) > 0:
+            costs.append(path_cost(single_path))
+    if len(costs) == 0:
+        assert len(path) == 0
+    else:
+        assert search.reached_goal in goals
+        assert path[-1] == search.reached_goal
+        assert math.isclose(path_cost(path), min(costs))
+
+
+def test_grid_heuristic_matches_min():
+    """The spatial index must return exactly the min over goals."""
+    goals = [env.get_random(valid=True) for _ in range(50)]
+    for base, bucket_size in ((OctileGridHeuristic(), 4), (OctileGridHeuristic(), 1),
+                              (ManhattanGridHeuristic(), 16)):
+        heuristic = MultiGoalGridHeuristic(base, goals, bucket_size=bucket_size)
+        for _ in range(50):
+            state = env.get_random(valid=True)
+            expected = min(base.get_cost(state, goal) for goal in goals)
+            assert math.isclose(heuristic.get_cost(state), expected)
+
+
+def test_generic_environment():
+    """Multi-goal search also runs on non-grid environments."""
+    toh = TowersOfHanoi(3, 3, start_peg=0, goal_peg=2)
+    goals = [toh.get_stacked_state(1), toh.get_stacked_state(2)]
+    search = MultiGoalAstar(toh, ZeroHeuristic(), goals=goals, start=toh.start)
+    path = search.get_path()
+    assert search.reached_goal in goals
+    assert len(path) == 8  # 2^3 - 1 moves
@@ -0,0 +1,33 @@
+import os
+
+from sa_pathfinding.algorithms.dijkstra.one_to_many_dijkstra import GridOptimizedOneToManyDijkstra
+from sa_pathfinding.algorithms.dijkstra.grid_optimized_dijkstra import GridOptimizedDijkstra
+from sa_pathfinding.environments.towers_of_hanoi.towers_of_hanoi import TowersOfHanoi
+from sa_pathfinding.algorithms.dijkstra.one_to_many_dijkstra import OneToManyDijkstra
+from sa_pathfinding.environments.grids.octile_grid import OctileGrid
+
+env = OctileGrid(os.path.join(os.path.dirname(os.path.dirname(__file__)) + '/data/maps/small/den403d.map'))
+
+
+def test_paths_to_all_goals():
+    """Every goal gets a path of the same length a single Dijkstra finds."""
+    start = env.get_random(valid=True)
+    goals = [env.get_random(valid=True) for _ in range(5)]
+    search = GridOptimizedOneToManyDijkstra(env, goals=goals, start=start)
+    paths = search.get_paths()
+    assert list(paths.keys()) == list(dict.fromkeys(goals))
+    for goal, path in paths.items():
+        single = GridOptimizedDijkstra(env, start=start, goal=goal)
+        assert len(path) == len(single.get_path())
+        if len(path) > 0:
+            assert path[0] == start
+            assert path[-1] == goal
+
+
+def test_generic_environment():
+    toh = TowersOfHanoi(3, 3, start_peg=0, goal_peg=2)
+    goals = [toh.get_stacked_state(1), toh.get_stacked_state(2)]
+    search = OneToManyDijkstra(toh, goals=goals, start=toh.start)
+    paths = search.get_paths()
+    assert len(paths[goals[0]]) == 8
+    assert len(paths[goals[1]]) == 8
@@ -0,0 +1,161 @@
+from functools import partial
+import random
+import pytest
+import os
+
+from sa_pathfinding.algorithms.dijkstra.grid_optimized_dijkstra import GridOptimizedDijkstra
+from sa_pathfinding.algorithms.astar.grid_optimized_astar import GridOptimizedAstar
+from sa_pathfinding.algorithms.generics.open_list import RadixHeapOpenList
+from sa_pathfinding.heuristics.grid_heuristic import ManhattanGridHeuristic
+from sa_pathfinding.heuristics.grid_heuristic import OctileGridHeuristic
+from sa_pathfinding.algorithms.generics.open_list import BucketOpenList
+from sa_pathfinding.environments.grids.cardinal_grid import CardinalGrid
+from sa_pathfinding.algorithms.generics.open_list import HeapOpenList
+from sa_pathfinding.algorithms.generics.open_list import TieBreak
+from sa_pathfinding.environments.grids.generics.grid import GridState
+from sa_pathfinding.algorithms.generics.search_node import SearchNode
+from sa_pathfinding.environments.grids.octile_grid import OctileGrid
+
+
+MAP = os.path.join(os.path.dirname(os.path.dirname(__file__)) + '/data/maps/small/den403d.map')
+OPEN_LISTS = (HeapOpenList, BucketOpenList, RadixHeapOpenList)
+
+
+def node(i, f, g):
+    return SearchNode(GridState(i, 0), gcost=g, hcost=f - g, fcost=f)
+
+
+@pytest.mark.parametrize('open_list', OPEN_LISTS)
+def test_f_then_high_g_order(open_list):
+    """Nodes come out on f-cost, ties to high g-cost, with monotone pushes"""
+    random.seed(5)
+    queue = open_list()
+    popped = []
+    pending = [node(i, random.randint(0, 20), random.randint(0, 20)) for i in range(200)]
+    while pending or len(queue):
+        # push a few nodes no better than the last one popped, then pop one
+        floor = popped[-1].fcost if popped else 0
+        for _ in range(3):
+            if pending:
+                new = pending.pop()
+                new.fcost = max(new.fcost, floor)
+                queue.push(new)
+        popped.append(queue.pop())
+    keys = [(n.fcost, -n.gcost) for n in popped]
+    for (f1, g1), (f2, g2) in zip(keys, keys[1:]):
+        assert f1 <= f2
+
+
+@pytest.mark.parametrize('open_list', OPEN_LISTS)
+def test_tie_break_to_high_g(open_list):
+    queue = open_list()
+    for i, g in enumerate((3, 9, 1, 5)):
+        queue.push(node(i, 10, g))
+    assert [queue.pop().gcost for _ in range(4)] == [9, 5, 3, 1]
+
+
+@pytest.mark.parametrize('open_list', OPEN_LISTS)
+def test_find_and_remove(open_list):
+    """A removed node is no longer found, counted, or popped"""
+    queue = open_list()
+    a, b, c = node(0, 4, 0), node(1, 5, 0), node(2, 6, 0)
+    for n in (a, b, c):
+        queue.push(n)
+    assert queue.find(node(1, 0, 0)) is b
+    queue.remove(b)
+    assert queue.find(b) is None
+    assert len(queue) == 2
+    assert queue.peek() is a
+    assert [queue.pop(), queue.pop()] == [a, c]
+    assert queue.peek() is None
+
+
+@pytest.mark.parametrize('open_list', (BucketOpenList, RadixHeapOpenList))
+def test_integer_keys_required(open_list):
+    with pytest.raises(ValueError):
+        open_list().push(node(0, 1.5, 0))
+
+
+def test_radix_heap_rejects_decreasing_keys():
+    queue = RadixHeapOpenList()
+    queue.push(node(0, 10, 0))
+    queue.pop()
+    with pytest.raises(ValueError):
+        queue.push(node(1, 9, 0))
+
+
+def test_bucket_queue_accepts_decreasing_keys():
+    queue = BucketOpenList()
+    queue.push(node(0, 10, 0))
+    queue.push(node(1, 12, 0))
+    queue.pop()
+    queue.push(node(2, 9, 0))
+    assert queue.pop().fcost == 9
+
+
+def test_same_costs_in_searches():
+    """Every backend finds equally short paths in A* and Dijkstra"""
+    random.seed(8)
+    cases = ((CardinalGrid(MAP), ManhattanGridHeuristic(costs=(1, 1))),
+             (OctileGrid(MAP, costs=(70, 99)), OctileGridHeuristic(costs=(70, 99))))
+    for env, heuristic in cases:
+        for _ in range(3):
+            start, goal = env.get_random(), env.get_random()
+            costs = set()
+            for open_list in OPEN_LISTS:
+                astar = GridOptimizedAstar(env, heuristic, start=start, goal=goal,
+                                           open_list=open_list)
+                dijkstra = GridOptimizedDijkstra(env, start=start, goal=goal,
+                                                 open_list=open_list)
+                costs.add(env.get_path_cost(astar.get_path()))
+                costs.add(env.get_path_cost(dijkstra.get_path()))
+            assert len(costs) == 1
+
+
+@pytest.mark.parametrize('open_list', OPEN_LISTS)
+def test_tie_break_policies(open_list):
+    """Each policy orders equal f-costs its own way"""
+    expected = {TieBreak.HIGH_G: [9, 5, 3, 1],
+                TieBreak.LOW_G: [1, 3, 5, 9],
+                TieBreak.FIFO: [3, 9, 1, 5],
+                TieBreak.LIFO: [5, 1, 9, 3]}
+    for tie_break, order in expected.items():
+        queue = open_list(tie_break=tie_break)
+        for i, g in enumerate((3, 9, 1, 5)):
+            queue.push(node(i, 10, g))
+        queue.push(node(9, 11, 0))
+        assert [queue.pop().gcost for _ in range(4)] == order
+        assert queue.pop().fcost == 11
+
+
+def test_random_tie_break_is_seeded():
+    orders = []
+    for _ in range(2):
+        queue = HeapOpenList(tie_break='random', seed=4)
+        for i in range(10):
+            queue.push(node(i, 10, i))
+        orders.append([queue.pop().gcost for _ in range(10)])
+    assert orders[0] == orders[1]
+    assert sorted(orders[0]) == list(range(10))
+
+
+def test_nodes_are_never_compared():
+    """Heap keys are plain tuples, SearchNode.__lt__ is not called"""
+    class Node(SearchNode):
+        def __lt__(self, other):
+            raise AssertionError('compared nodes')
+    queue = HeapOpenList()
+    for i in range(20):
+        queue.push(Node(GridState(i, 0), gcost=1.0, hcost=1.0, fcost=2.0))
+    while len(queue):
+        queue.pop()
+
+
+def test_tie_break_in_search():
+    """Every policy still finds a least-cost path"""
+    env = OctileGrid(MAP)
+    start, goal = GridState(18, 24, valid=True), GridState(30, 24, valid=True)
+    for tie_break in TieBreak:
+        astar = GridOptimizedAstar(env, OctileGridHeuristic(), start=start, goal=goal,
+                                   open_list=partial(HeapOpenList, tie_break=tie_break, seed=1))
+        assert len(astar.get_path()) == 13
@@ -0,0 +1,101 @@
+import os
+
+from sa_pathfinding.algorithms.astar.grid_optimized_astar import GridOptimizedAstar
+from sa_pathfinding.algorithms.dijkstra.generic_dijkstra import GenericDijkstra
+from sa_pathfinding.heuristics.grid_heuristic import ManhattanGridHeuristic
+from sa_pathfinding.heuristics.grid_heuristic import OctileGridHeuristic
+from sa_pathfinding.algorithms.generics.open_list import BucketOpenList
+from sa_pathfinding.environments.grids.generics.grid import GridState
+from sa_pathfinding.environments.grids.octile_grid import OctileGrid
+from sa_pathfinding.algorithms.astar.generic_astar import GenericAstar
+from sa_pathfinding.algorithms.bfs.generic_bfs import GenericBFS
+from sa_pathfinding.caching.path_cache import PathCache
+
+
+MAP = os.path.join(os.path.dirname(os.path.dirname(__file__)) + '/data/maps/small/den403d.map')
+env = OctileGrid(MAP)
+
+START = GridState(18, 24, valid=True)
+GOAL = GridState(30, 24, valid=True)
+
+
+def test_hit_after_miss():
+    """The second identical query is served from the cache"""
+    cache = PathCache()
+    first = cache.get_path(env, GridOptimizedAstar, START, GOAL,
+                           heuristic=OctileGridHeuristic())
+    second = cache.get_path(env, GridOptimizedAstar, START, GOAL,
+                            heuristic=OctileGridHeuristic())
+    assert first == second and len(first) == 13
+    assert cache.stats.misses == 1
+    assert cache.stats.hits == 1
+    assert cache.stats.hit_rate == 0.5
+
+
+def test_key_includes_algorithm_and_heuristic():
+    """A different algorithm is a different entry"""
+    cache = PathCache()
+    cache.get_path(env, GridOptimizedAstar, START, GOAL, heuristic=OctileGridHeuristic())
+    assert cache.lookup(env, GenericBFS, START, GOAL) is None
+    assert len(cache) == 1
+
+
+def test_sub_path_hit():
+    """Two cells on a cached optimal path are answered without searching"""
+    cache = PathCache()
+    path = cache.get_path(env, GridOptimizedAstar, START, GOAL,
+                          heuristic=OctileGridHeuristic())
+    sub = cache.lookup(env, GridOptimizedAstar, path[2], path[9], OctileGridHeuristic())
+    assert sub == path[2:10]
+    assert cache.stats.sub_path_hits == 1
+    astar = GridOptimizedAstar(env, OctileGridHeuristic(), start=path[2], goal=path[9])
+    assert env.get_path_cost(astar.get_path()) == env.get_path_cost(sub)
+    # the reverse direction and non-optimal searches are not served
+    assert cache.lookup(env, GridOptimizedAstar, path[9], path[2], OctileGridHeuristic()) is None
+    assert cache.lookup(env, GenericBFS, path[2], path[9]) is None
+
+
+def test_sub_paths_only_serve_the_same_search():
+    """Paths of other heuristics or search arguments are not served"""
+    cache = PathCache()
+    path = cache.get_path(env, GenericAstar, START, GOAL, heuristic=ManhattanGridHeuristic())
+    assert cache.lookup(env, GenericDijkstra, path[2], path[9]) is None
+    assert cache.lookup(env, GenericAstar, path[2], path[9], OctileGridHeuristic()) is None
+    assert cache.lookup(env, GenericAstar, path[2], path[9], ManhattanGridHeuristic(),
+                        open_list=BucketOpenList) is None
+    assert cache.lookup(env, GenericAstar, path[2], path[9], ManhattanGridHeuristic()) == \
+        path[2:10]
+
+
+def test_lru_eviction_within_budget():
+    """Least recently used entries go first when the budget is exceeded"""
+    cache = PathCache()
+    cache.get_path(env, GridOptimizedAstar, START, GOAL, heuristic=OctileGridHeuristic())
+    size = cache.nbytes
+    cache = PathCache(max_bytes=2 * size)
+    goals = [GridState(30, 24, valid=True), GridState(30, 23, valid=True),
+             GridState(30, 25, valid=True)]
+    for goal in goals[:2]:
+        cache.get_path(env, GridOptimizedAstar, START, goal, heuristic=OctileGridHeuristic())
+    # touch the first entry so the second is the least recently used
+    assert cache.lookup(env, GridOptimizedAstar, START, goals[0], OctileGridHeuristic())
+    cache.get_path(env, GridOptimizedAstar, START, goals[2], heuristic=OctileGridHeuristic())
+    assert cache.nbytes <= cache.max_bytes
+    assert cache.stats.evictions >= 1
+    assert cache.lookup(env, GridOptimizedAstar, START, goals[0], OctileGridHeuristic()) is not None
+    assert len(cache) == 2
+
+
+def test_invalidated_when_grid_changes():
+    """Blocking a cell drops the entries of that map"""
+    grid = OctileGrid(MAP)
+    cache = PathCache()
+    path = cache.get_path(grid, GridOptimizedAstar, START, GOAL,
+                          heuristic=OctileGridHeuristic())
+    blocked = path[6]
+    grid.set_valid(blocked.x, blocked.y, False)
+    assert cache.lookup(grid, GridOptimizedAstar, START, GOAL, OctileGridHeuristic()) is None
+    assert len(cache) == 0
+    detour = cache.get_path(grid, GridOptimizedAstar, START, GOAL,
+                            heuristic=OctileGridHeuristic())
+    assert blocked not in detour
@@ -0,0 +1,96 @@
+import tempfile
+import pickle
+import os
+
+from sa_pathfinding.heuristics.pattern_database_heuristic import TOHPatternDatabaseHeuristic
+from sa_pathfinding.environments.towers_of_hanoi.compact_towers_of_hanoi import CompactTowersOfHanoi
+from sa_pathfinding.environments.towers_of_hanoi.towers_of_hanoi import TowersOfHanoi
+from sa_pathfinding.environments.towers_of_hanoi.towers_of_hanoi import TOHState
+from sa_pathfinding.heuristics.pattern_database_heuristic import PatternDatabase
+from sa_pathfinding.algorithms.astar.generic_idastar import GenericIDAstar
+from sa_pathfinding.algorithms.astar.generic_astar import GenericAstar
+from sa_pathfinding.algorithms.astar.hashed_astar import HashedAstar
+
+
+def test_database_holds_distances_to_the_goal():
+    database = PatternDatabase.build(3, 5, goal_peg=2)
+    env = CompactTowersOfHanoi(3, 5, start_peg=0, goal_peg=2)
+    assert len(database) == 3 ** 5
+    assert database[env.goal.code] == 0
+    assert database[env.start.code] == 2 ** 5 - 1
+    for code in range(env.size):
+        if code != env.goal.code:
+            children = env.get_successor_codes(code)
+            assert min(database[child] for child in children) == database[code] - 1
+
+
+def test_heuristic_is_admissible():
+    env = CompactTowersOfHanoi(4, 6, start_peg=0, goal_peg=3)
+    exact = PatternDatabase.build(4, 6, goal_peg=3)
+    heuristics = [TOHPatternDatabaseHeuristic(env, pattern_size=4),
+                  TOHPatternDatabaseHeuristic(env, patterns=[[1, 3, 5], [2, 4, 6]]),
+                  TOHPatternDatabaseHeuristic(env, patterns=[[1, 2, 3, 4], [3, 4, 5, 6]],
+                                              combine='max')]
+    assert heuristics[0].patterns == [(3, 4, 5, 6), (1, 2)]
+    for code in range(env.size):
+        state = env.unrank(code)
+        costs = [heuristic.get_cost(state, env.goal) for heuristic in heuristics]
+        assert all(cost <= exact[code] for cost in costs)
+    assert heuristics[0].get_costs([env.start, env.goal], env.goal) == \
+        [heuristics[0].get_cost(env.start, env.goal), 0]
+
+
+def test_saved_databases_are_memory_mapped():
+    with tempfile.TemporaryDirectory() as cache:
+        built = PatternDatabase.cached(4, 5, 1, cache)
+        filename = os.path.join(cache, 'toh-4-5-1.pdb')
+        assert os.path.exists(filename)
+        loaded = PatternDatabase.cached(4, 5, 1, cache)
+        assert isinstance(loaded.table, memoryview)
+        assert bytes(loaded.table) == bytes(built.table)
+        copy = pickle.loads(pickle.dumps(loaded))
+        assert copy.table.tobytes() == bytes(built.table)
+        copy.close()
+        loaded.close()
+
+        with open(filename, 'r+b') as file:
+            file.write(b'JUNK')
+        try:
+            PatternDatabase.load(filename)
+            assert False
+        except ValueError:
+            pass
+        assert bytes(PatternDatabase.cached(4, 5, 1, cache).table) == bytes(built.table)
+
+
+def test_searches_with_pattern_databases():
+    toh = TowersOfHanoi(4, 6, start_peg=0, goal_peg=3)
+    heuristic = TOHPatternDatabaseHeuristic(toh, pattern_size=5)
+    path = GenericAstar(toh, heuristic, start=toh.start, goal=toh.goal).get_path()
+    assert len(path) - 1 == 17
+
+    for disks, search_cls in ((8, HashedAstar), (6, GenericIDAstar)):
+        env = CompactTowersOfHanoi(4, disks, start_peg=1, goal_peg=2)
+        heuristic = TOHPatternDatabaseHeuristic(env, pattern_size=disks - 2)
+        search = search_cls(env, heuristic, start=env.start, goal=env.goal)
+        path = search.get_path()
+        assert len(path) - 1 == env.get_path_cost(path) == {6: 17, 8: 33}[disks]
+    assert search.iterations >= 1 and search.bound == 17
+
+
+def test_invalid_patterns_and_goals():
+    env = CompactTowersOfHanoi(4, 4, start_peg=0, goal_peg=3)
+    for kwargs in ({'patterns': [[1, 2], [2, 3, 4]]},
+                   {'patterns': [[1, 5]]},
+                   {'combine': 'min'}):
+        try:
+            TOHPatternDatabaseHeuristic(env, **kwargs)
+            assert False
+        except ValueError:
+            pass
+    heuristic = TOHPatternDatabaseHeuristic(env)
+    try:
+        heuristic.get_cost(env.start, TOHState([[4, 3], [2], [1], []]))
+        assert False
+    except ValueError:
+        pass
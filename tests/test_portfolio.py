@@ -0,0 +1,40 @@
+import os
+
+from sa_pathfinding.algorithms.dijkstra.grid_optimized_dijkstra import GridOptimizedDijkstra
+from sa_pathfinding.algorithms.astar.grid_optimized_astar import GridOptimizedAstar
+from sa_pathfinding.heuristics.grid_heuristic import OctileGridHeuristic
+from sa_pathfinding.environments.grids.generics.grid import GridState
+from sa_pathfinding.environments.grids.octile_grid import OctileGrid
+from sa_pathfinding.parallel.portfolio import PortfolioStats
+from sa_pathfinding.algorithms.dfs.generic_dfs import GenericDFS
+from sa_pathfinding.parallel.portfolio import SearchConfig
+from sa_pathfinding.parallel.portfolio import Portfolio
+
+env = OctileGrid(os.path.join(os.path.dirname(os.path.dirname(__file__)) + '/data/maps/small/den403d.map'))
+
+configs = [SearchConfig('grid-astar', GridOptimizedAstar, {'heuristic': OctileGridHeuristic()}),
+           SearchConfig('grid-dijkstra', GridOptimizedDijkstra),
+           SearchConfig('dfs', GenericDFS)]
+
+
+def test_race_returns_optimal_winner():
+    portfolio = Portfolio(configs)
+    start = GridState(18, 24, valid=True)
+    goal = GridState(19, 24, valid=True)
+    result = portfolio.run(env, start, goal, map_key='den403d')
+    assert result.winner in ('grid-astar', 'grid-dijkstra')
+    assert 'dfs' not in result.launched
+    assert result.cost == 1
+    assert portfolio.stats.races('den403d') == 1
+
+
+def test_stats_select_and_persist(tmpdir):
+    filename = str(tmpdir.join('stats.json'))
+    stats = PortfolioStats(filename)
+    for _ in range(3):
+        stats.record('den403d', 'grid-dijkstra')
+    stats.record('den403d', 'grid-astar')
+    assert stats.select('den403d', configs, top=1, min_races=10) == configs
+    assert stats.select('den403d', configs, top=1, min_races=4) == [configs[1]]
+    stats.save()
+    assert PortfolioStats(filename).wins('den403d') == {'grid-dijkstra': 3, 'grid-astar': 1}
@@ -0,0 +1,115 @@
+import subprocess
+import pickle
+import sys
+import os
+
+from sa_pathfinding.algorithms.astar.grid_optimized_astar import GridOptimizedAstar
+from sa_pathfinding.heuristics.grid_heuristic import OctileGridHeuristic
+from sa_pathfinding.environments.grids.octile_grid import OctileGrid
+from sa_pathfinding.algorithms.astar.generic_idastar import GenericIDAstar
+from sa_pathfinding.algorithms.astar.hashed_astar import HashedAstar
+from sa_pathfinding.algorithms.bfs.generic_bfs import GenericBFS
+from sa_pathfinding.parallel.batch import BatchSearch
+from sa_pathfinding.registry import SearchConfigs
+from sa_pathfinding.registry import search_config
+from sa_pathfinding.registry import HEURISTICS
+from sa_pathfinding.registry import ALGORITHMS
+from sa_pathfinding.registry import Registry
+from sa_pathfinding.registry import TOWERS_OF_HANOI
+from sa_pathfinding.registry import GRID
+from sa_pathfinding.cli import main
+import sa_pathfinding.registry as registry
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src')
+MAP = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data/maps/small/den403d.map')
+
+
+def test_builtin_names():
+    assert ALGORITHMS.names()[:6] == ['astar', 'grid-astar', 'dijkstra', 'grid-dijkstra',
+                                      'bfs', 'dfs']
+    assert ALGORITHMS.get('grid-astar') is GridOptimizedAstar
+    assert ALGORITHMS.get('bfs') is GenericBFS
+    assert ALGORITHMS.get('idastar') is GenericIDAstar
+    assert ALGORITHMS.get('hashed-astar') is HashedAstar
+    assert 'octile' in HEURISTICS and 'nowhere' not in HEURISTICS
+    try:
+        ALGORITHMS.get('nowhere')
+        assert False
+    except KeyError as e:
+        assert 'grid-astar' in str(e)
+
+
+def test_search_config():
+    search_cls, kwargs = search_config('grid-astar', 'octile')
+    assert search_cls is GridOptimizedAstar
+    assert isinstance(kwargs['heuristic'], OctileGridHeuristic)
+    assert search_config('bfs', 'octile') == (GenericBFS, {})
+
+
+def test_register_and_entry_points(monkeypatch):
+    class EntryPoint:
+        name = 'plugin'
+
+        def load(self):
+            return GenericBFS
+
+    monkeypatch.setattr(registry, '_entry_points', lambda group: [EntryPoint()])
+    algorithms = Registry('algorithm', 'test', {'astar': 'sa_pathfinding.algorithms.astar.'
+                                                         'generic_astar:GenericAstar'})
+    algorithms.register('grid', GridOptimizedAstar)
+    assert algorithms.get('grid') is GridOptimizedAstar
+    assert algorithms.get('plugin') is GenericBFS
+    assert algorithms.names() == ['astar', 'grid', 'plugin']
+
+
+def test_grid_algorithms():
+    grid = ALGORITHMS.for_environment(GRID)
+    assert 'grid-astar' in grid and 'bfs' not in grid and 'dfs' not in grid
+    assert 'idastar' not in grid and 'hashed-astar' not in grid
+    assert ALGORITHMS.names(TOWERS_OF_HANOI) == ['astar', 'dijkstra', 'idastar', 'hashed-astar']
+    assert 'bfs' not in SearchConfigs(environment=GRID)
+    assert 'bfs' in SearchConfigs() and 'bfs' in ALGORITHMS
+    try:
+        grid.get('dfs')
+        assert False
+    except KeyError as e:
+        assert 'grid-astar' in str(e)
+    try:
+        SearchConfigs(environment=GRID)['dfs']
+        assert False
+    except KeyError:
+        pass
+    try:
+        main(['query', MAP, '-i', '-', '-a', 'dfs'])
+        assert False
+    except SystemExit as e:
+        assert e.code == 2
+
+
+def test_cli_imports_only_what_it_uses():
+    code = ("import sys; from sa_pathfinding.cli import main; "
+            "print(sorted(m for m in sys.modules if m.startswith('sa_pathfinding.algorithms.') "
+            "and m.count('.') == 3))")
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                            env=dict(os.environ, PYTHONPATH=SRC), check=True).stdout
+    assert output.strip() == '[]'
+
+
+def test_search_configs_are_built_on_use_and_pickle():
+    configs = SearchConfigs('octile')
+    assert 'grid-dijkstra' in configs and 'nowhere' not in configs
+    assert configs.built == []
+    assert configs['grid-astar'][0] is GridOptimizedAstar
+    assert configs.get('grid-astar') == configs['grid-astar'] and configs.get('nowhere') is None
+    assert configs.built == ['grid-astar']
+    assert list(configs.keys()) == ALGORITHMS.names() and len(configs) == len(ALGORITHMS)
+    copy = pickle.loads(pickle.dumps(SearchConfigs('zero', metrics=True)))
+    assert copy['grid-astar'][1]['metrics'] is True
+    assert copy['grid-astar'][1]['heuristic'].name == HEURISTICS.get('zero')().name
+
+    env = OctileGrid(MAP)
+    with BatchSearch(env, GridOptimizedAstar, workers=1,
+                     algorithms=configs, heuristic=OctileGridHeuristic()) as batch:
+        results = batch.run_all([((18, 24), (30, 24), 'grid-dijkstra'),
+                                 ((18, 24), (30, 24), 'nowhere')])
+    assert results[0].success and results[1].error is not None
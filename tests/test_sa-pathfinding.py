@@ -2,3 +2,120 @@
 from sa_pathfinding.cli import main
 
 
+from sa_pathfinding.benchmarks.runner import BenchmarkReport
+from sa_pathfinding.benchmarks.compare import compare_reports
+from sa_pathfinding.benchmarks.compare import t_test_p_value
+from sa_pathfinding.benchmarks.compare import welch_t_test
+from sa_pathfinding.benchmarks.runner import QueryRecord
+
+import pytest
+import json
+import os
+
+DEN403D = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'maps', 'small', 'den403d.map')
+
+
+def test_main_without_command(capsys):
+    assert main([]) == 0
+    assert 'bench' in capsys.readouterr().out
+
+
+def test_bench_writes_results(tmp_path):
+    output = str(tmp_path / 'bench.json')
+    assert main(['bench', DEN403D, '-a', 'grid-astar', 'grid-dijkstra', '-H', 'octile', 'zero',
+                 '-n', '4', '--warmup', '1', '--repeat', '2', '--scenario-dir', str(tmp_path),
+                 '-o', output, '--csv', str(tmp_path / 'bench.csv')]) == 0
+    report = BenchmarkReport.from_json(output)
+    assert {record.algorithm for record in report.records} == \
+        {'grid-astar/octile', 'grid-astar/zero', 'grid-dijkstra'}
+    assert len(report.records) == 3 * 4 * 2
+    assert os.path.exists(str(tmp_path / 'bench.csv'))
+
+
+def test_bench_baseline_regression(tmp_path, capsys):
+    """A baseline twice as fast as the current run is a regression"""
+    output = str(tmp_path / 'bench.json')
+    args = ['bench', DEN403D, '-n', '12', '--scenario-dir', str(tmp_path), '-o', output]
+    assert main(args) == 0
+    report = BenchmarkReport.from_json(output)
+    faster = BenchmarkReport(record._replace(time=record.time / 2) for record in report.records)
+    faster.to_json(str(tmp_path / 'baseline.json'))
+    assert main(args[:-2] + ['--baseline', str(tmp_path / 'baseline.json')]) == 1
+    assert 'REGRESSION' in capsys.readouterr().out
+
+
+def test_compare_reports():
+    baseline = BenchmarkReport(QueryRecord('m', 'a', i, 0, 1.0, 1.0, 0.01 * (i + 1), 5, True)
+                               for i in range(20))
+    same = compare_reports(baseline, baseline)
+    assert [c.map for c in same] == ['m', '*']
+    assert not any(c.regression or c.improvement or c.expansions_changed for c in same)
+    slower = BenchmarkReport(r._replace(time=r.time * (1.2 + 0.01 * (r.index % 3)))
+                             for r in baseline.records)
+    comparison = compare_reports(baseline, slower)[0]
+    assert comparison.paired and comparison.regression
+    assert comparison.ratio == pytest.approx(1.21, abs=0.01)
+    assert compare_reports(slower, baseline)[0].improvement
+
+
+def test_t_tests():
+    # t = 2 with 10 degrees of freedom, and the Cauchy case of 1
+    assert t_test_p_value(2.0, 10) == pytest.approx(0.073388, abs=1e-6)
+    assert t_test_p_value(1.0, 1) == pytest.approx(0.5)
+    assert t_test_p_value(0.0, 5) == pytest.approx(1.0)
+    t, p = welch_t_test([1, 2, 3, 4, 5], [2, 3, 4, 5, 9])
+    assert t == pytest.approx(8 / 7)
+    assert 0.05 < p < 1
+
+
+def test_query_jsonl(tmp_path):
+    """Results come out one line per query, in order, with path and stats"""
+    queries = tmp_path / 'queries.jsonl'
+    queries.write_text('{"start": [18, 24], "goal": [30, 24]}\n'
+                       '\n'
+                       '{"start": [18, 24], "goal": [20, 24], "algorithm": "grid-dijkstra"}\n'
+                       '{"start": [0, 0], "goal": [30, 24]}\n')
+    output = tmp_path / 'results.jsonl'
+    assert main(['query', DEN403D, '-i', str(queries), '-o', str(output),
+                 '--workers', '1', '--chunksize', '2', '--metrics']) == 0
+    results = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [result['index'] for result in results] == [0, 1, 2]
+    first, second, invalid = results
+    assert first['algorithm'] == 'grid-astar' and first['success']
+    assert first['path'][0] == [18, 24] and first['path'][-1] == [30, 24]
+    assert first['cost'] == 12
+    assert first['metrics']['expansions'] == first['nodes_expanded']
+    assert second['algorithm'] == 'grid-dijkstra' and len(second['path']) == 3
+    assert not invalid['success'] and 'error' in invalid
+
+
+def test_query_csv(tmp_path):
+    queries = tmp_path / 'queries.csv'
+    queries.write_text('start_x,start_y,goal_x,goal_y,algorithm\n18,24,20,24,\n18,24,19,24,astar\n')
+    output = tmp_path / 'results.csv'
+    assert main(['query', DEN403D, '-i', str(queries), '-o', str(output),
+                 '--output-format', 'csv']) == 0
+    lines = output.read_text().splitlines()
+    assert lines[0].startswith('index,start,goal,algorithm')
+    assert lines[1].startswith('0,18 24,20 24,grid-astar,True,2,')
+    assert lines[2].endswith('18 24;19 24,')
+
+
+def test_query_bad_input(tmp_path, capsys):
+    queries = tmp_path / 'queries.jsonl'
+    queries.write_text('{"start": [18, 24]}\n')
+    assert main(['query', DEN403D, '-i', str(queries), '-o', str(tmp_path / 'out')]) == 2
+    assert 'line 1' in capsys.readouterr().err
+    for bad in ('["a", 24]', '[18, 24, 5]', '[18.7, 24]'):
+        queries.write_text('{"start": [18, 24], "goal": [30, 24]}\n'
+                           '{"start": %s, "goal": [30, 24]}\n' % bad)
+        assert main(['query', DEN403D, '-i', str(queries), '-o', str(tmp_path / 'out')]) == 2
+        assert 'line 2' in capsys.readouterr().err
+
+
+def test_compile_reports_built_then_skipped(tmp_path, capsys):
+    cache = str(tmp_path / 'compiled')
+    assert main(['compile', DEN403D, '-o', cache, '-w', '0']) == 0
+    assert '2 artifacts built, 0 up to date' in capsys.readouterr().out
+    assert main(['compile', DEN403D, '-o', cache, '-p', 'bitmap']) == 0
+    assert '0 artifacts built, 1 up to date' in capsys.readouterr().out
@@ -0,0 +1,119 @@
+import pytest
+import math
+import os
+
+from sa_pathfinding.algorithms.astar.grid_optimized_astar import GridOptimizedAstar
+from sa_pathfinding.heuristics.grid_heuristic import OctileGridHeuristic
+from sa_pathfinding.environments.grids.octile_grid import OctileGrid
+from sa_pathfinding.benchmarks.scenario import generate_scenarios
+from sa_pathfinding.benchmarks.scenario import scenario_filename
+from sa_pathfinding.benchmarks.scenario import write_scenarios
+from sa_pathfinding.benchmarks.scenario import read_scenarios
+from sa_pathfinding.benchmarks.runner import BenchmarkReport
+from sa_pathfinding.benchmarks.runner import load_scenarios
+from sa_pathfinding.benchmarks.runner import run_benchmark
+from sa_pathfinding.benchmarks.runner import QueryRecord
+from sa_pathfinding.benchmarks.runner import percentile
+from sa_pathfinding.benchmarks.runner import Algorithm
+from sa_pathfinding.benchmarks.scenario import Scenario
+
+
+MAPS = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'maps')
+DEN403D = os.path.join(MAPS, 'small', 'den403d.map')
+
+ASTAR = Algorithm('grid-astar', GridOptimizedAstar, {'heuristic': OctileGridHeuristic()})
+
+
+def test_generate_is_seeded_and_reachable():
+    """Same seed, same scenarios; every scenario has a real optimal length"""
+    env = OctileGrid(DEN403D)
+    scenarios = generate_scenarios(DEN403D, 10, seed=3, env=env)
+    assert scenarios == generate_scenarios(DEN403D, 10, seed=3)
+    assert scenarios != generate_scenarios(DEN403D, 10, seed=4, env=env)
+    assert [s.bucket for s in scenarios] == sorted(s.bucket for s in scenarios)
+    for scenario in scenarios:
+        assert scenario.map == 'den403d.map'
+        assert (scenario.width, scenario.height) == (env.width, env.height)
+        assert scenario.start != scenario.goal
+        assert 0 < scenario.optimal < math.inf
+        assert scenario.bucket == int(scenario.optimal // 4)
+
+
+def test_write_read_round_trip(tmp_path):
+    """Scenarios survive a .scen file unchanged"""
+    scenarios = generate_scenarios(DEN403D, 5, seed=1)
+    filename = str(tmp_path / 'den403d.map.scen')
+    write_scenarios(filename, scenarios)
+    with open(filename) as file:
+        assert file.readline() == 'version 1\n'
+    assert read_scenarios(filename) == scenarios
+
+
+def test_read_movingai_line(tmp_path):
+    """Files in the MovingAI format are read as written"""
+    filename = str(tmp_path / 'a.scen')
+    with open(filename, 'w') as file:
+        file.write('version 1\n0\tmaps/dao/arena.map\t49\t49\t1\t11\t1\t12\t1.00000000\n')
+    assert read_scenarios(filename) == [Scenario(0, 'maps/dao/arena.map', 49, 49, 1, 11, 1, 12, 1.0)]
+
+
+def test_read_rejects_bad_files(tmp_path):
+    filename = str(tmp_path / 'bad.scen')
+    with open(filename, 'w') as file:
+        file.write('version 2\n')
+    with pytest.raises(ValueError):
+        read_scenarios(filename)
+    with open(filename, 'w') as file:
+        file.write('version 1\n0\tmap\t1\n')
+    with pytest.raises(ValueError):
+        read_scenarios(filename)
+
+
+def test_load_scenarios_caches(tmp_path):
+    """Generated scenarios are written once and read back after"""
+    directory = str(tmp_path)
+    first = load_scenarios(DEN403D, 6, seed=2, scenario_dir=directory)
+    assert os.path.exists(scenario_filename(DEN403D, directory))
+    assert load_scenarios(DEN403D, 6, seed=99, scenario_dir=directory) == first
+    fewer = load_scenarios(DEN403D, 3, scenario_dir=directory)
+    assert len(fewer) == 3 and all(scenario in first for scenario in fewer)
+
+
+def test_percentile():
+    assert percentile([3, 1, 2], 50) == 2
+    assert percentile([1, 2, 3, 4], 50) == 2.5
+    assert percentile([5], 99) == 5
+    assert percentile([1, 2], 100) == 2
+    assert math.isnan(percentile([], 50))
+
+
+def test_run_benchmark_report(tmp_path):
+    """A* solves every scenario optimally and the summary adds up"""
+    report = run_benchmark([DEN403D], [ASTAR], count=8, seed=5,
+                           scenario_dir=str(tmp_path))
+    assert len(report.records) == 8
+    rows = report.summary()
+    assert len(rows) == 1
+    row = rows[0]
+    assert row['map'] == 'den403d.map' and row['algorithm'] == 'grid-astar'
+    assert row['queries'] == row['solved'] == 8
+    assert row['suboptimality_max'] == pytest.approx(1.0)
+    assert row['time_p50'] <= row['time_p90'] <= row['time_p99'] <= row['time_max']
+    assert report.summary(by_map=False)[0]['map'] == '*'
+
+
+def test_report_files(tmp_path):
+    """Reports are written as JSON and CSV, failures as null lengths"""
+    report = BenchmarkReport([QueryRecord('m.map', 'a', 0, 1, 4.0, 4.0, 0.1, 10, True),
+                              QueryRecord('m.map', 'a', 1, 2, 9.0, math.inf, 0.2, 30, False)])
+    report.to_json(str(tmp_path / 'r.json'))
+    again = BenchmarkReport.from_json(str(tmp_path / 'r.json'))
+    assert again.records == report.records
+    report.to_csv(str(tmp_path / 'r.csv'))
+    with open(str(tmp_path / 'r.csv')) as file:
+        lines = file.read().splitlines()
+    assert lines[0].startswith('map,algorithm,queries,solved')
+    assert len(lines) == 3
+    report.to_csv(str(tmp_path / 'records.csv'), records=True)
+    with open(str(tmp_path / 'records.csv')) as file:
+        assert len(file.read().splitlines()) == 3
@@ -0,0 +1,89 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import os
+
+import pytest
+
+from sa_pathfinding.algorithms.astar.grid_optimized_astar import GridOptimizedAstar
+from sa_pathfinding.heuristics.grid_heuristic import OctileGridHeuristic
+from sa_pathfinding.environments.grids.generics.grid import GridState
+from sa_pathfinding.environments.grids.octile_grid import OctileGrid
+
+env = OctileGrid(os.path.join(os.path.dirname(os.path.dirname(__file__)) + '/data/maps/small/den403d.map'))
+
+
+def test_run_async_matches_get_path():
+    start = env.get_random(valid=True)
+    goal = env.get_random(valid=True)
+    expected = GridOptimizedAstar(env, OctileGridHeuristic(), start=start, goal=goal).get_path()
+    search = GridOptimizedAstar(env, OctileGridHeuristic(), start=start, goal=goal)
+    assert asyncio.run(search.run_async(batch_size=5)) == expected
+
+
+def test_concurrent_searches_interleave():
+    """Searches awaited together must take turns on the event loop."""
+    a = GridOptimizedAstar(env, OctileGridHeuristic(),
+                           start=GridState(18, 24, valid=True),
+                           goal=GridState(30, 24, valid=True))
+    b = GridOptimizedAstar(env, OctileGridHeuristic(),
+                           start=GridState(18, 24, valid=True),
+                           goal=GridState(30, 24, valid=True))
+
+    async def main():
+        tasks = [asyncio.ensure_future(a.run_async(batch_size=1)),
+                 asyncio.ensure_future(b.run_async(batch_size=1))]
+        snapshots = []
+        while not all(task.done() for task in tasks):
+            snapshots.append((a.nodes_expanded, b.nodes_expanded))
+            await asyncio.sleep(0)
+        return snapshots, [task.result() for task in tasks]
+
+    snapshots, (path_a, path_b) = asyncio.run(main())
+    assert path_a == path_b and len(path_a) == 13
+    assert snapshots[:3] == [(0, 0), (1, 1), (2, 2)]
+
+
+def test_cancellation_and_resume():
+    start = env.get_random(valid=True)
+    goal = env.get_random(valid=True)
+    search = GridOptimizedAstar(env, OctileGridHeuristic(), start=start, goal=goal)
+
+    async def main():
+        task = asyncio.ensure_future(search.run_async(batch_size=1))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    expected = GridOptimizedAstar(env, OctileGridHeuristic(), start=start, goal=goal).get_path()
+    assert len(search.get_path()) == len(expected)
+
+
+def test_executor_offload():
+    search = GridOptimizedAstar(env, OctileGridHeuristic(),
+                                start=GridState(18, 24, valid=True),
+                                goal=GridState(19, 24, valid=True))
+
+    async def main():
+        with ThreadPoolExecutor(1) as executor:
+            return await search.run_async(executor=executor)
+
+    assert len(asyncio.run(main())) == 2
+
+
+def test_process_pool_outcome_is_copied_back():
+    search = GridOptimizedAstar(env, OctileGridHeuristic(),
+                                start=GridState(18, 24, valid=True),
+                                goal=GridState(30, 24, valid=True))
+
+    async def main():
+        with ProcessPoolExecutor(1) as executor:
+            return await search.run_async(executor=executor)
+
+    assert len(asyncio.run(main())) == 13
+    assert search.success and search.nodes_expanded > 0
+    assert search.result.termination.name == 'SUCCESS'
+    assert search.history['nodes_expanded'] == search.nodes_expanded
@@ -0,0 +1,111 @@
+import time
+import os
+
+from sa_pathfinding.algorithms.astar.hash_distributed_astar import HashDistributedAstar
+from sa_pathfinding.algorithms.astar.grid_optimized_astar import GridOptimizedAstar
+from sa_pathfinding.algorithms.generics.search_result import SearchLimits
+from sa_pathfinding.algorithms.generics.search_result import Termination
+from sa_pathfinding.heuristics.grid_heuristic import OctileGridHeuristic
+from sa_pathfinding.environments.grids.generics.grid import GridState
+from sa_pathfinding.algorithms.astar.generic_astar import GenericAstar
+from sa_pathfinding.environments.grids.octile_grid import OctileGrid
+from sa_pathfinding.algorithms.bfs.generic_bfs import GenericBFS
+
+
+env = OctileGrid(os.path.join(os.path.dirname(os.path.dirname(__file__)) + '/data/maps/small/den403d.map'))
+
+START = GridState(18, 24, valid=True)
+GOAL = GridState(30, 24, valid=True)
+
+
+def test_unlimited_result():
+    """A search without limits reports success with its path"""
+    astar = GridOptimizedAstar(env, OctileGridHeuristic(), start=START, goal=GOAL)
+    path = astar.get_path()
+    result = astar.result
+    assert result.success
+    assert result.termination == Termination.SUCCESS
+    assert result.path == path
+    assert result.nodes_expanded == astar.nodes_expanded
+    assert result.elapsed >= 0
+
+
+def test_result_before_search():
+    """Nothing has happened yet, so there is no termination reason"""
+    astar = GenericAstar(env, OctileGridHeuristic(), start=START, goal=GOAL)
+    assert astar.result.termination is None
+    assert not astar.result.success
+
+
+def test_expansion_limit():
+    """The search stops at exactly max_expansions and keeps a partial path"""
+    limits = SearchLimits(max_expansions=5)
+    for search_cls in (GenericAstar, GridOptimizedAstar):
+        astar = search_cls(env, OctileGridHeuristic(), start=START, goal=GOAL,
+                           limits=limits)
+        assert astar.get_path() == []
+        result = astar.result
+        assert result.termination == Termination.EXPANSION_LIMIT
+        assert result.nodes_expanded == 5
+        assert not astar.success
+        assert result.partial_path[0] == START
+        assert env.get_path_cost(result.partial_path) >= 0
+
+
+def test_open_limit():
+    """The search stops once the open list outgrows max_open"""
+    astar = GridOptimizedAstar(env, OctileGridHeuristic(), start=START, goal=GOAL,
+                               limits=SearchLimits(max_open=10))
+    astar.get_path()
+    assert astar.result.termination == Termination.OPEN_LIMIT
+    assert len(astar.open) > 10
+
+
+def test_open_bytes_limit():
+    """A tiny memory budget is exceeded by the start node alone"""
+    astar = GridOptimizedAstar(env, OctileGridHeuristic(), start=START, goal=GOAL,
+                               limits=SearchLimits(max_open_bytes=1))
+    astar.get_path()
+    assert astar.result.termination == Termination.OPEN_LIMIT
+    assert astar.nodes_expanded == 0
+
+
+def test_time_limit():
+    """A zero time budget stops the search before its first expansion"""
+    astar = GenericAstar(env, OctileGridHeuristic(), start=START, goal=GOAL,
+                         limits=SearchLimits(max_time=0))
+    t1 = time.perf_counter()
+    astar.get_path()
+    assert time.perf_counter() - t1 < 1
+    assert astar.result.termination == Termination.TIME_LIMIT
+    assert astar.nodes_expanded == 0
+
+
+def test_limit_not_reached():
+    """Generous limits do not change the result"""
+    limits = SearchLimits(max_expansions=10**6, max_open=10**6, max_time=60)
+    astar = GridOptimizedAstar(env, OctileGridHeuristic(), start=START, goal=GOAL,
+                               limits=limits)
+    assert len(astar.get_path()) == 13
+    assert astar.result.success
+
+
+def test_bfs_expansion_limit():
+    """Searches without a heuristic stop too, with no partial path"""
+    bfs = GenericBFS(env, start=START, goal=GOAL,
+                     limits=SearchLimits(max_expansions=3))
+    assert bfs.get_path() == []
+    assert bfs.result.termination == Termination.EXPANSION_LIMIT
+    assert bfs.result.partial_path == []
+
+
+def test_hash_distributed_limits():
+    """HDA* reports success, and stops at a time limit"""
+    hda = HashDistributedAstar(env, OctileGridHeuristic(), start=START, goal=GOAL,
+                               workers=2)
+    hda.get_path()
+    assert hda.result.termination == Termination.SUCCESS
+    hda = HashDistributedAstar(env, OctileGridHeuristic(), start=START, goal=GOAL,
+                               workers=2, limits=SearchLimits(max_time=0))
+    assert hda.get_path() == []
+    assert hda.result.termination == Termination.TIME_LIMIT
@@ -0,0 +1,116 @@
+import pickle
+import os
+
+from sa_pathfinding.algorithms.astar.grid_optimized_astar import GridOptimizedAstar
+from sa_pathfinding.algorithms.generics.search_result import SearchLimits
+from sa_pathfinding.algorithms.generics.metrics import SearchMetrics
+from sa_pathfinding.heuristics.grid_heuristic import OctileGridHeuristic
+from sa_pathfinding.environments.grids.generics.grid import GridState
+from sa_pathfinding.algorithms.astar.generic_astar import GenericAstar
+from sa_pathfinding.environments.grids.octile_grid import OctileGrid
+from sa_pathfinding.algorithms.bfs.generic_bfs import GenericBFS
+from sa_pathfinding.parallel.batch import BatchSearch
+
+
+env = OctileGrid(os.path.join(os.path.dirname(os.path.dirname(__file__)) + '/data/maps/small/den403d.map'))
+
+START = GridState(18, 24, valid=True)
+GOAL = GridState(30, 24, valid=True)
+
+
+def test_no_metrics_by_default():
+    """Searches count nothing unless given metrics"""
+    astar = GridOptimizedAstar(env, OctileGridHeuristic(), start=START, goal=GOAL)
+    astar.get_path()
+    assert astar.metrics is None
+
+
+def test_astar_counters():
+    """Counters agree with the search and with each other"""
+    metrics = SearchMetrics()
+    astar = GridOptimizedAstar(env, OctileGridHeuristic(), start=START, goal=GOAL,
+                               metrics=metrics)
+    astar.get_path()
+    assert astar.metrics is metrics
+    assert metrics.expansions == astar.nodes_expanded
+    assert metrics.generated > metrics.expansions
+    # every child that is not a duplicate goes on open, and open loses a
+    # node per expansion after the start
+    assert metrics.generated - metrics.duplicates == \
+        len(astar.open) + metrics.expansions - 1
+    assert metrics.decrease_keys <= metrics.duplicates
+    assert metrics.reopenings == 0
+    assert metrics.max_open >= len(astar.open)
+    assert metrics.actions_time > 0
+    assert metrics.apply_time > 0
+    assert metrics.heuristic_time > 0
+    assert metrics.elapsed > 0
+    assert metrics.expansions_per_second > 0
+
+
+def test_metrics_do_not_change_search():
+    """Instrumented and plain searches expand the same nodes"""
+    plain = GenericAstar(env, OctileGridHeuristic(), start=START, goal=GOAL)
+    counted = GenericAstar(env, OctileGridHeuristic(), start=START, goal=GOAL,
+                           metrics=SearchMetrics())
+    assert plain.get_path() == counted.get_path()
+    assert plain.nodes_expanded == counted.nodes_expanded == counted.metrics.expansions
+
+
+def test_step_counts_like_run():
+    """step() and run() share the expansion, so they count the same"""
+    stepped = GridOptimizedAstar(env, OctileGridHeuristic(), start=START, goal=GOAL,
+                                 metrics=SearchMetrics())
+    ran = GridOptimizedAstar(env, OctileGridHeuristic(), start=START, goal=GOAL,
+                             metrics=SearchMetrics())
+    for _ in stepped.step():
+        pass
+    ran.run()
+    for key in 'expansions generated duplicates decrease_keys max_open'.split():
+        assert getattr(stepped.metrics, key) == getattr(ran.metrics, key)
+
+
+def test_bfs_counters():
+    """BFS puts every child on open"""
+    metrics = SearchMetrics()
+    bfs = GenericBFS(env, start=START, goal=GridState(20, 24, valid=True),
+                     limits=SearchLimits(max_expansions=5), metrics=metrics)
+    bfs.get_path()
+    assert metrics.expansions == 5
+    assert metrics.duplicates == 0
+    assert metrics.generated == bfs._open_size() + 4
+
+
+def test_as_dict_and_merge():
+    """Metrics export to flat dicts and aggregate"""
+    first, second = SearchMetrics(), SearchMetrics()
+    GridOptimizedAstar(env, OctileGridHeuristic(), start=START, goal=GOAL,
+                       metrics=first).get_path()
+    GridOptimizedAstar(env, OctileGridHeuristic(), start=GOAL, goal=START,
+                       metrics=second).get_path()
+    values = first.as_dict()
+    assert values['expansions'] == first.expansions
+    assert values['expansions_per_second'] == first.expansions_per_second
+    assert SearchMetrics.from_dict(values).as_dict() == values
+    total = SearchMetrics.total([first, second])
+    assert total.expansions == first.expansions + second.expansions
+    assert total.max_open == max(first.max_open, second.max_open)
+    assert total.elapsed == first.elapsed + second.elapsed
+
+
+def test_instrumented_search_pickles():
+    """Timed hooks are picklable, so instrumented searches can go to processes"""
+    astar = GridOptimizedAstar(env, OctileGridHeuristic(), start=START, goal=GOAL,
+                               metrics=SearchMetrics())
+    copy = pickle.loads(pickle.dumps(astar))
+    copy.get_path()
+    assert copy.metrics.expansions == copy.nodes_expanded
+
+
+def test_batch_metrics():
+    """Batches give every query metrics of its own"""
+    with BatchSearch(env, GridOptimizedAstar, workers=0,
+                     heuristic=OctileGridHeuristic(), metrics=True) as batch:
+        results = batch.run_all([(START, GOAL), (GOAL, START)])
+    for result in results:
+        assert result.metrics['expansions'] == result.nodes_expanded
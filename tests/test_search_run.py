@@ -0,0 +1,86 @@
+import os
+
+from sa_pathfinding.algorithms.dijkstra.grid_optimized_dijkstra import GridOptimizedDijkstra
+from sa_pathfinding.algorithms.astar.grid_optimized_astar import GridOptimizedAstar
+from sa_pathfinding.algorithms.generics.search_result import SearchLimits
+from sa_pathfinding.algorithms.generics.search_result import Termination
+from sa_pathfinding.algorithms.generics.trace import RingBufferTrace
+from sa_pathfinding.heuristics.grid_heuristic import OctileGridHeuristic
+from sa_pathfinding.environments.grids.generics.grid import GridState
+from sa_pathfinding.algorithms.astar.generic_astar import GenericAstar
+from sa_pathfinding.environments.grids.octile_grid import OctileGrid
+from sa_pathfinding.algorithms.bfs.generic_bfs import GenericBFS
+
+
+env = OctileGrid(os.path.join(os.path.dirname(os.path.dirname(__file__)) + '/data/maps/small/den403d.map'))
+
+START = GridState(18, 24, valid=True)
+GOAL = GridState(30, 24, valid=True)
+# BFS keeps no closed list, so its goal is kept close
+NEAR = GridState(20, 24, valid=True)
+
+
+def make_searches(**kwargs):
+    return [GenericAstar(env, OctileGridHeuristic(), start=START, goal=GOAL, **kwargs),
+            GridOptimizedAstar(env, OctileGridHeuristic(), start=START, goal=GOAL, **kwargs),
+            GridOptimizedDijkstra(env, start=START, goal=GOAL, **kwargs),
+            GenericBFS(env, start=START, goal=NEAR, **kwargs)]
+
+
+def test_run_matches_step():
+    """run() and a step() driven search expand the same nodes to the same path"""
+    for stepped, ran in zip(make_searches(), make_searches()):
+        for _ in stepped.step():
+            pass
+        path = ran.run()
+        assert path == stepped.path
+        assert ran.nodes_expanded == stepped.nodes_expanded
+        assert ran.result.termination == stepped.result.termination == Termination.SUCCESS
+        assert ran.history['nodes_expanded'] == stepped.history['nodes_expanded']
+
+
+def test_run_respects_limits():
+    """run() checks the limits before every expansion, like step()"""
+    limits = SearchLimits(max_expansions=5)
+    for stepped, ran in zip(make_searches(limits=limits), make_searches(limits=limits)):
+        for _ in stepped.step():
+            pass
+        ran.run()
+        assert ran.nodes_expanded == stepped.nodes_expanded == 5
+        assert ran.result.termination == Termination.EXPANSION_LIMIT
+
+
+def test_run_records_same_trace():
+    """Tracing does not depend on which loop drives the search"""
+    stepped_trace, ran_trace = RingBufferTrace(), RingBufferTrace()
+    stepped = GridOptimizedAstar(env, OctileGridHeuristic(), start=START, goal=GOAL,
+                                 trace=stepped_trace)
+    ran = GridOptimizedAstar(env, OctileGridHeuristic(), start=START, goal=GOAL,
+                             trace=ran_trace)
+    for _ in stepped.step():
+        pass
+    ran.run()
+    assert len(ran_trace) > 0
+    assert ran_trace.events == stepped_trace.events
+    assert ran_trace.states == stepped_trace.states
+
+
+def test_run_resumes_after_step():
+    """run() finishes a search that was started with step()"""
+    reference = GridOptimizedAstar(env, OctileGridHeuristic(), start=START, goal=GOAL)
+    reference.run()
+    astar = GridOptimizedAstar(env, OctileGridHeuristic(), start=START, goal=GOAL)
+    steps = astar.step()
+    for _ in range(5):
+        next(steps)
+    assert astar.run() == reference.path
+    assert astar.nodes_expanded == reference.nodes_expanded
+
+
+def test_run_exhausted():
+    """An unreachable goal still ends with EXHAUSTED when the components are unknown"""
+    astar = GenericAstar(env, OctileGridHeuristic(), start=START, goal=GOAL)
+    astar._goal = GridState(-1, -1)
+    assert astar.run() == []
+    assert astar.result.termination == Termination.EXHAUSTED
+    assert astar.history['nodes_expanded'] == astar.nodes_expanded
@@ -0,0 +1,184 @@
+import urllib.request
+import urllib.error
+import threading
+import tempfile
+import shutil
+import socket
+import json
+import os
+
+from sa_pathfinding.algorithms.dijkstra.grid_optimized_dijkstra import GridOptimizedDijkstra
+from sa_pathfinding.algorithms.astar.grid_optimized_astar import GridOptimizedAstar
+from sa_pathfinding.heuristics.grid_heuristic import OctileGridHeuristic
+from sa_pathfinding.registry import SearchConfigs
+from sa_pathfinding.cli import _parse_args
+from sa_pathfinding.server import PathServer
+from sa_pathfinding.registry import GRID
+
+maps = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data/maps/small')
+algorithms = {'grid-astar': (GridOptimizedAstar, {'heuristic': OctileGridHeuristic()}),
+              'grid-dijkstra': (GridOptimizedDijkstra, {})}
+
+
+def _serve(workers: int = 0, **kwargs) -> PathServer:
+    server = PathServer([maps], algorithms, 'grid-astar', workers=workers)
+    server.start(port=0, **kwargs)
+    server.thread = threading.Thread(target=server.serve, daemon=True)
+    server.thread.start()
+    return server
+
+
+def _request(server: PathServer, endpoint: str, body=None):
+    url = 'http://127.0.0.1:%d%s' % (server.address[1], endpoint)
+    data = None if body is None else body if isinstance(body, bytes) else json.dumps(body).encode()
+    try:
+        with urllib.request.urlopen(url, data=data, timeout=30) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_serves_paths_health_and_metrics():
+    server = _serve()
+    try:
+        status, health = _request(server, '/health')
+        assert status == 200 and health['status'] == 'ok'
+        assert 'grid-astar' in health['algorithms']
+
+        status, result = _request(server, '/path', {'map': 'den403d', 'start': [18, 24],
+                                                    'goal': [30, 24]})
+        assert status == 200 and result['success']
+        assert result['map'] == 'den403d.map'
+        assert result['path'][0] == [18, 24] and result['path'][-1] == [30, 24]
+        status, dijkstra = _request(server, '/path', {'map': 'den403d.map', 'start': [18, 24],
+                                                      'goal': [30, 24],
+                                                      'algorithm': 'grid-dijkstra'})
+        assert dijkstra['cost'] == result['cost']
+
+        status, result = _request(server, '/path', {'map': 'den403d', 'start': [18, 9],
+                                                    'goal': [30, 24]})
+        assert status == 200 and not result['success'] and 'error' in result
+
+        status, metrics = _request(server, '/metrics')
+        assert status == 200
+        assert metrics['queries_per_map'] == {'den403d.map': 3}
+        assert metrics['requests']['/path'] == 3
+        assert metrics['latency_ms']['p50'] > 0
+        assert metrics['maps']['den403d.map']['hits'] == 2
+        assert metrics['maps']['den403d.map']['nbytes'] > 0
+        assert metrics['store']['misses'] == 1
+    finally:
+        server.shutdown()
+        server.thread.join()
+
+
+def test_bad_requests():
+    server = _serve()
+    try:
+        assert _request(server, '/path', {'map': '../../setup.py', 'start': [0, 0],
+                                          'goal': [1, 1]})[0] == 404
+        assert _request(server, '/path', b'{not json')[0] == 400
+        assert _request(server, '/path', {'map': 'den403d', 'start': [18]})[0] == 400
+        assert _request(server, '/path', {'map': 'den403d', 'start': [18.7, 24],
+                                          'goal': [30, 24]})[0] == 400
+        assert _request(server, '/path', {'map': 'den403d', 'start': [18, 24], 'goal': [30, 24],
+                                          'algorithm': 'bfs'})[0] == 400
+        assert _request(server, '/nowhere')[0] == 404
+        assert _request(server, '/metrics')[1]['errors'] == 6
+    finally:
+        server.shutdown()
+        server.thread.join()
+
+
+def test_unexpected_errors_are_answered():
+    with tempfile.TemporaryDirectory() as directory:
+        shutil.copy(os.path.join(maps, 'den403d.map'), directory)
+        server = PathServer([directory], algorithms, 'grid-astar')
+        server.start(port=0)
+        server.thread = threading.Thread(target=server.serve, daemon=True)
+        server.thread.start()
+        try:
+            os.unlink(os.path.join(directory, 'den403d.map'))
+            status, result = _request(server, '/path', {'map': 'den403d', 'start': [18, 24],
+                                                        'goal': [30, 24]})
+            assert status == 500 and 'error' in result
+        finally:
+            server.shutdown()
+            server.thread.join()
+
+
+def test_concurrent_first_queries():
+    server = PathServer([maps], algorithms, 'grid-astar')
+    queries = [{'map': 'den403d', 'start': [18, 24], 'goal': [30, 24]},
+               {'map': 'den403d', 'start': [30, 24], 'goal': [18, 24]}] * 3
+    results = [None] * len(queries)
+
+    def query(i: int) -> None:
+        results[i] = server.path(queries[i])
+
+    threads = [threading.Thread(target=query, args=(i,)) for i in range(len(queries))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(result['success'] for result in results)
+
+
+def test_grid_servers_reject_unsafe_algorithms():
+    server = PathServer([maps], SearchConfigs(environment=GRID), 'grid-astar')
+    server.start(port=0)
+    server.thread = threading.Thread(target=server.serve, daemon=True)
+    server.thread.start()
+    try:
+        for algorithm in ('bfs', 'dfs'):
+            assert _request(server, '/path', {'map': 'den403d', 'start': [18, 24],
+                                              'goal': [30, 24], 'algorithm': algorithm})[0] == 400
+        status, result = _request(server, '/path', {'map': 'den403d', 'start': [18, 24],
+                                                    'goal': [30, 24], 'algorithm': 'dijkstra'})
+        assert status == 200 and result['success']
+        assert 'bfs' not in _request(server, '/health')[1]['algorithms']
+    finally:
+        server.shutdown()
+        server.thread.join()
+
+
+def test_worker_processes():
+    server = _serve(workers=1)
+    try:
+        status, result = _request(server, '/path', {'map': 'den403d', 'start': [18, 24],
+                                                    'goal': [30, 24]})
+        assert status == 200 and result['success']
+        assert _request(server, '/health')[1]['loaded'] == 1
+    finally:
+        server.shutdown()
+        server.thread.join()
+
+
+def test_unix_socket():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'server.sock')
+        server = _serve(unix_socket=path)
+        try:
+            client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            client.connect(path)
+            client.sendall(b'GET /health HTTP/1.0\r\n\r\n')
+            response = b''
+            while True:
+                data = client.recv(4096)
+                if not data:
+                    break
+                response += data
+            client.close()
+            assert response.startswith(b'HTTP/1.1 200')
+            assert json.loads(response.split(b'\r\n\r\n', 1)[1])['status'] == 'ok'
+        finally:
+            server.shutdown()
+            server.thread.join()
+        assert not os.path.exists(path)
+
+
+def test_serve_flags():
+    args = _parse_args(['-v', 'serve', maps])
+    assert args.verbose and not args.access_log
+    args = _parse_args(['serve', maps, '--access-log'])
+    assert args.access_log and not args.verbose
@@ -0,0 +1,64 @@
+import pytest
+import os
+
+from sa_pathfinding.algorithms.astar.grid_optimized_astar import GridOptimizedAstar
+from sa_pathfinding.heuristics.grid_heuristic import EuclideanGridHeuristic
+from sa_pathfinding.heuristics.grid_heuristic import ManhattanGridHeuristic
+from sa_pathfinding.heuristics.grid_heuristic import OctileGridHeuristic
+from sa_pathfinding.heuristics.table_heuristic import TableGridHeuristic
+from sa_pathfinding.environments.grids.generics.grid import GridState
+from sa_pathfinding.environments.grids.octile_grid import OctileGrid
+from sa_pathfinding.heuristics.heuristic import ZeroHeuristic
+
+
+env = OctileGrid(os.path.join(os.path.dirname(os.path.dirname(__file__)) + '/data/maps/small/den403d.map'))
+
+
+def test_table_matches_base():
+    """Every cell of the table equals the base heuristic, for goals anywhere"""
+    goals = [GridState(0, 0), GridState(env.width - 1, env.height - 1),
+             GridState(17, 31), GridState(env.width - 1, 0)]
+    for base in (OctileGridHeuristic(), ManhattanGridHeuristic(), EuclideanGridHeuristic()):
+        table = TableGridHeuristic(env, base)
+        for goal in goals:
+            for y in range(env.height):
+                for x in range(env.width):
+                    assert table.get_cost(GridState(x, y), goal) == \
+                        base.get_cost(GridState(x, y), goal)
+
+
+def test_get_costs():
+    """The batched call agrees with one call per state"""
+    table = TableGridHeuristic(env)
+    goal = GridState(30, 24)
+    states = [GridState(x, 5) for x in range(10)]
+    assert table.get_costs(states, goal) == [table.get_cost(s, goal) for s in states]
+    assert ZeroHeuristic().get_costs(states, goal) == [0.0] * 10
+
+
+def test_same_search_as_base():
+    """A* expands exactly the same nodes with the tabled heuristic"""
+    start, goal = GridState(18, 24, valid=True), GridState(30, 24, valid=True)
+    plain = GridOptimizedAstar(env, OctileGridHeuristic(), start=start, goal=goal)
+    tabled = GridOptimizedAstar(env, TableGridHeuristic(env), start=start, goal=goal)
+    assert plain.get_path() == tabled.get_path()
+    assert plain.nodes_expanded == tabled.nodes_expanded
+
+
+def test_tables_reused_and_evicted():
+    """Tables are kept per goal, least recently used first out"""
+    table = TableGridHeuristic(env, max_tables=2)
+    a, b, c = GridState(1, 1), GridState(2, 2), GridState(3, 3)
+    table.get_cost(a, a)
+    first = table._table(a)
+    table.get_cost(a, b)
+    assert table._table(a) is first
+    table.get_cost(a, c)
+    assert table._table(b) is not None
+    assert len(table._tables) == 2
+    assert (1, 1) not in table._tables
+
+
+def test_untabled_heuristic():
+    with pytest.raises(NotImplementedError):
+        TableGridHeuristic(env, ZeroHeuristic())
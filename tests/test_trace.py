@@ -0,0 +1,73 @@
+import os
+
+from sa_pathfinding.algorithms.astar.grid_optimized_astar import GridOptimizedAstar
+from sa_pathfinding.heuristics.grid_heuristic import OctileGridHeuristic
+from sa_pathfinding.algorithms.generics.trace import read_binary_trace
+from sa_pathfinding.environments.grids.generics.grid import GridState
+from sa_pathfinding.algorithms.generics.trace import read_jsonl_trace
+from sa_pathfinding.algorithms.generics.trace import RingBufferTrace
+from sa_pathfinding.environments.grids.octile_grid import OctileGrid
+from sa_pathfinding.algorithms.generics.trace import BinaryTrace
+from sa_pathfinding.algorithms.generics.trace import JsonlTrace
+from sa_pathfinding.algorithms.bfs.generic_bfs import GenericBFS
+
+
+env = OctileGrid(os.path.join(os.path.dirname(os.path.dirname(__file__)) + '/data/maps/small/den403d.map'))
+
+START = GridState(18, 24, valid=True)
+GOAL = GridState(30, 24, valid=True)
+
+
+def search(trace=None):
+    astar = GridOptimizedAstar(env, OctileGridHeuristic(), start=START, goal=GOAL,
+                               trace=trace)
+    astar.get_path()
+    return astar
+
+
+def test_off_by_default():
+    """Nothing is recorded without a sink"""
+    astar = search()
+    assert astar.trace is None
+    assert 'steps' not in astar.history
+
+
+def test_ring_buffer_keeps_latest():
+    full = RingBufferTrace()
+    astar = search(full)
+    last = RingBufferTrace(capacity=3)
+    search(last)
+    assert len(full) == astar.nodes_expanded - 1
+    assert len(last) == 3
+    assert [e.step for e in last.events] == [e.step for e in full.events[-3:]]
+    first = full.events[0]
+    assert full.states[first.expanded] == START
+    assert len(first.generated) > 0
+    # only the states of the kept expansions are remembered
+    kept = {state_id for e in last.events for state_id in (e.expanded,) + e.generated}
+    assert set(last.states) == kept
+    assert [last.states[e.expanded] for e in last.events] == \
+        [full.states[e.expanded] for e in full.events[-3:]]
+
+
+def test_jsonl_and_binary_round_trip(tmp_path):
+    """File traces decode to the same expansions as the ring buffer"""
+    memory = RingBufferTrace()
+    search(memory)
+    with JsonlTrace(str(tmp_path / 'trace.jsonl')) as trace:
+        search(trace)
+    with BinaryTrace(str(tmp_path / 'trace.bin')) as trace:
+        search(trace)
+    for reader, name in ((read_jsonl_trace, 'trace.jsonl'), (read_binary_trace, 'trace.bin')):
+        reprs, events = reader(str(tmp_path / name))
+        assert events == memory.events
+        assert reprs[0] == repr(START)
+        assert len(reprs) == len(memory.states)
+    assert os.path.getsize(tmp_path / 'trace.bin') < os.path.getsize(tmp_path / 'trace.jsonl')
+
+
+def test_bfs_trace():
+    trace = RingBufferTrace()
+    bfs = GenericBFS(env, start=START, goal=GridState(20, 24, valid=True), trace=trace)
+    bfs.get_path()
+    assert [e.step for e in trace.events] == list(range(1, bfs.nodes_expanded))